@@ -1,4 +1,5 @@
 import platform
+import render_cache
 import os, sys
 import wx
 from . import main, theme
@@ -431,11 +432,7 @@ class AliasPanel(wx.Panel):
 
 	def _invalidate_display_caches(self):
 		"""Clear display caches so aliases are refreshed."""
-		for tl in getattr(self.account, 'timelines', []):
-			tl.invalidate_display_cache()
-			for status in getattr(tl, 'statuses', []):
-				if hasattr(status, '_display_cache'):
-					delattr(status, '_display_cache')
+		render_cache.bump_aliases(self.account)
 
 	def on_edit(self, event):
 		"""Edit the selected alias."""
@@ -1,4 +1,6 @@
 from mastodon import MastodonError
+import relationships
+import render_cache
 import sound, timeline
 from application import get_app
 import time
@@ -38,6 +40,9 @@ class ChooseGui(wx.Dialog):
 		self.type=type
 		self.returnvalue=""
 		self.user_objects = user_objects or []  # Store user objects for direct use
+		if self.user_objects and type in (self.TYPE_FOLLOW_TOGGLE, self.TYPE_MUTE_TOGGLE, self.TYPE_BLOCK_TOGGLE):
+			# Resolve relationships while the user picks, so the action doesn't wait on a lookup
+			relationships.get_cache(account).prefetch([getattr(u, 'id', None) for u in self.user_objects], profiles=False)
 		wx.Dialog.__init__(self, None, title=title, size=(350,200))
 		self.Bind(wx.EVT_CLOSE, self.OnClose)
 		self.panel = wx.Panel(self)
@@ -117,6 +122,7 @@ class ChooseGui(wx.Dialog):
 						self.account._platform.unmute(user.id)
 					else:
 						self.account.api.account_unmute(id=user.id)
+					relationships.forget(self.account, user.id)
 			except Exception as e:
 				self.account.app.handle_error(e,"Unmute")
 		elif self.type==self.TYPE_USER_TIMELINE:
@@ -175,24 +181,16 @@ class ChooseGui(wx.Dialog):
 						self.account.prefs.aliases[user_id] = new_alias
 						self.account.prefs.save()
 						speak.speak(f"Alias set for {acct}")
-						# Clear display caches to refresh with new alias
-						for tl in self.account.timelines:
-							tl.invalidate_display_cache()
-							for status in getattr(tl, 'statuses', []):
-								if hasattr(status, '_display_cache'):
-									delattr(status, '_display_cache')
+						# Refresh displays with the new alias
+						render_cache.bump_aliases(self.account)
 					else:
 						# Remove alias if empty
 						if user_id in self.account.prefs.aliases:
 							del self.account.prefs.aliases[user_id]
 							self.account.prefs.save()
 							speak.speak(f"Alias removed for {acct}")
-							# Clear display caches
-							for tl in self.account.timelines:
-								tl.invalidate_display_cache()
-								for status in getattr(tl, 'statuses', []):
-									if hasattr(status, '_display_cache'):
-										delattr(status, '_display_cache')
+							# Refresh displays without the alias
+							render_cache.bump_aliases(self.account)
 				dlg.Destroy()
 			else:
 				speak.speak("Could not find user")
@@ -220,24 +218,9 @@ class ChooseGui(wx.Dialog):
 			try:
 				user = self.account.app.lookup_user_name(self.account, self.returnvalue)
 				if user != -1:
-					# Check if we can get relationship info
-					following = False
-					platform_type = getattr(self.account.prefs, 'platform_type', 'mastodon')
-					if platform_type == 'mastodon' and hasattr(self.account, 'api') and hasattr(self.account.api, 'account_relationships'):
-						try:
-							relationships = self.account.api.account_relationships([user.id])
-							if relationships and len(relationships) > 0:
-								following = getattr(relationships[0], 'following', False)
-						except:
-							pass
-					elif platform_type == 'bluesky' and hasattr(self.account, '_platform') and self.account._platform:
-						# Bluesky - fetch fresh profile to get current relationship state
-						try:
-							profile = self.account._platform.client.get_profile(user.id)
-							if profile and hasattr(profile, 'viewer') and profile.viewer:
-								following = bool(getattr(profile.viewer, 'following', None))
-						except:
-							pass
+					# Check if we can get relationship info (cached if the user was just viewed)
+					rel = relationships.lookup(self.account, user.id)
+					following = rel.following if rel is not None else False
 
 					if following:
 						# Check if confirmation is required
@@ -266,24 +249,9 @@ class ChooseGui(wx.Dialog):
 			try:
 				user = self.account.app.lookup_user_name(self.account, self.returnvalue)
 				if user != -1:
-					# Check if we can get relationship info
-					muting = False
-					platform_type = getattr(self.account.prefs, 'platform_type', 'mastodon')
-					if platform_type == 'mastodon' and hasattr(self.account, 'api') and hasattr(self.account.api, 'account_relationships'):
-						try:
-							relationships = self.account.api.account_relationships([user.id])
-							if relationships and len(relationships) > 0:
-								muting = getattr(relationships[0], 'muting', False)
-						except:
-							pass
-					elif platform_type == 'bluesky' and hasattr(self.account, '_platform') and self.account._platform:
-						# Bluesky - fetch fresh profile to get current relationship state
-						try:
-							profile = self.account._platform.client.get_profile(user.id)
-							if profile and hasattr(profile, 'viewer') and profile.viewer:
-								muting = bool(getattr(profile.viewer, 'muted', False))
-						except:
-							pass
+					# Check if we can get relationship info (cached if the user was just viewed)
+					rel = relationships.lookup(self.account, user.id)
+					muting = rel.muting if rel is not None else False
 
 					if muting:
 						# Unmute
@@ -291,6 +259,7 @@ class ChooseGui(wx.Dialog):
 							self.account._platform.unmute(user.id)
 						else:
 							self.account.api.account_unmute(id=user.id)
+						relationships.forget(self.account, user.id)
 						sound.play(self.account, "unmute")
 					else:
 						# Mute - use dialog for Mastodon, direct mute for Bluesky
@@ -301,6 +270,7 @@ class ChooseGui(wx.Dialog):
 						else:
 							if hasattr(self.account, '_platform') and self.account._platform:
 								self.account._platform.mute(user.id)
+							relationships.forget(self.account, user.id)
 							sound.play(self.account, "mute")
 			except Exception as e:
 				self.account.app.handle_error(e, "Toggle mute")
@@ -309,24 +279,9 @@ class ChooseGui(wx.Dialog):
 			try:
 				user = self.account.app.lookup_user_name(self.account, self.returnvalue)
 				if user != -1:
-					# Check if we can get relationship info
-					blocking = False
-					platform_type = getattr(self.account.prefs, 'platform_type', 'mastodon')
-					if platform_type == 'mastodon' and hasattr(self.account, 'api') and hasattr(self.account.api, 'account_relationships'):
-						try:
-							relationships = self.account.api.account_relationships([user.id])
-							if relationships and len(relationships) > 0:
-								blocking = getattr(relationships[0], 'blocking', False)
-						except:
-							pass
-					elif platform_type == 'bluesky' and hasattr(self.account, '_platform') and self.account._platform:
-						# Bluesky - fetch fresh profile to get current relationship state
-						try:
-							profile = self.account._platform.client.get_profile(user.id)
-							if profile and hasattr(profile, 'viewer') and profile.viewer:
-								blocking = bool(getattr(profile.viewer, 'blocking', None))
-						except:
-							pass
+					# Check if we can get relationship info (cached if the user was just viewed)
+					rel = relationships.lookup(self.account, user.id)
+					blocking = rel.blocking if rel is not None else False
 
 					if blocking:
 						self.account.unblock(user.id)
@@ -105,7 +105,7 @@ class invisible_interface(object):
 				if earcon_type:
 					sound.play(get_app().currentAccount, earcon_type)
 				# Fall back to URL-based media detection
-				elif len(sound.get_media_urls(get_app().find_urls_in_status(item))) > 0:
+				elif sound.get_status_media_urls(get_app(), item):
 					sound.play(get_app().currentAccount, "media")
 			# Check if post mentions the current user (skip in mentions timeline - redundant)
 			if item and get_app().prefs.earcon_mention and get_app().currentAccount.currentTimeline.type != "mentions":
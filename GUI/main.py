@@ -8,7 +8,11 @@ from application import get_app
 import wx
 import speak
 from . import account_options, accounts, chooser, custom_timelines, explore_dialog, hashtag_dialog, invisible, lists, misc, options, profile, search, theme, timeline_filter, timelines, tray, tweet, view
+import relationships as relationship_cache
+import remote_resolver
+import render_cache
 import sound
+import stream_stats
 import timeline
 import threading
 
@@ -124,6 +128,8 @@ class MainGui(wx.Frame):
 		self.Bind(wx.EVT_MENU, self.OnFilterTimeline, m_filter_timeline)
 		m_server_filters = menu.Append(-1, "Server Filters", "server_filters")
 		self.Bind(wx.EVT_MENU, self.OnServerFilters, m_server_filters)
+		m_muted_words = menu.Append(-1, "Muted Words", "muted_words")
+		self.Bind(wx.EVT_MENU, self.OnMutedWords, m_muted_words)
 		m_followers = menu.Append(-1, "List Followers\tCtrl+[", "followers")
 		self.Bind(wx.EVT_MENU, self.OnFollowers, m_followers)
 		m_following = menu.Append(-1, "List Following\tCtrl+]", "following")
@@ -370,6 +376,10 @@ class MainGui(wx.Frame):
 		self.Bind(wx.EVT_MENU, self.OnStats, m_stats)
 		m_errors = menu6.Append(-1, "View API errors", "errors")
 		self.Bind(wx.EVT_MENU, self.OnErrors, m_errors)
+		m_stream_status = menu6.Append(-1, "Streaming status", "stream_status")
+		self.Bind(wx.EVT_MENU, self.OnStreamStatus, m_stream_status)
+		m_stream_debug = menu6.Append(-1, "Streaming debug info", "stream_debug")
+		self.Bind(wx.EVT_MENU, self.OnStreamDebug, m_stream_debug)
 		m_view_user_db = menu6.Append(-1, "View user database", "viewusers")
 		self.Bind(wx.EVT_MENU, self.OnViewUserDb, m_view_user_db)
 		m_clean_user_db = menu6.Append(-1, "Refresh user database", "cleanusers")
@@ -711,12 +721,8 @@ class MainGui(wx.Frame):
 				if matched:
 					for key, value in state_updates.items():
 						setattr(target, key, value)
-					# Clear display cache so it gets re-rendered
-					if hasattr(status, '_display_cache'):
-						try:
-							delattr(status, '_display_cache')
-						except (AttributeError, TypeError):
-							pass
+					# Re-render the item on next display
+					render_cache.mark_changed(status)
 
 				# Also check notification statuses
 				if tl.type == "notifications" and hasattr(status, 'status') and status.status:
@@ -726,11 +732,7 @@ class MainGui(wx.Frame):
 					if str(notif_id) == status_id_str or str(orig_id) == status_id_str:
 						for key, value in state_updates.items():
 							setattr(notif_status, key, value)
-						if hasattr(status, '_display_cache'):
-							try:
-								delattr(status, '_display_cache')
-							except (AttributeError, TypeError):
-								pass
+						render_cache.mark_changed(status)
 
 	def OnHideWindow(self, event=None):
 		"""Hide the window (menu handler)."""
@@ -847,9 +849,13 @@ class MainGui(wx.Frame):
 			event.Skip()
 
 	def OnStats(self, event=None):
-		txt=view.ViewTextGui("You have sent a total of "+str(get_app().prefs.posts_sent)+" posts, of which "+str(get_app().prefs.replies_sent)+" are replies and "+str(get_app().prefs.quotes_sent)+" are quotes.\r\nYou have boosted "+str(get_app().prefs.boosts_sent)+" posts, and favourited "+str(get_app().prefs.favourites_sent)+" posts.\r\nYou have sent "+str(get_app().prefs.chars_sent)+" characters from FastSM!\r\nYou have received "+str(get_app().prefs.statuses_received)+" posts in total through all of your timelines.")
+		txt=view.ViewTextGui("You have sent a total of "+str(get_app().prefs.posts_sent)+" posts, of which "+str(get_app().prefs.replies_sent)+" are replies and "+str(get_app().prefs.quotes_sent)+" are quotes.\r\nYou have boosted "+str(get_app().prefs.boosts_sent)+" posts, and favourited "+str(get_app().prefs.favourites_sent)+" posts.\r\nYou have sent "+str(get_app().prefs.chars_sent)+" characters from FastSM!\r\nYou have received "+str(get_app().prefs.statuses_received)+" posts in total through all of your timelines."+self._render_cache_stats())
 		txt.Show()
 
+	def _render_cache_stats(self):
+		stats = render_cache.get_cache().stats()
+		return "\r\nRender cache: "+str(stats['size'])+" of "+str(stats['max_size'])+" entries, "+str(stats['hits'])+" hits, "+str(stats['misses'])+" misses ("+str(round(stats['hit_rate']*100))+"% hit rate)."
+
 	def OnErrors(self, event=None):
 		errors=""
 		for i in get_app().errors:
@@ -857,6 +863,13 @@ class MainGui(wx.Frame):
 		txt=view.ViewTextGui(errors)
 		txt.Show()
 
+	def OnStreamStatus(self, event=None):
+		speak.speak(stream_stats.status_text())
+
+	def OnStreamDebug(self, event=None):
+		txt=view.ViewTextGui(stream_stats.dump())
+		txt.Show()
+
 	def OnManageHide(self, event=None):
 		gui=timelines.HiddenTimelinesGui(get_app().currentAccount)
 		gui.Show()
@@ -1188,6 +1201,7 @@ class MainGui(wx.Frame):
 		if hasattr(tl, '_gaps') and tl._gaps:
 			speak.speak(f"{len(tl._gaps)} gap{'s' if len(tl._gaps) > 1 else ''} to fill")
 		self.refreshList()
+		remote_resolver.request_around(tl.account, tl.statuses, tl.index)
 
 	def play_earcon(self):
 		if get_app().prefs.earcon_top and (not get_app().prefs.reversed and get_app().currentAccount.currentTimeline.index > 0 or get_app().prefs.reversed and get_app().currentAccount.currentTimeline.index < len(get_app().currentAccount.currentTimeline.statuses) - 1):
@@ -1265,6 +1279,8 @@ class MainGui(wx.Frame):
 		tl.index = selection
 		# Track position change for timeline sync
 		tl.mark_position_moved()
+		# Look up local IDs of nearby remote posts before they're interacted with
+		remote_resolver.request_around(tl.account, tl.statuses, selection)
 		status = self.get_current_status()
 		if status and get_app().prefs.earcon_audio:
 			# Get the actual status (unwrap boosts)
@@ -1280,7 +1296,7 @@ class MainGui(wx.Frame):
 			if earcon_type:
 				sound.play(get_app().currentAccount, earcon_type)
 			# Fall back to URL-based media detection
-			elif len(sound.get_media_urls(get_app().find_urls_in_status(status))) > 0:
+			elif sound.get_status_media_urls(get_app(), status):
 				sound.play(get_app().currentAccount, "media")
 		# Check if post mentions the current user (skip in mentions timeline - redundant)
 		if status and get_app().prefs.earcon_mention and get_app().currentAccount.currentTimeline.type != "mentions":
@@ -2039,6 +2055,10 @@ class MainGui(wx.Frame):
 		from . import server_filters
 		server_filters.show_server_filters_dialog(get_app().currentAccount)
 
+	def OnMutedWords(self, event=None):
+		from . import muted_words
+		muted_words.show_muted_words_dialog(get_app().currentAccount)
+
 	def OnUserProfile(self, event=None):
 		account = get_app().currentAccount
 		# Get users from current item (handles both statuses and notifications)
@@ -2395,6 +2415,7 @@ class MainGui(wx.Frame):
 				status_id = misc.get_interaction_id(account, status_to_check)
 				if getattr(status_to_check, 'bookmarked', False):
 					account.api.status_unbookmark(status_id)
+					account.app.forget_status(account, status_id)
 					status_to_check.bookmarked = False
 					sound.play(account, "unlike")
 					speak.speak("Bookmark removed")
@@ -2410,6 +2431,7 @@ class MainGui(wx.Frame):
 							self.on_list_change(None)
 				else:
 					account.api.status_bookmark(status_id)
+					account.app.forget_status(account, status_id)
 					status_to_check.bookmarked = True
 					sound.play(account, "like")
 					speak.speak("Bookmarked")
@@ -2533,6 +2555,7 @@ class MainGui(wx.Frame):
 				is_showing_reblogs = getattr(rel, 'showing_reblogs', True)
 				# Toggle reblogs visibility - use account_follow with reblogs parameter
 				account.api.account_follow(id=user.id, reblogs=not is_showing_reblogs)
+				relationship_cache.forget(account, user.id)
 				if is_showing_reblogs:
 					speak.speak(f"Hiding boosts from {user.acct}")
 					sound.play(account, "mute")
@@ -250,6 +250,10 @@ def get_interaction_id(account, status):
 		# Need to resolve to local ID
 		if hasattr(account, '_platform') and account._platform:
 			try:
+				# Usually resolved already by the background resolver
+				cached_id = account._platform.cached_remote_status_id(status) if hasattr(account._platform, 'cached_remote_status_id') else None
+				if cached_id:
+					return cached_id
 				speak.speak("Resolving remote post...")
 				resolved_id = account._platform.resolve_remote_status(status)
 				print(f"Resolved ID: {resolved_id}")
@@ -334,6 +338,7 @@ def pin_toggle(account, status):
 		if getattr(actual_status, '_pinned', False) or getattr(actual_status, 'pinned', False):
 			# Unpin
 			success = platform.unpin_status(status_id)
+			account.app.forget_status(account, status_id)
 			if success:
 				actual_status._pinned = False
 				actual_status.pinned = False
@@ -342,6 +347,7 @@ def pin_toggle(account, status):
 		else:
 			# Pin
 			success = platform.pin_status(status_id)
+			account.app.forget_status(account, status_id)
 			if success:
 				actual_status._pinned = True
 				actual_status.pinned = True
@@ -637,6 +643,7 @@ def delete(account, status):
 			account._platform.delete_status(status.id)
 		else:
 			account.api.status_delete(id=status.id)
+		account.app.forget_status(account, status.id)
 		# Remove from all timelines by ID (not object identity)
 		status_id_str = str(status.id)
 		for tl in account.timelines:
@@ -707,8 +714,7 @@ def play_external(status):
 	# If no audio attachment, check all URLs in status for media (including audio)
 	# Use get_media_urls to match the same URLs that earcon detection uses
 	if not audio_url:
-		urls = get_app().find_urls_in_status(status)
-		media_urls = sound.get_media_urls(urls)
+		media_urls = sound.get_status_media_urls(get_app(), status)
 		if media_urls:
 			audio_url = media_urls[0]['url']
 
@@ -2,6 +2,7 @@
 
 import wx
 import speak
+import relationships
 
 # Duration options in seconds (0 = indefinite)
 DURATION_OPTIONS = [
@@ -80,6 +81,7 @@ class MuteDialog(wx.Dialog):
                     notifications=mute_notifications
                 )
                 success = True
+            relationships.forget(self.account, self.user.id)
 
             if success:
                 duration_text = DURATION_OPTIONS[duration_index][0].lower()
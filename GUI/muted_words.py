@@ -0,0 +1,244 @@
+"""Dialog for managing client-side muted words."""
+
+import time
+
+import wx
+import speak
+import mutes
+from application import get_app
+
+
+# Mute action options
+ACTION_OPTIONS = [
+    ("Hide completely", mutes.ACTION_HIDE),
+    ("Show with warning", mutes.ACTION_WARN),
+]
+
+# Duration options (in seconds, 0 = forever)
+DURATION_OPTIONS = [
+    ("Forever", 0),
+    ("30 minutes", 1800),
+    ("1 hour", 3600),
+    ("6 hours", 21600),
+    ("12 hours", 43200),
+    ("1 day", 86400),
+    ("1 week", 604800),
+]
+
+
+def describe_rule(rule):
+    """One-line description of a mute rule for the list."""
+    text = rule.get('keyword', '')
+    details = [rule.get('action', mutes.ACTION_HIDE)]
+    if rule.get('regex'):
+        details.append("regex")
+    elif rule.get('whole_word', True):
+        details.append("whole word")
+    expires_at = rule.get('expires_at')
+    if expires_at:
+        if expires_at <= time.time():
+            details.append("expired")
+        else:
+            details.append("until " + time.strftime("%m/%d/%Y %H:%M", time.localtime(expires_at)))
+    return f"{text} [{', '.join(details)}]"
+
+
+class MutedWordsDialog(wx.Dialog):
+    """Dialog for viewing and editing an account's muted words."""
+
+    def __init__(self, parent, account):
+        wx.Dialog.__init__(self, parent, title="Muted Words", size=(500, 400))
+        self.account = account
+        self.rules = [dict(rule) for rule in account.prefs.muted_words]
+        self.changed = False
+
+        panel = wx.Panel(self)
+        main_box = wx.BoxSizer(wx.VERTICAL)
+
+        list_label = wx.StaticText(panel, -1, "&Muted words:")
+        main_box.Add(list_label, 0, wx.ALL, 5)
+
+        self.rule_list = wx.ListBox(panel, -1, size=(450, 200))
+        main_box.Add(self.rule_list, 1, wx.ALL | wx.EXPAND, 5)
+
+        button_box = wx.BoxSizer(wx.HORIZONTAL)
+
+        add_btn = wx.Button(panel, -1, "&Add")
+        add_btn.Bind(wx.EVT_BUTTON, self.on_add)
+        button_box.Add(add_btn, 0, wx.ALL, 5)
+
+        edit_btn = wx.Button(panel, -1, "&Edit")
+        edit_btn.Bind(wx.EVT_BUTTON, self.on_edit)
+        button_box.Add(edit_btn, 0, wx.ALL, 5)
+
+        delete_btn = wx.Button(panel, -1, "&Delete")
+        delete_btn.Bind(wx.EVT_BUTTON, self.on_delete)
+        button_box.Add(delete_btn, 0, wx.ALL, 5)
+
+        close_btn = wx.Button(panel, wx.ID_CANCEL, "&Close")
+        button_box.Add(close_btn, 0, wx.ALL, 5)
+
+        main_box.Add(button_box, 0, wx.ALL | wx.ALIGN_CENTER, 5)
+
+        panel.SetSizer(main_box)
+
+        self.load_rules()
+        self.rule_list.SetFocus()
+
+    def load_rules(self, selection=0):
+        self.rule_list.Clear()
+        for rule in self.rules:
+            self.rule_list.Append(describe_rule(rule))
+        if self.rules:
+            self.rule_list.SetSelection(min(selection, len(self.rules) - 1))
+
+    def save(self):
+        mutes.set_rules(self.account, self.rules)
+        self.changed = True
+
+    def on_add(self, event):
+        dlg = EditMutedWordDialog(self, None)
+        if dlg.ShowModal() == wx.ID_OK:
+            self.rules.append(dlg.rule)
+            self.save()
+            self.load_rules(len(self.rules) - 1)
+        dlg.Destroy()
+
+    def on_edit(self, event):
+        selection = self.rule_list.GetSelection()
+        if selection < 0 or selection >= len(self.rules):
+            speak.speak("No muted word selected")
+            return
+        dlg = EditMutedWordDialog(self, self.rules[selection])
+        if dlg.ShowModal() == wx.ID_OK:
+            self.rules[selection] = dlg.rule
+            self.save()
+            self.load_rules(selection)
+        dlg.Destroy()
+
+    def on_delete(self, event):
+        selection = self.rule_list.GetSelection()
+        if selection < 0 or selection >= len(self.rules):
+            speak.speak("No muted word selected")
+            return
+        del self.rules[selection]
+        self.save()
+        self.load_rules(selection)
+        speak.speak("Muted word deleted")
+
+
+class EditMutedWordDialog(wx.Dialog):
+    """Dialog for adding or editing a muted word."""
+
+    def __init__(self, parent, rule=None):
+        title = "Edit Muted Word" if rule else "Add Muted Word"
+        wx.Dialog.__init__(self, parent, title=title, size=(450, 300))
+        self.rule = None
+
+        panel = wx.Panel(self)
+        main_box = wx.BoxSizer(wx.VERTICAL)
+
+        keyword_box = wx.BoxSizer(wx.HORIZONTAL)
+        keyword_label = wx.StaticText(panel, -1, "&Word or phrase:")
+        keyword_box.Add(keyword_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.keyword_text = wx.TextCtrl(panel, -1, size=(300, -1))
+        keyword_box.Add(self.keyword_text, 1, wx.ALL | wx.EXPAND, 5)
+        main_box.Add(keyword_box, 0, wx.EXPAND)
+
+        self.whole_word = wx.CheckBox(panel, -1, "Match &whole word only")
+        self.whole_word.SetValue(True)
+        main_box.Add(self.whole_word, 0, wx.ALL, 5)
+
+        self.regex = wx.CheckBox(panel, -1, "&Regular expression")
+        main_box.Add(self.regex, 0, wx.ALL, 5)
+
+        action_box = wx.BoxSizer(wx.HORIZONTAL)
+        action_label = wx.StaticText(panel, -1, "&Action:")
+        action_box.Add(action_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.action_choice = wx.Choice(panel, -1, choices=[a[0] for a in ACTION_OPTIONS])
+        self.action_choice.SetSelection(0)
+        action_box.Add(self.action_choice, 0, wx.ALL, 5)
+        main_box.Add(action_box, 0)
+
+        duration_box = wx.BoxSizer(wx.HORIZONTAL)
+        duration_label = wx.StaticText(panel, -1, "&Duration:")
+        duration_box.Add(duration_label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        choices = [d[0] for d in DURATION_OPTIONS]
+        if rule and rule.get('expires_at'):
+            choices.insert(0, "Keep current expiry")
+        self.duration_choice = wx.Choice(panel, -1, choices=choices)
+        self.duration_choice.SetSelection(0)
+        duration_box.Add(self.duration_choice, 0, wx.ALL, 5)
+        main_box.Add(duration_box, 0)
+
+        button_box = wx.BoxSizer(wx.HORIZONTAL)
+        save_btn = wx.Button(panel, wx.ID_OK, "&Save")
+        save_btn.Bind(wx.EVT_BUTTON, self.on_save)
+        save_btn.SetDefault()
+        button_box.Add(save_btn, 0, wx.ALL, 5)
+        cancel_btn = wx.Button(panel, wx.ID_CANCEL, "&Cancel")
+        button_box.Add(cancel_btn, 0, wx.ALL, 5)
+        main_box.Add(button_box, 0, wx.ALL | wx.ALIGN_CENTER, 10)
+
+        panel.SetSizer(main_box)
+
+        self.original = rule
+        if rule:
+            self.keyword_text.SetValue(rule.get('keyword', ''))
+            self.whole_word.SetValue(rule.get('whole_word', True))
+            self.regex.SetValue(rule.get('regex', False))
+            for i, (_, value) in enumerate(ACTION_OPTIONS):
+                if value == rule.get('action', mutes.ACTION_HIDE):
+                    self.action_choice.SetSelection(i)
+                    break
+
+        self.keyword_text.SetFocus()
+
+    def on_save(self, event):
+        keyword = self.keyword_text.GetValue().strip()
+        if not keyword:
+            speak.speak("A word or phrase is required")
+            return
+        is_regex = self.regex.GetValue()
+        if is_regex:
+            import re
+            try:
+                re.compile(keyword)
+            except re.error as e:
+                speak.speak(f"Invalid regular expression: {e}")
+                return
+
+        duration_idx = self.duration_choice.GetSelection()
+        if self.duration_choice.GetCount() > len(DURATION_OPTIONS):
+            # First choice keeps the current expiry
+            if duration_idx == 0:
+                expires_at = self.original.get('expires_at')
+            else:
+                seconds = DURATION_OPTIONS[duration_idx - 1][1]
+                expires_at = time.time() + seconds if seconds else None
+        else:
+            seconds = DURATION_OPTIONS[duration_idx][1]
+            expires_at = time.time() + seconds if seconds else None
+
+        self.rule = {
+            "keyword": keyword,
+            "regex": is_regex,
+            "whole_word": self.whole_word.GetValue(),
+            "action": ACTION_OPTIONS[self.action_choice.GetSelection()][1],
+            "expires_at": expires_at,
+        }
+        self.EndModal(wx.ID_OK)
+
+
+def show_muted_words_dialog(account):
+    """Show the muted words dialog and apply any changes to open timelines."""
+    from . import main as main_window
+    import platform
+    parent = None if platform.system() == "Darwin" else main_window.window
+    dlg = MutedWordsDialog(parent, account)
+    dlg.ShowModal()
+    changed = dlg.changed
+    dlg.Destroy()
+    if changed:
+        mutes.apply_to_timelines(account)
+        main_window.window.refreshList()
@@ -1,3 +1,4 @@
+import render_cache
 import timeline
 import platform
 import os, sys
@@ -528,6 +529,9 @@ class templates(wx.Panel, wx.Dialog):
 		self.use24HourTime=wx.CheckBox(self, -1, "Use 24-hour time for post timestamps")
 		self.main_box.Add(self.use24HourTime, 0, wx.ALL, 10)
 		self.use24HourTime.SetValue(get_app().prefs.use24HourTime)
+		self.relative_times=wx.CheckBox(self, -1, "Show post times as relative time (for example, 5m ago)")
+		self.main_box.Add(self.relative_times, 0, wx.ALL, 10)
+		self.relative_times.SetValue(get_app().prefs.relative_times)
 		self.postTemplate_label = wx.StaticText(self, -1, "Post template")
 		self.main_box.Add(self.postTemplate_label, 0, wx.LEFT | wx.TOP, 10)
 		self.postTemplate = wx.TextCtrl(self, -1, "", name="Post template")
@@ -620,6 +624,8 @@ class templates(wx.Panel, wx.Dialog):
 				('$application.website$', 'Posting application website'),
 				('$in_reply_to_id$', 'Replied post ID'),
 				('$in_reply_to_account_id$', 'Replied account ID'),
+				('$in_reply_to_account.acct$', 'Replied account handle'),
+				('$in_reply_to_account.display_name$', 'Replied account display name'),
 			]
 		elif template_type == 'boost':
 			placeholders = [
@@ -942,6 +948,7 @@ class OptionsGui(wx.Dialog):
 	def OnOK(self, event):
 		refresh=False
 		get_app().prefs.use24HourTime = self.templates.use24HourTime.GetValue()
+		get_app().prefs.relative_times = self.templates.relative_times.GetValue()
 		get_app().prefs.ask_dismiss=self.timelines_tab.ask_dismiss.GetValue()
 		if platform.system()!="Darwin":
 			get_app().prefs.invisible=self.invisible_tab.invisible.GetValue()
@@ -1068,6 +1075,7 @@ class OptionsGui(wx.Dialog):
 			get_app().prefs.include_link_preview != self.templates.include_link_preview.GetValue() or
 			get_app().prefs.max_usernames_display != self.templates.max_usernames_display.GetValue() or
 			get_app().prefs.use24HourTime != self.templates.use24HourTime.GetValue() or
+			get_app().prefs.relative_times != self.templates.relative_times.GetValue() or
 			get_app().prefs.cw_mode != new_cw_mode):
 			refresh=True
 		get_app().prefs.demojify=self.templates.demojify.GetValue()
@@ -1093,12 +1101,8 @@ class OptionsGui(wx.Dialog):
 		if reverse:
 			timeline.reverse(get_app())
 		if refresh:
-			# Clear display caches on all statuses when templates/display settings change
-			for account in get_app().accounts:
-				for tl in account.timelines:
-					for status in tl.statuses:
-						if hasattr(status, '_display_cache'):
-							delattr(status, '_display_cache')
+			# Re-render everything when templates/display settings change
+			render_cache.bump_generation()
 			main.window.refreshList()
 
 	def OnClose(self, event):
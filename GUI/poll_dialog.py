@@ -240,6 +240,7 @@ class PollDialog(wx.Dialog):
         try:
             poll_id = self.poll.id
             self.account.api.poll_vote(poll_id, choices)
+            self.account.app.forget_status(self.account, self.status.id)
             sound.play(self.account, "like")
             speak.speak("Vote submitted")
             self.EndModal(wx.ID_OK)
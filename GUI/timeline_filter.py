@@ -1,8 +1,183 @@
-"""Dialog for filtering timeline posts by type."""
+"""Dialog for filtering timeline posts by type.
+
+Each post's filter-relevant properties (boost, quote, reply, media, ...) are
+computed once and kept on the post as a bitmask, and filter settings compile
+to a mask/value pair, so filtering a timeline is a loop of integer compares.
+"""
+
+import functools
+from collections import namedtuple
 
 import wx
+import html_text
 from application import get_app
 
+# Post features
+FEATURE_BOOST = 1 << 0
+FEATURE_QUOTE = 1 << 1
+FEATURE_THREAD = 1 << 2  # reply to the author's own post
+FEATURE_REPLY = 1 << 3  # reply to someone else
+FEATURE_REPLY_TO_ME = 1 << 4
+FEATURE_ORIGINAL = 1 << 5  # neither a reply nor a boost
+FEATURE_MEDIA = 1 << 6
+FEATURE_MY_POST = 1 << 7
+FEATURE_MY_REPLY = 1 << 8
+# Never set on a post; used to build a filter nothing passes
+_FEATURE_NEVER = 1 << 30
+
+# Filter setting -> feature that must be absent when the setting is off
+_HIDE_FEATURES = (
+    ('boosts', FEATURE_BOOST),
+    ('quotes', FEATURE_QUOTE),
+    ('threads', FEATURE_THREAD),
+    ('replies', FEATURE_REPLY),
+    ('replies_to_me', FEATURE_REPLY_TO_ME),
+    ('original', FEATURE_ORIGINAL),
+    ('media', FEATURE_MEDIA),
+    ('my_posts', FEATURE_MY_POST),
+    ('my_replies', FEATURE_MY_REPLY),
+)
+
+# A post passes when features & mask == value and, if text is set, it contains text
+FeatureFilter = namedtuple('FeatureFilter', ('mask', 'value', 'text'))
+
+
+def _my_id(account):
+    if account is None or not hasattr(account, 'me'):
+        return ''
+    return str(getattr(account.me, 'id', ''))
+
+
+def _compute_features(status, me_id):
+    post = status.reblog if getattr(status, 'reblog', None) is not None else status
+    features = 0
+    if post is not status:
+        features |= FEATURE_BOOST
+    if getattr(post, 'quote', None) is not None:
+        features |= FEATURE_QUOTE
+    if getattr(post, 'media_attachments', None):
+        features |= FEATURE_MEDIA
+    author = getattr(post, 'account', None)
+    author_id = str(getattr(author, 'id', '')) if author else ''
+    is_mine = bool(me_id) and author is not None and author_id == me_id
+    if is_mine:
+        features |= FEATURE_MY_POST
+    if getattr(post, 'in_reply_to_id', None) is None:
+        if not features & FEATURE_BOOST:
+            features |= FEATURE_ORIGINAL
+        return features
+    # Without in_reply_to_account_id a reply is assumed to be to someone else
+    # (looking up the parent would be too slow for filtering)
+    reply_to = getattr(post, 'in_reply_to_account_id', None)
+    reply_to = str(reply_to) if reply_to is not None else None
+    if author is not None and reply_to is not None and reply_to == author_id:
+        features |= FEATURE_THREAD
+    else:
+        features |= FEATURE_REPLY
+    if me_id and reply_to == me_id:
+        features |= FEATURE_REPLY_TO_ME
+    if is_mine:
+        features |= FEATURE_MY_REPLY
+    return features
+
+
+def status_features(status, account=None):
+    """Feature bitmask of a status, remembered on it until it is marked changed."""
+    key = (_my_id(account), getattr(status, '_render_version', 0))
+    cached = getattr(status, '_features', None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    features = _compute_features(status, key[0])
+    try:
+        status._features = (key, features)
+    except (AttributeError, TypeError):
+        pass
+    return features
+
+
+@functools.lru_cache(maxsize=64)
+def _compile(key):
+    settings = dict(key)
+    mask = 0
+    for name, feature in _HIDE_FEATURES:
+        if not settings.get(name, True):
+            mask |= feature
+    value = 0
+    if not settings.get('no_media', True):
+        if mask & FEATURE_MEDIA:
+            # Neither posts with media nor posts without it
+            mask |= _FEATURE_NEVER
+            value |= _FEATURE_NEVER
+        mask |= FEATURE_MEDIA
+        value |= FEATURE_MEDIA
+    text = str(settings.get('text', '') or '').strip().lower()
+    return FeatureFilter(mask, value, text)
+
+
+def compile_filter(settings):
+    """Compile filter settings to a FeatureFilter, or None if they filter nothing."""
+    if not settings:
+        return None
+    try:
+        compiled = _compile(tuple(sorted(settings.items())))
+    except TypeError:
+        compiled = _compile.__wrapped__(tuple(settings.items()))
+    if not compiled.mask and not compiled.text:
+        return None
+    return compiled
+
+
+def _search_text(status):
+    """Lowercased text, display name and handle of a post, for the text filter."""
+    post = status.reblog if getattr(status, 'reblog', None) is not None else status
+    version = getattr(post, '_render_version', 0)
+    cached = getattr(post, '_search_text', None)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    post_text = getattr(post, 'text', '')
+    if not post_text and getattr(post, 'content', ''):
+        post_text = html_text.for_status(post).text
+    author = getattr(post, 'account', None)
+    display_name = getattr(author, 'display_name', '') if author else ''
+    acct = getattr(author, 'acct', '') if author else ''
+    searchable = f"{post_text or ''} {display_name} {acct}".lower()
+    try:
+        post._search_text = (version, searchable)
+    except (AttributeError, TypeError):
+        pass
+    return searchable
+
+
+def status_passes(status, compiled, account=None):
+    """Check a status against a compiled filter."""
+    if compiled is None:
+        return True
+    if status_features(status, account) & compiled.mask != compiled.value:
+        return False
+    return not compiled.text or compiled.text in _search_text(status)
+
+
+def filter_statuses(statuses, settings, account=None):
+    """Return the statuses that pass the filter settings, in order."""
+    compiled = compile_filter(settings)
+    if compiled is None:
+        return list(statuses)
+    me_id = _my_id(account)
+    mask = compiled.mask
+    value = compiled.value
+    text = compiled.text
+    result = []
+    append = result.append
+    for status in statuses:
+        cached = getattr(status, '_features', None)
+        if cached is not None and cached[0] == (me_id, getattr(status, '_render_version', 0)):
+            features = cached[1]
+        else:
+            features = status_features(status, account)
+        if features & mask == value and (not text or text in _search_text(status)):
+            append(status)
+    return result
+
 
 def should_show_status(status, settings, app=None, _parent_cache=None, account=None):
     """Check if a status should be shown based on filter settings.
@@ -13,185 +188,14 @@ def should_show_status(status, settings, app=None, _parent_cache=None, account=N
     Args:
         status: The status to check
         settings: Dict with filter settings (original, replies, threads, boosts, quotes, media, no_media, replies_to_me)
-        app: Application instance for looking up parent posts (optional)
-        _parent_cache: Dict cache for parent lookups (optional, for batch filtering)
+        app: Unused, kept for compatibility
+        _parent_cache: Unused, kept for compatibility
         account: Account instance for checking replies to self (optional)
 
     Returns:
         True if the status should be shown, False otherwise
     """
-    if not settings:
-        return True
-
-    if app is None:
-        app = get_app()
-
-    def get_post_for_check(s):
-        """Get the actual post to check (unwrap boosts for content checks)."""
-        if hasattr(s, 'reblog') and s.reblog:
-            return s.reblog
-        return s
-
-    def is_boost(s):
-        return hasattr(s, 'reblog') and s.reblog is not None
-
-    def is_quote(s):
-        post = get_post_for_check(s)
-        return hasattr(post, 'quote') and post.quote is not None
-
-    def has_media(s):
-        post = get_post_for_check(s)
-        attachments = getattr(post, 'media_attachments', None)
-        return attachments is not None and len(attachments) > 0
-
-    def is_reply_to_id(s):
-        post = get_post_for_check(s)
-        return hasattr(post, 'in_reply_to_id') and post.in_reply_to_id is not None
-
-    def is_thread(s):
-        """Check if status is a self-reply (thread continuation)."""
-        post = get_post_for_check(s)
-        if not hasattr(post, 'in_reply_to_id') or post.in_reply_to_id is None:
-            return False
-
-        # Get author of this post
-        post_author = getattr(post, 'account', None)
-        if not post_author:
-            return False
-        post_author_id = str(getattr(post_author, 'id', ''))
-
-        # Fast path: use in_reply_to_account_id if available (no API call needed)
-        if hasattr(post, 'in_reply_to_account_id') and post.in_reply_to_account_id is not None:
-            return str(post.in_reply_to_account_id) == post_author_id
-
-        # Fallback: check if we know this is a self-reply from other fields
-        # Don't make API calls for filtering - too slow
-        # If we can't determine, assume it's a reply to others (safer default)
-        return False
-
-    def is_reply(s):
-        """Check if status is a reply to someone else (not self)."""
-        if not is_reply_to_id(s):
-            return False
-        return not is_thread(s)
-
-    def is_reply_to_me(s):
-        """Check if status is a reply to the current user."""
-        post = get_post_for_check(s)
-        if not hasattr(post, 'in_reply_to_id') or post.in_reply_to_id is None:
-            return False
-
-        if not account:
-            return False
-
-        # Get current user ID
-        me_id = str(getattr(account.me, 'id', '')) if hasattr(account, 'me') else ''
-        if not me_id:
-            return False
-
-        # Use in_reply_to_account_id if available
-        if hasattr(post, 'in_reply_to_account_id') and post.in_reply_to_account_id is not None:
-            return str(post.in_reply_to_account_id) == me_id
-
-        return False
-
-    def is_original(s):
-        """Check if status is an original post (not reply, not boost)."""
-        if is_boost(s):
-            return False
-        return not is_reply_to_id(s)
-
-    def is_my_post(s):
-        """Check if status is posted by the current user."""
-        if not account:
-            return False
-        post = get_post_for_check(s)
-        me_id = str(getattr(account.me, 'id', '')) if hasattr(account, 'me') else ''
-        if not me_id:
-            return False
-        post_author = getattr(post, 'account', None)
-        if not post_author:
-            return False
-        post_author_id = str(getattr(post_author, 'id', ''))
-        return post_author_id == me_id
-
-    def is_my_reply(s):
-        """Check if status is a reply posted by the current user."""
-        if not is_reply_to_id(s):
-            return False
-        return is_my_post(s)
-
-    # Now apply filters
-    _is_boost = is_boost(status)
-    _is_quote = is_quote(status)
-    _is_thread = is_thread(status)
-    _is_reply = is_reply(status)
-    _is_reply_to_me = is_reply_to_me(status)
-    _is_original = is_original(status)
-    _has_media = has_media(status)
-    _is_my_post = is_my_post(status)
-    _is_my_reply = is_my_reply(status)
-
-    # Check boost filter
-    if _is_boost and not settings.get('boosts', True):
-        return False
-
-    # Check quote filter
-    if _is_quote and not settings.get('quotes', True):
-        return False
-
-    # Check thread filter (self-replies)
-    if _is_thread and not settings.get('threads', True):
-        return False
-
-    # Check reply filter (replies to others)
-    if _is_reply and not settings.get('replies', True):
-        return False
-
-    # Check replies to me filter
-    if _is_reply_to_me and not settings.get('replies_to_me', True):
-        return False
-
-    # Check original post filter
-    if _is_original and not _is_boost and not settings.get('original', True):
-        return False
-
-    # Check media filters
-    if _has_media and not settings.get('media', True):
-        return False
-    if not _has_media and not settings.get('no_media', True):
-        return False
-
-    # Check your posts filter
-    if _is_my_post and not settings.get('my_posts', True):
-        return False
-
-    # Check your replies filter
-    if _is_my_reply and not settings.get('my_replies', True):
-        return False
-
-    # Check text filter
-    filter_text = settings.get('text', '').strip().lower()
-    if filter_text:
-        post = get_post_for_check(status)
-        # Get text content - try 'text' attribute first, then strip HTML from 'content'
-        post_text = getattr(post, 'text', '')
-        if not post_text:
-            content = getattr(post, 'content', '')
-            if content and app:
-                post_text = app.strip_html(content)
-        post_text = post_text.lower() if post_text else ''
-
-        # Also check display name and username
-        account = getattr(post, 'account', None)
-        display_name = getattr(account, 'display_name', '') if account else ''
-        acct = getattr(account, 'acct', '') if account else ''
-
-        searchable = f"{post_text} {display_name} {acct}".lower()
-        if filter_text not in searchable:
-            return False
-
-    return True
+    return status_passes(status, compile_filter(settings), account)
 
 
 class TimelineFilterDialog(wx.Dialog):
@@ -374,12 +378,7 @@ class TimelineFilterDialog(wx.Dialog):
             _save_filter_settings(self.timeline.account, self.timeline)
 
             # Filter statuses from the unfiltered list
-            filtered = []
-            for status in self.timeline._unfiltered_statuses:
-                if should_show_status(status, self.timeline._filter_settings, self.app, account=self.timeline.account):
-                    filtered.append(status)
-
-            self.timeline.statuses = filtered
+            self.timeline.statuses = filter_statuses(self.timeline._unfiltered_statuses, self.timeline._filter_settings, self.timeline.account)
             self.timeline._is_filtered = True
 
             # Refresh the list and restore position
@@ -496,11 +495,6 @@ def apply_saved_filter(timeline):
     timeline._filter_settings = saved
 
     # Filter statuses
-    filtered = []
-    for status in timeline._unfiltered_statuses:
-        if should_show_status(status, timeline._filter_settings, timeline.app, account=timeline.account):
-            filtered.append(status)
-
-    timeline.statuses = filtered
+    timeline.statuses = filter_statuses(timeline._unfiltered_statuses, timeline._filter_settings, timeline.account)
     timeline._is_filtered = True
     return True
@@ -1,5 +1,6 @@
-import requests
 import platform
+import http_client
+import relationships
 from application import get_app
 from version import APP_NAME, APP_VERSION
 from . import misc, theme
@@ -644,6 +645,7 @@ class UserViewGui(wx.Dialog):
 		self.close.Bind(wx.EVT_BUTTON, self.OnClose)
 		self.main_box.Add(self.close, 0, wx.ALL, 10)
 
+		self._relationships = relationships.get_cache(account)
 		self.on_list_change(None)
 
 		menu = wx.Menu()
@@ -664,14 +666,31 @@ class UserViewGui(wx.Dialog):
 		self.panel.Layout()
 		theme.apply_theme(self)
 
+	def _prefetch(self, index):
+		"""Resolve relationships and profiles for the page of users from index on, in the background."""
+		user_ids = [getattr(u, 'id', None) for u in self.users[index:index + relationships.PAGE_SIZE]]
+		self._relationships.prefetch(user_ids, callback=lambda done: wx.CallAfter(self._on_prefetched, done))
+
+	def _on_prefetched(self, user_ids):
+		# The dialog may have been closed while the prefetch ran
+		if not self:
+			return
+		if 0 <= self.index < len(self.users) and str(getattr(self.users[self.index], 'id', '')) in user_ids:
+			# Show what was found without starting another lookup (it may have failed)
+			self.on_list_change(None, prefetch=False)
+
 	def OnSpeakUser(self, event):
 		self.index = self.list.GetSelection()
 		user = self.users[self.index].acct
 		self.account.app.speak_user(self.account, [user])
 
-	def on_list_change(self, event):
+	def on_list_change(self, event, prefetch=True):
 		self.index = self.list.GetSelection()
 		user = self.users[self.index]
+		cache = self._relationships
+		if prefetch:
+			# Look up this page in the background; _on_prefetched shows the rest when it finishes
+			self._prefetch(self.index)
 
 		# Fetch detailed profile if this looks like a basic profile view
 		# Basic profiles lack created_at and counts (or have all zeros)
@@ -681,125 +700,81 @@ class UserViewGui(wx.Dialog):
 			 getattr(user, 'following_count', 0) == 0 and
 			 getattr(user, 'statuses_count', 0) == 0)
 		)
-		if is_basic_profile:
-			try:
-				detailed_user = self.account.get_user(user.id)
-				if detailed_user:
-					# Update the user in our list with detailed info
-					self.users[self.index] = detailed_user
-					user = detailed_user
-			except:
-				pass  # Fall back to basic profile if fetch fails
+		rel = cache.relationship(user.id)
+		detailed_user = cache.profile(user.id) if is_basic_profile else None
+		if is_basic_profile and detailed_user:
+			# Update the user in our list with detailed info
+			self.users[self.index] = detailed_user
+			user = detailed_user
+
+		if rel is None:
+			# Try Bluesky viewer attribute as fallback
+			viewer = getattr(user, 'viewer', None)
+			if viewer:
+				rel = relationships.from_viewer(viewer)
 
 		# Check relationship with this user
 		relationship_status = ""
-		try:
-			relationships = self.account.api.account_relationships(id=user.id)
-			if relationships and len(relationships) > 0:
-				rel = relationships[0]
-				following = getattr(rel, 'following', False)
-				followed_by = getattr(rel, 'followed_by', False)
-				muting = getattr(rel, 'muting', False)
-				blocking = getattr(rel, 'blocking', False)
-				showing_reblogs = getattr(rel, 'showing_reblogs', True)
-
-				# Build relationship status string
-				if following and followed_by:
-					relationship_status = "You follow each other"
-				elif following:
-					relationship_status = "You follow them"
-				elif followed_by:
-					relationship_status = "Follows you"
-
-				if following:
-					self.unfollow.Enable(True)
-					self.follow.Enable(False)
-					# Show/hide boosts only available when following
-					if self.show_boosts is not None:
-						if showing_reblogs:
-							self.hide_boosts.Enable(True)
-							self.show_boosts.Enable(False)
-						else:
-							self.hide_boosts.Enable(False)
-							self.show_boosts.Enable(True)
-					# Enable/disable notifications only available when following
-					if self.enable_notifs is not None:
-						notifying = getattr(rel, 'notifying', False)
-						if notifying:
-							self.disable_notifs.Enable(True)
-							self.enable_notifs.Enable(False)
-						else:
-							self.disable_notifs.Enable(False)
-							self.enable_notifs.Enable(True)
-				else:
-					self.unfollow.Enable(False)
-					self.follow.Enable(True)
-					# Disable boosts buttons when not following
-					if self.show_boosts is not None:
+		if rel is not None:
+			# Build relationship status string
+			if rel.following and rel.followed_by:
+				relationship_status = "You follow each other"
+			elif rel.following:
+				relationship_status = "You follow them"
+			elif rel.followed_by:
+				relationship_status = "Follows you"
+
+			if rel.following:
+				self.unfollow.Enable(True)
+				self.follow.Enable(False)
+				# Show/hide boosts only available when following
+				if self.show_boosts is not None:
+					if rel.showing_reblogs:
+						self.hide_boosts.Enable(True)
 						self.show_boosts.Enable(False)
+					else:
 						self.hide_boosts.Enable(False)
-					# Disable notification buttons when not following
-					if self.enable_notifs is not None:
+						self.show_boosts.Enable(True)
+				# Enable/disable notifications only available when following
+				if self.enable_notifs is not None:
+					if rel.notifying:
+						self.disable_notifs.Enable(True)
 						self.enable_notifs.Enable(False)
+					else:
 						self.disable_notifs.Enable(False)
-
-				if muting:
-					self.unmute.Enable(True)
-					self.mute.Enable(False)
-				else:
-					self.unmute.Enable(False)
-					self.mute.Enable(True)
-
-				if blocking:
-					self.unblock.Enable(True)
-					self.block.Enable(False)
-				else:
-					self.unblock.Enable(False)
-					self.block.Enable(True)
-		except:
-			# Try Bluesky viewer attribute as fallback
-			viewer = getattr(user, 'viewer', None)
-			if viewer:
-				following = getattr(viewer, 'following', None) is not None
-				followed_by = getattr(viewer, 'followedBy', None) is not None
-				muting = getattr(viewer, 'muted', False)
-				blocking = getattr(viewer, 'blocking', None) is not None
-
-				# Build relationship status string
-				if following and followed_by:
-					relationship_status = "You follow each other"
-				elif following:
-					relationship_status = "You follow them"
-				elif followed_by:
-					relationship_status = "Follows you"
-
-				if following:
-					self.unfollow.Enable(True)
-					self.follow.Enable(False)
-				else:
-					self.unfollow.Enable(False)
-					self.follow.Enable(True)
-
-				if muting:
-					self.unmute.Enable(True)
-					self.mute.Enable(False)
-				else:
-					self.unmute.Enable(False)
-					self.mute.Enable(True)
-
-				if blocking:
-					self.unblock.Enable(True)
-					self.block.Enable(False)
-				else:
-					self.unblock.Enable(False)
-					self.block.Enable(True)
+						self.enable_notifs.Enable(True)
 			else:
+				self.unfollow.Enable(False)
 				self.follow.Enable(True)
-				self.unfollow.Enable(True)
-				self.mute.Enable(True)
+				# Disable boosts buttons when not following
+				if self.show_boosts is not None:
+					self.show_boosts.Enable(False)
+					self.hide_boosts.Enable(False)
+				# Disable notification buttons when not following
+				if self.enable_notifs is not None:
+					self.enable_notifs.Enable(False)
+					self.disable_notifs.Enable(False)
+
+			if rel.muting:
 				self.unmute.Enable(True)
-				self.block.Enable(True)
+				self.mute.Enable(False)
+			else:
+				self.unmute.Enable(False)
+				self.mute.Enable(True)
+
+			if rel.blocking:
 				self.unblock.Enable(True)
+				self.block.Enable(False)
+			else:
+				self.unblock.Enable(False)
+				self.block.Enable(True)
+		else:
+			self.follow.Enable(True)
+			self.unfollow.Enable(True)
+			self.mute.Enable(True)
+			self.unmute.Enable(True)
+			self.block.Enable(True)
+			self.unblock.Enable(True)
 			if self.show_boosts is not None:
 				self.show_boosts.Enable(True)
 				self.hide_boosts.Enable(True)
@@ -901,6 +876,7 @@ class UserViewGui(wx.Dialog):
 		user = self.users[self.index]
 		try:
 			self.account.api.account_follow(id=user.id, reblogs=True)
+			relationships.forget(self.account, user.id)
 			sound.play(self.account, "unmute")
 			speak.speak(f"Showing boosts from {user.acct}")
 			self.on_list_change(None)
@@ -913,6 +889,7 @@ class UserViewGui(wx.Dialog):
 		user = self.users[self.index]
 		try:
 			self.account.api.account_follow(id=user.id, reblogs=False)
+			relationships.forget(self.account, user.id)
 			sound.play(self.account, "mute")
 			speak.speak(f"Hiding boosts from {user.acct}")
 			self.on_list_change(None)
@@ -925,6 +902,7 @@ class UserViewGui(wx.Dialog):
 		user = self.users[self.index]
 		try:
 			self.account.api.account_follow(id=user.id, notify=True)
+			relationships.forget(self.account, user.id)
 			sound.play(self.account, "unmute")
 			speak.speak(f"Notifications enabled for {user.acct}")
 			self.on_list_change(None)
@@ -937,6 +915,7 @@ class UserViewGui(wx.Dialog):
 		user = self.users[self.index]
 		try:
 			self.account.api.account_follow(id=user.id, notify=False)
+			relationships.forget(self.account, user.id)
 			sound.play(self.account, "mute")
 			speak.speak(f"Notifications disabled for {user.acct}")
 			self.on_list_change(None)
@@ -1333,7 +1312,7 @@ class ViewImageGui(wx.Dialog):
 
 		try:
 			# Download image
-			response = requests.get(url, headers={"User-Agent": f"{APP_NAME}/{APP_VERSION}"}, timeout=30)
+			response = http_client.get(url, kind=http_client.DOWNLOAD, headers={"User-Agent": f"{APP_NAME}/{APP_VERSION}"}, timeout=30)
 			response.raise_for_status()
 
 			# Load with PIL (supports many formats including WebP)
@@ -2,6 +2,7 @@
 
 import base64
 import requests
+import http_client
 from application import get_app
 from version import APP_NAME, APP_VERSION
 
@@ -59,7 +60,7 @@ def _describe_with_openai(image_url, prompt, api_key, model):
 			"max_tokens": 1000
 		}
 
-		response = requests.post(
+		response = http_client.post(
 			"https://api.openai.com/v1/chat/completions",
 			headers=headers,
 			json=payload,
@@ -90,7 +91,7 @@ def _describe_with_gemini(image_url, prompt, api_key, model):
 
 	try:
 		# First, download the image and convert to base64
-		img_response = requests.get(image_url, headers={"User-Agent": f"{APP_NAME}/{APP_VERSION}"}, timeout=30)
+		img_response = http_client.get(image_url, kind=http_client.DOWNLOAD, headers={"User-Agent": f"{APP_NAME}/{APP_VERSION}"}, timeout=30)
 		img_response.raise_for_status()
 		image_data = base64.b64encode(img_response.content).decode('utf-8')
 
@@ -118,7 +119,7 @@ def _describe_with_gemini(image_url, prompt, api_key, model):
 			]
 		}
 
-		response = requests.post(
+		response = http_client.post(
 			url,
 			json=payload,
 			headers={"User-Agent": f"{APP_NAME}/{APP_VERSION}"},
@@ -4,14 +4,22 @@ import os
 import pickle
 import threading
 import zipfile
-import html
 import json
 import datetime
+import functools
 import time
 import re
-import requests
 import webbrowser
 import config
+import date_format
+import html_text
+import http_cache
+import http_client
+import mutes
+import render_cache
+import single_flight
+import templates
+import user_resolver
 import wx
 from version import APP_NAME, APP_SHORTNAME, APP_VERSION, APP_AUTHOR
 
@@ -24,7 +32,54 @@ author = APP_AUTHOR
 url_re = re.compile(r"(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'\".,<>?]))")
 url_re2 = re.compile(r"(?:\w+://|www\.)[^ ,.?!#%=+][^ ]*")
 bad_chars = "'\\.,[](){}:;\""
-html_tag_re = re.compile(r'<[^>]+>')
+
+# Mastodon-style custom emoji shortcodes like :emoji_name:
+shortcode_re = re.compile(r':[a-zA-Z0-9_]+:', flags=re.UNICODE)
+# Most Unicode emoji ranges
+emoji_re = re.compile(
+	"["
+	"\U0001F300-\U0001F9FF"  # Miscellaneous Symbols and Pictographs, Emoticons, etc.
+	"\U0001FA00-\U0001FAFF"  # Chess, symbols, etc.
+	"\U00002600-\U000027BF"  # Misc symbols, Dingbats
+	"\U0001F600-\U0001F64F"  # Emoticons
+	"\U0001F680-\U0001F6FF"  # Transport and Map
+	"\U0001F1E0-\U0001F1FF"  # Flags
+	"\U00002300-\U000023FF"  # Misc Technical
+	"\U00002B50-\U00002B55"  # Stars
+	"\U0000FE00-\U0000FE0F"  # Variation Selectors
+	"\U0000200D"             # Zero Width Joiner
+	"\U00003030\U000025AA\U000025AB\U000025B6\U000025C0\U000025FB-\U000025FE"
+	"]+",
+	flags=re.UNICODE
+)
+
+
+@functools.lru_cache(maxsize=8192)
+def _demojify(text, shortcodes=None):
+	"""Cached emoji removal; display names and post texts repeat constantly."""
+	if shortcodes:
+		for code in shortcodes:
+			text = text.replace(":" + code + ":", "")
+	if ":" in text:
+		text = shortcode_re.sub('', text)
+	if text.isascii():
+		return text
+	return emoji_re.sub('', text)
+
+
+def _emoji_shortcode(emoji):
+	if isinstance(emoji, dict):
+		return emoji.get('shortcode')
+	return getattr(emoji, 'shortcode', None)
+
+
+def _status_emojis(s):
+	"""Custom emoji of a status and the posts its display text is built from."""
+	emojis = []
+	for post in (s, getattr(s, 'reblog', None), getattr(s, 'quote', None)):
+		if post is not None:
+			emojis.extend(getattr(post, 'emojis', None) or [])
+	return emojis
 
 
 class StatusWrapper:
@@ -76,12 +131,12 @@ class Application:
 		self.accounts = []
 		self.prefs = None
 		self.users = []
-		self.unknown_users = []
 		self.confpath = ""
 		self.errors = []
 		self.currentAccount = None
 		self.timeline_settings = []
 		self._initialized = False
+		self._resolved_refresh_pending = False
 
 	@classmethod
 	def get_instance(cls):
@@ -169,6 +224,7 @@ class Application:
 		self.prefs.window_shown = self.prefs.get("window_shown", True)
 		self.prefs.autoOpenSingleURL = self.prefs.get("autoOpenSingleURL", False)
 		self.prefs.use24HourTime = self.prefs.get("use24HourTime", False)
+		self.prefs.relative_times = self.prefs.get("relative_times", False)  # Show post times as "5m ago"
 		self.prefs.fetch_pages = self.prefs.get("fetch_pages", 1)  # Number of API calls to make when loading timelines
 		self.prefs.single_api_on_startup = self.prefs.get("single_api_on_startup", False)  # Use only one API call on initial timeline loads
 		self.prefs.check_for_updates = self.prefs.get("check_for_updates", True)  # Check for updates on startup
@@ -229,6 +285,12 @@ class Application:
 		self.prefs.timeline_cache_enabled = self.prefs.get("timeline_cache_enabled", True)  # Enable timeline caching for fast startup
 		self.prefs.timeline_cache_limit = self.prefs.get("timeline_cache_limit", 1000)  # Max items to cache per timeline
 
+		# Shared HTTP connection pools
+		self.prefs.http_pool_size = self.prefs.get("http_pool_size", http_client.DEFAULT_POOL_SIZE)  # Connections kept open per server
+		self.prefs.http_timeout = self.prefs.get("http_timeout", http_client.DEFAULT_TIMEOUT[1])  # Seconds to wait for a response
+		http_client.get_manager().configure(pool_size=self.prefs.http_pool_size, timeout=self.prefs.http_timeout)
+		http_cache.open_cache(self.confpath)
+
 		# Initialize audio output with selected device
 		import sound
 		try:
@@ -318,8 +380,8 @@ class Application:
 			platform_type = prefs.get("platform_type", "")
 
 			if platform_type == "bluesky":
-				# Bluesky needs handle and password
-				return bool(prefs.get("bluesky_handle", "")) and bool(prefs.get("bluesky_password", ""))
+				# Bluesky needs a handle and a saved session or password
+				return bool(prefs.get("bluesky_handle", "")) and bool(prefs.get("bluesky_session", "") or prefs.get("bluesky_password", ""))
 			else:
 				# Mastodon needs instance URL and access token
 				return bool(prefs.get("instance_url", "")) and bool(prefs.get("access_token", ""))
@@ -342,7 +404,7 @@ class Application:
 
 			if platform_type == "bluesky":
 				handle = prefs.get("bluesky_handle", "")
-				password = prefs.get("bluesky_password", "")
+				password = prefs.get("bluesky_session", "") or prefs.get("bluesky_password", "")
 				if handle and password:
 					return (False, None, None)  # Fully configured
 				if handle or password:
@@ -466,16 +528,7 @@ class Application:
 
 	def strip_html(self, text):
 		"""Strip HTML tags and decode entities"""
-		# Add spaces for block elements and line breaks to prevent text concatenation
-		# Note: Don't add spaces for inline elements like <span> - Mastodon uses spans
-		# within URLs (e.g., <span class="invisible">https://</span>) and adding spaces
-		# would break the URL (causing "https:// example.com" instead of "https://example.com")
-		text = re.sub(r'</(p|div)>', ' ', text, flags=re.IGNORECASE)
-		text = re.sub(r'<br\s*/?>', ' ', text, flags=re.IGNORECASE)
-		text = html_tag_re.sub('', text)
-		text = html.unescape(text)
-		text = re.sub(r'\s+', ' ', text).strip()
-		return text
+		return html_text.strip_html(text)
 
 	def html_to_text_for_edit(self, content, mentions=None):
 		"""Convert HTML content to plain text for editing, preserving newlines and full handles.
@@ -484,39 +537,7 @@ class Application:
 			content: The HTML content from the status
 			mentions: List of mention objects from the status (for resolving full handles)
 		"""
-		if not content:
-			return ""
-
-		text = content
-
-		# Replace mentions with full handles if we have mention data
-		# Mastodon HTML: <span class="h-card"><a href="https://instance/@user" ...>@<span>user</span></a></span>
-		if mentions:
-			for mention in mentions:
-				acct = getattr(mention, 'acct', '')
-				url = getattr(mention, 'url', '')
-				if acct and url:
-					# Match the mention link and replace with @acct
-					# Pattern matches <a href="URL">@anything</a> or similar structures
-					pattern = rf'<a[^>]*href=["\']?{re.escape(url)}["\']?[^>]*>.*?</a>'
-					text = re.sub(pattern, f'@{acct}', text, flags=re.IGNORECASE | re.DOTALL)
-
-		# Convert line breaks and paragraphs to newlines
-		text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-		text = re.sub(r'</p>\s*<p[^>]*>', '\n\n', text, flags=re.IGNORECASE)
-		text = re.sub(r'</?p[^>]*>', '\n', text, flags=re.IGNORECASE)
-
-		# Remove all remaining HTML tags
-		text = html_tag_re.sub('', text)
-
-		# Decode HTML entities
-		text = html.unescape(text)
-
-		# Clean up excessive newlines but preserve intentional ones
-		text = re.sub(r'\n{3,}', '\n\n', text)
-		text = text.strip()
-
-		return text
+		return html_text.to_edit_text(content, mentions)
 
 	def process_status(self, s, return_only_text=False, template="", ignore_cw=False, account=None):
 		"""Process a Mastodon status for display"""
@@ -530,7 +551,7 @@ class Application:
 			return self._process_scheduled_status(s)
 
 		if hasattr(s, 'content'):
-			text = self.strip_html(s.content)
+			text = html_text.for_status(s).text
 		else:
 			text = ""
 
@@ -573,6 +594,15 @@ class Application:
 						text = f"{filter_warning}. {text}"
 					# 'ignore' mode: just use the text as-is
 
+			# Client-side muted words with the warn action, shown the same way
+			mute_warning = mutes.warning(account, s) if account and not ignore_cw else None
+			if mute_warning:
+				cw_mode = getattr(self.prefs, 'cw_mode', 'hide')
+				if cw_mode == 'hide':
+					text = mute_warning
+				elif cw_mode == 'show':
+					text = f"{mute_warning}. {text}"
+
 			# Add media descriptions to text (only for non-reblogs to avoid duplication)
 			if self.prefs.include_media_descriptions and hasattr(s, 'media_attachments') and s.media_attachments:
 				for media in s.media_attachments:
@@ -880,7 +910,7 @@ class Application:
 					display_name = a.display_name or a.acct
 					# Apply demojify setting
 					if self.prefs.demojify:
-						demojied = self.demojify(display_name)
+						demojied = self.demojify(display_name, getattr(a, 'emojis', None))
 						if demojied == "":
 							display_name = a.acct
 						else:
@@ -893,7 +923,7 @@ class Application:
 			participants = "Unknown"
 
 		if last_status:
-			text = self.strip_html(getattr(last_status, 'content', ''))
+			text = html_text.for_status(last_status).text
 			created_at = self.parse_date(getattr(last_status, 'created_at', None))
 			return f"{participants}: {text} {created_at}"
 		else:
@@ -904,7 +934,7 @@ class Application:
 		if hasattr(s, 'last_status'):
 			return self.process_conversation(s)
 		elif hasattr(s, 'content'):
-			text = self.strip_html(s.content)
+			text = html_text.for_status(s).text
 			if return_text:
 				return text
 			return self.template_to_string(s, self.prefs.conversationTemplate)
@@ -916,8 +946,21 @@ class Application:
 	def find_urls_in_status(self, s):
 		"""Find URLs in a status (Mastodon or Bluesky)
 
-		Returns URLs in order: text/link URLs first, then media URLs
+		Returns URLs in order: text/link URLs first, then media URLs.
+		The list is kept on the status until it is marked changed.
 		"""
+		version = getattr(s, '_render_version', 0)
+		cached = getattr(s, '_urls', None)
+		if cached is not None and cached[0] == version:
+			return list(cached[1])
+		urls = self._collect_urls(s)
+		try:
+			s._urls = (version, tuple(urls))
+		except (AttributeError, TypeError):
+			pass
+		return urls
+
+	def _collect_urls(self, s):
 		urls = []
 		media_urls = []
 
@@ -939,7 +982,7 @@ class Application:
 
 		# Get URLs from HTML content (Mastodon)
 		if hasattr(post_to_check, 'content') and post_to_check.content:
-			text_urls = self.find_urls_in_text(self.strip_html(post_to_check.content))
+			text_urls = html_text.for_status(post_to_check).links
 			for url in text_urls:
 				if url not in urls:
 					urls.append(url)
@@ -975,135 +1018,44 @@ class Application:
 		"""Format a status using a template"""
 		if template == "":
 			template = self.prefs.postTemplate
-
-		# Prepare text content now, but replace AFTER other substitutions
-		# to prevent $..$ patterns in post text from being interpreted as template vars
-		text_content = None
-		if "$text$" in template:
-			# First check if we have a pre-processed text attribute (from StatusWrapper)
-			# This includes media descriptions and other processed content from process_status()
-			text_content = getattr(s, 'text', '')
-			needs_media_descriptions = False
-			if not text_content:
-				# Fall back to stripping HTML from content
-				# Media descriptions need to be added since we're not using pre-processed text
-				if hasattr(s, 'reblog') and s.reblog:
-					text_content = self.strip_html(getattr(s.reblog, 'content', ''))
+		return templates.get_compiled(template).render(self, s, account)
+
+	def _template_text(self, s):
+		"""Get the $text$ value for a status: processed text, or stripped content with media descriptions."""
+		# First check if we have a pre-processed text attribute (from StatusWrapper)
+		# This includes media descriptions and other processed content from process_status()
+		text_content = getattr(s, 'text', '')
+		needs_media_descriptions = False
+		if not text_content:
+			# Fall back to stripping HTML from content
+			# Media descriptions need to be added since we're not using pre-processed text
+			if hasattr(s, 'reblog') and s.reblog:
+				text_content = html_text.for_status(s.reblog).text
+			else:
+				text_content = html_text.for_status(s).text
+			needs_media_descriptions = True
+		if self.prefs.demojify_post:
+			text_content = self.demojify(text_content, _status_emojis(s))
+
+		# Add media descriptions only if we used the fallback path (not pre-processed text)
+		if needs_media_descriptions and self.prefs.include_media_descriptions:
+			# Get media from reblog if this is a boost, otherwise from status
+			status_for_media = s.reblog if hasattr(s, 'reblog') and s.reblog else s
+			media_attachments = getattr(status_for_media, 'media_attachments', []) or []
+			for media in media_attachments:
+				# Handle both objects (from API) and dicts (from cache)
+				if isinstance(media, dict):
+					media_type = media.get('type', 'media') or 'media'
+					description = media.get('description') or media.get('alt')
 				else:
-					text_content = self.strip_html(getattr(s, 'content', ''))
-				needs_media_descriptions = True
-			if self.prefs.demojify_post:
-				text_content = self.demojify(text_content)
-
-			# Add media descriptions only if we used the fallback path (not pre-processed text)
-			if needs_media_descriptions and self.prefs.include_media_descriptions:
-				# Get media from reblog if this is a boost, otherwise from status
-				status_for_media = s.reblog if hasattr(s, 'reblog') and s.reblog else s
-				media_attachments = getattr(status_for_media, 'media_attachments', []) or []
-				for media in media_attachments:
-					# Handle both objects (from API) and dicts (from cache)
-					if isinstance(media, dict):
-						media_type = media.get('type', 'media') or 'media'
-						description = media.get('description') or media.get('alt')
-					else:
-						media_type = getattr(media, 'type', 'media') or 'media'
-						description = getattr(media, 'description', None) or getattr(media, 'alt', None)
-					type_display = media_type.upper() if media_type == 'gifv' else media_type.capitalize()
-					if description:
-						text_content += f" ({type_display}) description: {description}"
-					else:
-						text_content += f" ({type_display}) with no description"
-
-		temp = template.split(" ")
-		for i in range(len(temp)):
-			if "$" in temp[i]:
-				t = temp[i].split("$")
-				r = t[1]
-				if r == "text":
-					continue  # Already handled above
-				if "." in r:
-					q = r.split(".")
-					# Support multi-level attribute access (e.g., reblog.account.display_name)
-					try:
-						obj = s
-						parent_obj = None
-						for attr in q:
-							if obj is None:
-								break
-							parent_obj = obj
-							obj = getattr(obj, attr, None)
-						if obj is not None:
-							# Check if we need to demojify
-							last_attr = q[-1]
-							# Check for alias if this is display_name and we have an account
-							if last_attr in ('name', 'display_name') and account and parent_obj:
-								user_id = str(getattr(parent_obj, 'id', ''))
-								if user_id and user_id in account.prefs.aliases:
-									obj = account.prefs.aliases[user_id]
-								elif self.prefs.demojify:
-									demojied = self.demojify(str(obj))
-									if demojied == "":
-										obj = getattr(parent_obj, "acct", obj)
-									else:
-										obj = demojied
-							elif (last_attr in ('name', 'display_name')) and self.prefs.demojify:
-								demojied = self.demojify(str(obj))
-								if demojied == "":
-									# Try to get acct as fallback
-									fallback_obj = s
-									for attr in q[:-1]:
-										fallback_obj = getattr(fallback_obj, attr, None)
-										if fallback_obj is None:
-											break
-									if fallback_obj:
-										obj = getattr(fallback_obj, "acct", obj)
-								else:
-									obj = demojied
-							elif last_attr == 'note':
-								# Strip HTML from bio/note field
-								obj = self.strip_html(str(obj))
-							template = template.replace("$" + t[1] + "$", str(obj))
-						else:
-							# Value is None - replace with empty string to avoid showing raw template
-							template = template.replace("$" + t[1] + "$", "")
-					except Exception as e:
-						pass  # Leave placeholder if we can't resolve it
+					media_type = getattr(media, 'type', 'media') or 'media'
+					description = getattr(media, 'description', None) or getattr(media, 'alt', None)
+				type_display = media_type.upper() if media_type == 'gifv' else media_type.capitalize()
+				if description:
+					text_content += f" ({type_display}) description: {description}"
 				else:
-					if hasattr(s, t[1]):
-						try:
-							# Check for alias if this is display_name and we have an account
-							if t[1] in ('name', 'display_name') and account:
-								user_id = str(getattr(s, 'id', ''))
-								if user_id and user_id in account.prefs.aliases:
-									template = template.replace("$" + t[1] + "$", account.prefs.aliases[user_id])
-									continue
-							if t[1] == "name" or t[1] == "display_name" and self.prefs.demojify or t[1] == "text" and self.prefs.demojify_post:
-								deEmojify = True
-							else:
-								deEmojify = False
-							if deEmojify:
-								demojied = self.demojify(str(getattr(s, t[1])))
-								if demojied == "" and (t[1] == "name" or t[1] == "display_name"):
-									template = template.replace("$" + t[1] + "$", getattr(s, "acct", ""))
-								else:
-									template = template.replace("$" + t[1] + "$", demojied)
-							else:
-								if t[1] == "created_at":
-									template = template.replace("$" + t[1] + "$", self.parse_date(getattr(s, t[1])))
-								elif t[1] == "note":
-									# Strip HTML from bio/note field
-									template = template.replace("$" + t[1] + "$", self.strip_html(str(getattr(s, t[1]))))
-								else:
-									template = template.replace("$" + t[1] + "$", str(getattr(s, t[1])))
-						except:
-							try:
-								template = template.replace("$" + t[1] + "$", str(getattr(s, t[1])))
-							except Exception as e:
-								print(e)
-		# Replace $text$ last to prevent post content with $..$ from being interpreted as template vars
-		if text_content is not None:
-			template = template.replace("$text$", text_content)
-		return template
+					text_content += f" ({type_display}) with no description"
+		return text_content
 
 	def get_users_in_status(self, account, s):
 		"""Get usernames mentioned in a status for reply"""
@@ -1137,38 +1089,10 @@ class Application:
 		"""Parse a date for display"""
 		if date is None:
 			return ""
-		ti = datetime.datetime.now()
-		dst = time.localtime().tm_isdst
-		if dst == 1:
-			tz = time.altzone
-		else:
-			tz = time.timezone
-		if convert:
-			try:
-				if hasattr(date, 'tzinfo') and date.tzinfo is not None:
-					date = date.replace(tzinfo=None)
-				date += datetime.timedelta(seconds=0 - tz)
-			except:
-				pass
-		returnstring = ""
-
-		try:
-			dateFormatString = "%m/%d/%Y"
-			timeFormatString = "%I:%M:%S %p"
-			if self.prefs.use24HourTime:
-				timeFormatString = "%H:%M:%S"
-			if date.year == ti.year:
-				if date.day == ti.day and date.month == ti.month:
-					returnstring = ""
-				else:
-					returnstring = date.strftime(f"{dateFormatString}, ")
-			else:
-				returnstring = date.strftime(f"{dateFormatString}, ")
-
-			returnstring += date.strftime(timeFormatString)
-		except:
-			pass
-		return returnstring
+		formatter = date_format.get_formatter()
+		if convert and self.prefs.relative_times:
+			return formatter.relative(date, self.prefs.use24HourTime)
+		return formatter.format(date, self.prefs.use24HourTime, convert)
 
 	def isDuplicate(self, status, statuses):
 		for i in statuses:
@@ -1226,8 +1150,12 @@ class Application:
 		if hasattr(notification, 'status') and notification.status:
 			self.add_users(notification.status)
 
-	def lookup_user(self, id, account=None):
-		"""Look up user by ID from cache"""
+	def lookup_user(self, id, account=None, callback=None, callback_key=None):
+		"""Look up user by ID from cache.
+
+		Unknown users are looked up in the background; callback(user or None)
+		is called (on a worker thread) once that finishes, once per callback_key.
+		"""
 		# Use per-account cache if available
 		if account is None:
 			account = self.currentAccount
@@ -1244,12 +1172,25 @@ class Application:
 			except:
 				pass
 		if account and hasattr(account, 'user_cache') and account.user_cache:
-			account.user_cache.unknown_users.append(str(id))
-		else:
-			self.unknown_users.append(id)
-		print(str(id) + " not found. Added to queue.")
+			user_resolver.get_resolver(account).request(id, callback, callback_key)
 		return None
 
+	def user_resolved(self, account, item, user):
+		"""Re-render an item that showed a user still being looked up (called on the resolver's thread)."""
+		if user is None:
+			return
+		render_cache.mark_changed(item)
+		# One list refresh for a whole batch of resolved users
+		if not self._resolved_refresh_pending:
+			self._resolved_refresh_pending = True
+			wx.CallAfter(self._refresh_resolved)
+
+	def _refresh_resolved(self):
+		self._resolved_refresh_pending = False
+		from GUI import main
+		if main.window and self.currentAccount:
+			main.window.refreshList()
+
 	def lookup_user_name(self, account, name, use_api=True):
 		"""Look up user by acct/username"""
 		name = name.lstrip('@')
@@ -1372,16 +1313,21 @@ class Application:
 			for i2 in i.statuses:
 				if i2.id == id:
 					return i2
-		try:
+		def fetch():
 			# Use platform-specific status lookup
 			if hasattr(account, '_platform') and account._platform:
-				s = account._platform.get_status(id)
-			else:
-				s = account.api.status(id=id)
-			return s
+				return account._platform.get_status(id)
+			return account.api.status(id=id)
+		try:
+			# Conversation loading and speak_reply often ask for the same parent at once
+			return single_flight.call((account, 'status', str(id)), fetch)
 		except:
 			return None
 
+	def forget_status(self, account, id):
+		"""Drop a remembered status lookup after changing the status."""
+		single_flight.forget((account, 'status', str(id)))
+
 	def find_status(self, tl, id):
 		index = 0
 		for i in tl.statuses:
@@ -1553,7 +1499,7 @@ class Application:
 
 		try:
 			# Use /releases endpoint since /releases/latest doesn't include prereleases
-			releases = json.loads(requests.get("https://api.github.com/repos/masonasons/FastSM/releases", headers={"accept": "application/vnd.github.v3+json", "User-Agent": f"{name}/{version}"}).content.decode())
+			releases = json.loads(http_client.get("https://api.github.com/repos/masonasons/FastSM/releases", headers={"accept": "application/vnd.github.v3+json", "User-Agent": f"{name}/{version}"}).content.decode())
 			if not releases:
 				if not silent:
 					self.alert("No releases found.", "Update Check")
@@ -1643,34 +1589,17 @@ class Application:
 			if not silent:
 				self.alert_from_thread(f"Error checking for updates: {e}", "Update Check Error")
 
-	def demojify(self, text):
-		"""Remove emoji from text while preserving accented characters."""
-		import re
-		text = str(text)
-
-		# First remove Mastodon-style custom emoji shortcodes like :emoji_name:
-		# These are in format :shortcode: where shortcode is alphanumeric with underscores
-		shortcode_pattern = re.compile(r':[a-zA-Z0-9_]+:', flags=re.UNICODE)
-		text = shortcode_pattern.sub('', text)
-
-		# Pattern to match most Unicode emoji ranges
-		emoji_pattern = re.compile(
-			"["
-			"\U0001F300-\U0001F9FF"  # Miscellaneous Symbols and Pictographs, Emoticons, etc.
-			"\U0001FA00-\U0001FAFF"  # Chess, symbols, etc.
-			"\U00002600-\U000027BF"  # Misc symbols, Dingbats
-			"\U0001F600-\U0001F64F"  # Emoticons
-			"\U0001F680-\U0001F6FF"  # Transport and Map
-			"\U0001F1E0-\U0001F1FF"  # Flags
-			"\U00002300-\U000023FF"  # Misc Technical
-			"\U00002B50-\U00002B55"  # Stars
-			"\U0000FE00-\U0000FE0F"  # Variation Selectors
-			"\U0000200D"             # Zero Width Joiner
-			"\U00003030\U000025AA\U000025AB\U000025B6\U000025C0\U000025FB-\U000025FE"
-			"]+",
-			flags=re.UNICODE
-		)
-		return emoji_pattern.sub('', text)
+	def demojify(self, text, emojis=None):
+		"""Remove emoji from text while preserving accented characters.
+
+		emojis is the custom emoji list of the status or account the text
+		came from; its shortcodes are removed directly before falling back
+		to scanning for :shortcode: patterns.
+		"""
+		shortcodes = None
+		if emojis:
+			shortcodes = tuple(code for code in (_emoji_shortcode(e) for e in emojis) if code)
+		return _demojify(str(text), shortcodes or None)
 
 	def handle_error(self, error, name="Unknown"):
 		"""Handle API errors from Mastodon or Bluesky"""
@@ -1701,7 +1630,9 @@ class Application:
 			self.errors.append("Error in " + name + ": Rate limited")
 			return
 		if self.prefs.errors:
-			speak.speak("Error in " + name + ": " + error_msg)
+			# Errors from a user action are spoken at once; background errors wait their turn
+			priority = None if wx.IsMainThread() else speak.PRIORITY_ERROR
+			speak.speak("Error in " + name + ": " + error_msg, priority=priority)
 			sound.play(self.currentAccount, "error")
 		self.errors.append("Error in " + name + ": " + error_msg)
 
@@ -1723,7 +1654,7 @@ class Application:
 		local_filename = url.split('/')[-1]
 		if platform.system() == "Darwin":
 			local_filename = os.path.expanduser("~/Downloads/" + local_filename)
-		with requests.get(url, stream=True, headers={"User-Agent": f"{name}/{version}"}) as r:
+		with http_client.get(url, kind=http_client.DOWNLOAD, stream=True, headers={"User-Agent": f"{name}/{version}"}) as r:
 			r.raise_for_status()
 			with open(local_filename, 'wb') as f:
 				for chunk in r.iter_content(chunk_size=8192):
@@ -2019,7 +1950,7 @@ del "%~f0"
 			dest_path: Local path to save file
 			progress_callback: Optional function(downloaded, total) called periodically
 		"""
-		with requests.get(url, stream=True, timeout=30, headers={"User-Agent": f"{name}/{version}"}) as r:
+		with http_client.get(url, kind=http_client.DOWNLOAD, stream=True, timeout=30, headers={"User-Agent": f"{name}/{version}"}) as r:
 			r.raise_for_status()
 			total_size = int(r.headers.get('content-length', 0))
 			downloaded = 0
@@ -25,6 +25,8 @@ class TimelineCache:
     """
 
     SCHEMA_VERSION = 1
+    # Seconds a resolved remote status ID is kept
+    REMOTE_ID_MAX_AGE = 90 * 86400
 
     def __init__(self, confpath: str, account_id: str):
         """Initialize the cache.
@@ -157,6 +159,7 @@ class TimelineCache:
                 last_position_id TEXT,
                 since_id TEXT,
                 oldest_id TEXT,
+                cursor TEXT,
                 item_count INTEGER DEFAULT 0,
                 last_updated TEXT,
                 gaps_json TEXT,
@@ -176,6 +179,22 @@ class TimelineCache:
         except sqlite3.OperationalError:
             pass  # Column already exists
 
+        # Add cursor column if it doesn't exist (migration for existing DBs)
+        try:
+            cursor.execute('ALTER TABLE timeline_metadata ADD COLUMN cursor TEXT')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+        # Remote post URL/URI -> ID of the same post on this account's instance
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS remote_status_ids (
+                remote_key TEXT PRIMARY KEY,
+                local_id TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute('DELETE FROM remote_status_ids WHERE resolved_at < ?', (time.time() - self.REMOTE_ID_MAX_AGE,))
+
         # Create indexes for faster lookups
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_timeline_items_lookup ON timeline_items(timeline_type, timeline_name, timeline_data)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_timeline_items_position ON timeline_items(timeline_type, timeline_name, timeline_data, position)')
@@ -504,7 +523,7 @@ class TimelineCache:
 
     def save_timeline(self, timeline_type: str, timeline_name: str, timeline_data: Any,
                       items: List, item_type: str, limit: int = 500, gaps: List = None,
-                      last_index: int = 0, last_position_id: str = None):
+                      last_index: int = 0, last_position_id: str = None, pagination_cursor: str = None):
         """Save timeline items to the cache.
 
         Args:
@@ -517,6 +536,7 @@ class TimelineCache:
             gaps: List of gap dicts to persist (optional)
             last_index: Current position in the timeline (optional)
             last_position_id: ID of item at current position (optional, for robust restore)
+            pagination_cursor: Cursor for items older than the oldest cached one (optional, Bluesky)
         """
         if not self.is_available() or not items:
             return
@@ -561,9 +581,9 @@ class TimelineCache:
                 oldest_id = str(items[-1].id) if items else None
                 cursor.execute('''
                     INSERT OR REPLACE INTO timeline_metadata
-                    (timeline_type, timeline_name, timeline_data, last_index, last_position_id, since_id, oldest_id, item_count, last_updated, gaps_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (timeline_type, timeline_name, data_key, last_index, last_position_id, since_id, oldest_id, len(items[:limit]), cached_at, gaps_json))
+                    (timeline_type, timeline_name, timeline_data, last_index, last_position_id, since_id, oldest_id, cursor, item_count, last_updated, gaps_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (timeline_type, timeline_name, data_key, last_index, last_position_id, since_id, oldest_id, pagination_cursor, len(items[:limit]), cached_at, gaps_json))
 
                 self._conn.commit()
             except Exception as e:
@@ -622,6 +642,7 @@ class TimelineCache:
                         'last_position_id': meta_row['last_position_id'] if 'last_position_id' in meta_row.keys() else None,
                         'since_id': meta_row['since_id'],
                         'oldest_id': meta_row['oldest_id'],
+                        'cursor': meta_row['cursor'] if 'cursor' in meta_row.keys() else None,
                         'item_count': meta_row['item_count'],
                         'last_updated': meta_row['last_updated'],
                     }
@@ -694,6 +715,7 @@ class TimelineCache:
                 cursor.execute('DELETE FROM statuses')
                 cursor.execute('DELETE FROM notifications')
                 cursor.execute('DELETE FROM users')
+                cursor.execute('DELETE FROM remote_status_ids')
                 self._conn.commit()
 
                 # Also VACUUM to reclaim space
@@ -701,6 +723,43 @@ class TimelineCache:
             except Exception as e:
                 print(f"Cache clear_all error: {e}")
 
+    # ============ Remote Status IDs ============
+
+    def get_remote_status_id(self, remote_keys: List[str]) -> Optional[str]:
+        """Local ID of a remote post, looked up by any of its URLs/URIs."""
+        keys = [k for k in remote_keys if k]
+        if not self.is_available() or not keys:
+            return None
+        with self._lock:
+            try:
+                cursor = self._conn.cursor()
+                cursor.execute(
+                    'SELECT local_id FROM remote_status_ids WHERE remote_key IN (%s) LIMIT 1' % ','.join('?' * len(keys)),
+                    keys
+                )
+                row = cursor.fetchone()
+                if row:
+                    return row['local_id']
+            except Exception as e:
+                print(f"Cache get_remote_status_id error: {e}")
+        return None
+
+    def save_remote_status_id(self, remote_keys: List[str], local_id: str):
+        """Remember the local ID of a remote post under each of its URLs/URIs."""
+        keys = [k for k in remote_keys if k]
+        if not self.is_available() or not keys or not local_id:
+            return
+        with self._lock:
+            try:
+                now = time.time()
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO remote_status_ids (remote_key, local_id, resolved_at) VALUES (?, ?, ?)',
+                    [(key, str(local_id), now) for key in keys]
+                )
+                self._conn.commit()
+            except Exception as e:
+                print(f"Cache save_remote_status_id error: {e}")
+
     def cleanup_orphaned_data(self, active_timeline_keys: List[tuple]):
         """Remove cached data for timelines that no longer exist.
 
@@ -5,12 +5,15 @@ import json
 import atexit
 import platform
 import shutil
+import threading
 from collections.abc import MutableMapping
 
 # Cache for portable mode detection
 _portable_path = None
 _portable_checked = False
 _migration_checked = False
+# Serializes config writes; autosaving prefs can be set from worker threads
+_save_lock = threading.Lock()
 
 APP_CONFIG_DIRNAME = "fastsm"
 LEGACY_APP_CONFIG_DIRNAMES = ("FastSM",)
@@ -220,11 +223,16 @@ class Config(MutableMapping):
 		config_file = self.config_file
 		os.makedirs(os.path.dirname(config_file), exist_ok=True)
 
-		try:
-			with open(config_file, 'w') as f:
-				json.dump(self._data, f, indent=1, default=self._serialize)
-		except Exception as e:
-			print(f"Error saving config: {e}")
+		# Write to a temporary file and swap it in, so a failed or concurrent
+		# save never leaves a truncated config behind
+		with _save_lock:
+			temp_file = config_file + ".tmp"
+			try:
+				with open(temp_file, 'w') as f:
+					json.dump(self._data, f, indent=1, default=self._serialize)
+				os.replace(temp_file, config_file)
+			except Exception as e:
+				print(f"Error saving config: {e}")
 
 	def _serialize(self, obj):
 		"""Custom serializer for Config objects."""
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Timestamp formatting for timeline items.
+
+Everything that depends on the current time (the local UTC offset, today's
+date) is computed at most once per minute, so DST transitions and midnight
+are picked up within a minute. Formatted strings are memoized and only
+recomputed when that state changes. Relative times ("5m ago") are computed
+against the start of the current minute, so every item rendered in the same
+minute uses the same clock and the strings change together once a minute.
+"""
+import datetime
+import threading
+import time
+
+# Upper bound on memoized strings before the memo is cleared
+MAX_MEMO = 20000
+
+DATE_FORMAT = "%m/%d/%Y"
+TIME_FORMAT_12 = "%I:%M:%S %p"
+TIME_FORMAT_24 = "%H:%M:%S"
+
+
+class DateFormatter(object):
+	"""Formats datetimes for display. Safe to use from any thread."""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._minute = None
+		self._offset = datetime.timedelta(0)
+		self._today = None
+		self._memo = {}
+		self._relative_memo = {}
+
+	def _refresh(self):
+		"""Recompute clock-dependent state once per minute."""
+		now = time.time()
+		minute = int(now // 60)
+		if minute == self._minute:
+			return
+		with self._lock:
+			if minute == self._minute:
+				return
+			local = time.localtime(now)
+			tz = time.altzone if local.tm_isdst == 1 else time.timezone
+			offset = datetime.timedelta(seconds=0 - tz)
+			today = (local.tm_year, local.tm_mon, local.tm_mday)
+			if offset != self._offset or today != self._today:
+				self._memo = {}
+			self._offset = offset
+			self._today = today
+			self._relative_memo = {}
+			self._minute = minute
+
+	@property
+	def epoch(self):
+		"""Number of the minute relative times are currently computed for."""
+		self._refresh()
+		return self._minute
+
+	def to_local(self, date):
+		"""Convert a UTC datetime to naive local time."""
+		self._refresh()
+		if getattr(date, 'tzinfo', None) is not None:
+			date = date.replace(tzinfo=None)
+		return date + self._offset
+
+	def format(self, date, use24=False, convert=True):
+		"""Absolute time, prefixed with the date unless it is today."""
+		if date is None:
+			return ""
+		self._refresh()
+		memo = self._memo
+		key = (date, getattr(date, 'tzinfo', None), use24, convert)
+		try:
+			result = memo.get(key)
+		except TypeError:
+			key = None
+			result = None
+		if result is not None:
+			return result
+		if convert:
+			try:
+				date = self.to_local(date)
+			except Exception:
+				pass
+		result = ""
+		try:
+			if (date.year, date.month, date.day) != self._today:
+				result = date.strftime(f"{DATE_FORMAT}, ")
+			result += date.strftime(TIME_FORMAT_24 if use24 else TIME_FORMAT_12)
+		except Exception:
+			pass
+		if key is not None:
+			if len(memo) >= MAX_MEMO:
+				memo.clear()
+			memo[key] = result
+		return result
+
+	def relative(self, date, use24=False):
+		"""Relative time such as "5m ago"; dates older than a week are shown absolutely."""
+		if date is None:
+			return ""
+		self._refresh()
+		stamp = _timestamp(date)
+		if stamp is None:
+			return self.format(date, use24)
+		age = self._minute * 60 - stamp
+		if age < -60 or age >= 7 * 86400:
+			# Future times (scheduled posts) and old ones are shown absolutely
+			return self.format(date, use24)
+		if age < 60:
+			return "just now"
+		if age < 3600:
+			key = (int(age // 60), "m")
+		elif age < 86400:
+			key = (int(age // 3600), "h")
+		else:
+			key = (int(age // 86400), "d")
+		memo = self._relative_memo
+		result = memo.get(key)
+		if result is None:
+			result = f"{key[0]}{key[1]} ago"
+			memo[key] = result
+		return result
+
+
+def _timestamp(date):
+	"""UNIX timestamp of a datetime; naive values are treated as UTC."""
+	try:
+		if date.tzinfo is None:
+			date = date.replace(tzinfo=datetime.timezone.utc)
+		return date.timestamp()
+	except Exception:
+		return None
+
+
+_formatter = DateFormatter()
+
+
+def get_formatter():
+	return _formatter
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""HTML to text conversion for post content.
+
+convert() produces the display text, the list of links (excluding mentions
+and hashtags) and the character spans of mentions within the text together,
+using precompiled patterns. Results are cached by content string, and
+for_status() stores them on the status so every later consumer (display, URL
+lists, templates) reuses the same result.
+"""
+import html
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# A tag: optional closing slash, the tag name, then its attributes (used by to_edit_text)
+_tag_re = re.compile(r'<(?=[^>])(/?)([A-Za-z0-9]*)([^>]*)>')
+_href_re = re.compile(r'''\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.IGNORECASE)
+_class_re = re.compile(r'''\b(?:class|rel)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.IGNORECASE)
+_break_re = re.compile(r'</(?:p|div)>|<br\s*/?>', re.IGNORECASE)
+_strip_tag_re = re.compile(r'<[^>]+>')
+_ws_re = re.compile(r'\s+')
+_anchor_re = re.compile(r'<a\b([^>]*)>(.*?)</a\s*>', re.IGNORECASE | re.DOTALL)
+_bare_url_re = re.compile(r"(?:\w+://|www\.)[^ ,.?!#%=+][^ ]*")
+_excess_newlines_re = re.compile(r'\n{3,}')
+_bad_url_chars = "'\\.,[](){}:;\""
+
+_CACHE_SIZE = 4096
+
+# text: display text, links: tuple of URLs, mentions: tuple of (start, end, href)
+HtmlText = namedtuple('HtmlText', ('source', 'text', 'links', 'mentions'))
+
+_EMPTY = HtmlText('', '', (), ())
+
+
+def _attr(pattern, attrs):
+	"""Return the values of every match of an attribute pattern, joined."""
+	values = []
+	for match in pattern.finditer(attrs):
+		values.append(match.group(1) or match.group(2) or match.group(3) or '')
+	return ' '.join(values)
+
+
+def _flatten(markup):
+	"""Markup to single-line text: block ends and line breaks become spaces."""
+	text = _break_re.sub(' ', markup)
+	text = _strip_tag_re.sub('', text)
+	if '&' in text:
+		text = html.unescape(text)
+	return _ws_re.sub(' ', text).strip()
+
+
+def _bare_urls(text):
+	return [url.strip(_bad_url_chars) for url in _bare_url_re.findall(text)]
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _convert(content):
+	text = _flatten(content)
+	if '<a' not in content and '<A' not in content:
+		if '://' not in text and 'www.' not in text:
+			return HtmlText(content, text, (), ())
+		return HtmlText(content, text, tuple(dict.fromkeys(_bare_urls(text))), ())
+	links = []
+	mentions = []
+	cursor = 0
+	for match in _anchor_re.finditer(content):
+		attrs = match.group(1)
+		href = _attr(_href_re, attrs)
+		label = _flatten(match.group(2))
+		# Anchors appear in the text in document order
+		start = text.find(label, cursor) if label else -1
+		if start != -1:
+			cursor = start + len(label)
+		if not href:
+			continue
+		classes = _attr(_class_re, attrs).lower()
+		if 'hashtag' in classes or 'tag' in classes.split() or label.startswith('#'):
+			continue
+		if 'mention' in classes or label.startswith('@'):
+			if start != -1:
+				mentions.append((start, start + len(label), href))
+			continue
+		if href not in links:
+			links.append(href)
+	# Plain URLs that aren't wrapped in a link
+	if text.count('://') + text.count('www.') > len(links):
+		for url in _bare_urls(text):
+			if url not in links:
+				links.append(url)
+	return HtmlText(content, text, tuple(links), tuple(mentions))
+
+
+def convert(content):
+	"""Convert HTML content to an HtmlText (text, links and mention spans)."""
+	if not content:
+		return _EMPTY
+	if not isinstance(content, str):
+		content = str(content)
+	return _convert(content)
+
+
+def strip_html(content):
+	"""Strip HTML tags and decode entities, preserving spacing for block elements."""
+	return convert(content).text
+
+
+def for_status(status):
+	"""Return the HtmlText for a status's content, converting it at most once."""
+	content = getattr(status, 'content', None) or ''
+	cached = getattr(status, '_html', None)
+	if cached is not None and cached.source is content:
+		return cached
+	result = convert(content)
+	try:
+		status._html = result
+	except (AttributeError, TypeError):
+		pass
+	return result
+
+
+def to_edit_text(content, mentions=None):
+	"""Convert HTML to editable text, preserving newlines and full mention handles.
+
+	mentions is the status's mention list; anchors linking to a mentioned
+	account's URL are replaced with @acct.
+	"""
+	if not content:
+		return ""
+	handles = {}
+	for mention in mentions or ():
+		acct = getattr(mention, 'acct', '')
+		url = getattr(mention, 'url', '')
+		if acct and url:
+			handles[url] = acct
+
+	parts = []
+	skipping = False  # inside a mention anchor that was replaced
+	paragraph_end = None  # index in parts just after a </p>, while only whitespace follows
+	pos = 0
+	for match in _tag_re.finditer(content):
+		if match.start() > pos and not skipping:
+			data = content[pos:match.start()]
+			if paragraph_end is not None and data.strip():
+				paragraph_end = None
+			parts.append(data)
+		pos = match.end()
+		closing, name = match.group(1), match.group(2).lower()
+		if skipping:
+			if closing and name == 'a':
+				skipping = False
+			continue
+		if name == 'a' and not closing and handles:
+			acct = handles.get(_attr(_href_re, match.group(3)))
+			if acct:
+				parts.append('@' + acct)
+				skipping = True
+				paragraph_end = None
+				continue
+		if name == 'p':
+			if closing:
+				parts.append('\n')
+				paragraph_end = len(parts)
+				continue
+			if paragraph_end is not None:
+				# </p> <p> becomes a blank line
+				del parts[paragraph_end:]
+			parts.append('\n')
+		elif name == 'br':
+			# Line breaks count as whitespace between paragraphs
+			parts.append('\n')
+			continue
+		paragraph_end = None
+	if pos < len(content) and not skipping:
+		parts.append(content[pos:])
+	text = html.unescape(''.join(parts))
+	text = _excess_newlines_re.sub('\n\n', text)
+	return text.strip()
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Disk cache for slow-changing API responses.
+
+GET requests to the endpoints in RULES are answered from an SQLite store
+while their entry is fresh (a per-endpoint TTL). Once it goes stale the
+request is sent with If-None-Match / If-Modified-Since, and a 304 is
+answered with the stored body, so an unchanged resource costs an empty
+response instead of a full download. Entries are keyed on the full URL and
+the credentials used, and any write to a related endpoint (creating a list,
+editing a filter, following a tag) drops that user's entries for it.
+
+cached_value()/store_value() keep arbitrary JSON data with a TTL in the same
+store, for clients that don't go through the shared session (Bluesky).
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# (name, path pattern, seconds a response is used without asking the server, write paths that invalidate it)
+RULES = (
+	('instance', r'/api/v[12]/instance', 6 * 3600, ()),
+	('trends', r'/api/v1/trends(?:/(?:tags|links|statuses))?', 15 * 60, ()),
+	('filters', r'/api/v2/filters', 5 * 60, ('/api/v1/filters', '/api/v2/filters')),
+	('lists', r'/api/v1/lists', 5 * 60, ('/api/v1/lists',)),
+	('followed_tags', r'/api/v1/followed_tags', 5 * 60, ('/api/v1/tags/',)),
+)
+
+# Responses larger than this aren't stored
+MAX_BODY = 2 * 1024 * 1024
+# Entries not used for this long are removed on startup
+MAX_AGE = 30 * 86400
+
+# Headers not replayed from a stored response; they describe the original exchange
+_SKIP_HEADERS = frozenset((
+	'date', 'content-length', 'content-encoding', 'transfer-encoding', 'connection',
+	'x-ratelimit-limit', 'x-ratelimit-remaining', 'x-ratelimit-reset', 'set-cookie',
+))
+
+_rules = [(name, re.compile(pattern), ttl, tuple(writes)) for name, pattern, ttl, writes in RULES]
+
+
+def _rule_for(path):
+	path = path.rstrip('/')
+	for rule in _rules:
+		if rule[1].fullmatch(path):
+			return rule
+	return None
+
+
+def _scope(url, headers):
+	"""Identifies the server and credentials a response belongs to."""
+	auth = ''
+	if headers:
+		auth = headers.get('Authorization') or headers.get('authorization') or ''
+	host = urlsplit(url).netloc.lower()
+	return hashlib.sha256(f"{host}\n{auth}".encode('utf-8')).hexdigest()
+
+
+def _full_url(url, params):
+	if not params:
+		return url
+	if isinstance(params, dict):
+		items = sorted((k, v) for k, v in params.items() if v is not None)
+	else:
+		items = list(params)
+	query = urlencode(items, doseq=True)
+	if not query:
+		return url
+	return url + ('&' if '?' in url else '?') + query
+
+
+class ResponseCache(object):
+	"""SQLite store of cached responses. Safe to use from any thread."""
+
+	def __init__(self, path):
+		self.path = path
+		self._lock = threading.Lock()
+		self._conn = None
+		self.hits = 0
+		self.revalidated = 0
+		self.misses = 0
+		try:
+			self._conn = sqlite3.connect(path, check_same_thread=False)
+			self._conn.execute("PRAGMA journal_mode=WAL")
+			self._conn.execute("PRAGMA synchronous=NORMAL")
+			self._conn.execute('''
+				CREATE TABLE IF NOT EXISTS responses (
+					key TEXT PRIMARY KEY,
+					scope TEXT NOT NULL,
+					rule TEXT NOT NULL,
+					url TEXT NOT NULL,
+					etag TEXT,
+					last_modified TEXT,
+					headers TEXT,
+					body BLOB,
+					stored_at REAL NOT NULL,
+					expires_at REAL NOT NULL
+				)
+			''')
+			self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses(scope, rule)')
+			self._conn.execute('DELETE FROM responses WHERE stored_at < ?', (time.time() - MAX_AGE,))
+			self._conn.commit()
+		except Exception as e:
+			print(f"HTTP cache init error: {e}")
+			self._conn = None
+
+	def _load(self, key):
+		if self._conn is None:
+			return None
+		with self._lock:
+			try:
+				return self._conn.execute(
+					'SELECT etag, last_modified, headers, body, expires_at FROM responses WHERE key = ?', (key,)
+				).fetchone()
+			except sqlite3.Error:
+				return None
+
+	def _store(self, key, scope, rule, url, etag, last_modified, headers, body, ttl):
+		if self._conn is None:
+			return
+		now = time.time()
+		with self._lock:
+			try:
+				self._conn.execute(
+					'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+					(key, scope, rule, url, etag, last_modified, headers, body, now, now + ttl)
+				)
+				self._conn.commit()
+			except sqlite3.Error as e:
+				print(f"HTTP cache write error: {e}")
+
+	def _touch(self, key, ttl):
+		if self._conn is None:
+			return
+		now = time.time()
+		with self._lock:
+			try:
+				self._conn.execute('UPDATE responses SET stored_at = ?, expires_at = ? WHERE key = ?', (now, now + ttl, key))
+				self._conn.commit()
+			except sqlite3.Error:
+				pass
+
+	def invalidate(self, scope, rule_names):
+		if self._conn is None or not rule_names:
+			return
+		with self._lock:
+			try:
+				self._conn.executemany('DELETE FROM responses WHERE scope = ? AND rule = ?', [(scope, name) for name in rule_names])
+				self._conn.commit()
+			except sqlite3.Error:
+				pass
+
+	def clear(self):
+		if self._conn is None:
+			return
+		with self._lock:
+			try:
+				self._conn.execute('DELETE FROM responses')
+				self._conn.commit()
+			except sqlite3.Error:
+				pass
+
+	def request(self, send, method, url, params=None, headers=None):
+		"""Send a request through the cache. send(extra_headers) performs the real request.
+
+		Returns None if the request isn't cacheable, so the caller sends it normally.
+		"""
+		path = urlsplit(url).path
+		if method.upper() != 'GET':
+			self._invalidate_for_write(url, path, headers)
+			return None
+		rule = _rule_for(path)
+		if rule is None or self._conn is None:
+			return None
+		name, _, ttl, _ = rule
+		scope = _scope(url, headers)
+		full_url = _full_url(url, params)
+		key = hashlib.sha256(f"{scope}\n{full_url}".encode('utf-8')).hexdigest()
+		row = self._load(key)
+		if row is not None and row[4] > time.time():
+			self.hits += 1
+			return _response(full_url, row[2], row[3])
+		conditional = {}
+		if row is not None:
+			if row[0]:
+				conditional['If-None-Match'] = row[0]
+			if row[1]:
+				conditional['If-Modified-Since'] = row[1]
+		response = send(conditional)
+		if response.status_code == 304 and row is not None:
+			self.revalidated += 1
+			self._touch(key, ttl)
+			cached = _response(full_url, row[2], row[3])
+			# Rate limit headers come from the live response
+			for header, value in response.headers.items():
+				if header.lower().startswith('x-ratelimit') or header.lower() == 'date':
+					cached.headers[header] = value
+			return cached
+		self.misses += 1
+		if response.status_code == 200 and len(response.content) <= MAX_BODY:
+			stored_headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS}
+			self._store(
+				key, scope, name, full_url,
+				response.headers.get('ETag'), response.headers.get('Last-Modified'),
+				json.dumps(stored_headers), response.content, ttl
+			)
+		return response
+
+	def _invalidate_for_write(self, url, path, headers):
+		names = [rule[0] for rule in _rules if any(path.startswith(prefix) for prefix in rule[3])]
+		if names:
+			self.invalidate(_scope(url, headers), names)
+
+	def cached_value(self, key):
+		"""A value stored with store_value, or None if missing or expired."""
+		row = self._load('value:' + key)
+		if row is None or row[4] <= time.time():
+			return None
+		try:
+			return json.loads(row[3])
+		except (TypeError, ValueError):
+			return None
+
+	def store_value(self, key, value, ttl):
+		self._store('value:' + key, 'value', key, key, None, None, None, json.dumps(value), ttl)
+
+	def drop_value(self, key):
+		if self._conn is None:
+			return
+		with self._lock:
+			try:
+				self._conn.execute('DELETE FROM responses WHERE key = ?', ('value:' + key,))
+				self._conn.commit()
+			except sqlite3.Error:
+				pass
+
+	def stats(self):
+		return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+
+def _response(url, headers, body):
+	"""A requests Response replaying a stored body."""
+	response = requests.Response()
+	response.status_code = 200
+	response.reason = 'OK'
+	response.url = url
+	response._content = bytes(body) if body is not None else b''
+	response.encoding = 'utf-8'
+	try:
+		response.headers = CaseInsensitiveDict(json.loads(headers) if headers else {})
+	except ValueError:
+		response.headers = CaseInsensitiveDict()
+	return response
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def open_cache(directory):
+	"""Open (or switch to) the cache stored in directory."""
+	global _cache
+	with _cache_lock:
+		path = os.path.join(directory, 'http_cache.db')
+		try:
+			os.makedirs(directory, exist_ok=True)
+		except OSError:
+			pass
+		if _cache is None or _cache.path != path:
+			_cache = ResponseCache(path)
+		return _cache
+
+
+def get_cache():
+	"""The open cache, or None before open_cache is called."""
+	return _cache
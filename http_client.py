@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Shared HTTP sessions.
+
+API clients, streams and downloads all go through a few long-lived
+requests sessions instead of opening a fresh connection per call. Each
+session keeps a keep-alive pool per host, so repeated requests to the same
+server reuse an open TLS connection rather than handshaking again.
+
+Streams get their own session so a long-lived streaming connection never
+occupies a slot in the pool API calls use. The API session answers
+slow-changing endpoints from http_cache. Sessions never store cookies;
+they are shared between accounts on the same server.
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_cache
+from version import APP_NAME, APP_VERSION
+
+API = "api"
+STREAM = "stream"
+DOWNLOAD = "download"
+
+# Number of hosts with a pool kept open, and connections kept per host
+DEFAULT_POOL_HOSTS = 20
+DEFAULT_POOL_SIZE = 10
+# (connect, read) timeouts in seconds, used when a call doesn't give its own
+DEFAULT_TIMEOUT = (10, 30)
+STREAM_TIMEOUT = (10, 300)
+
+USER_AGENT = f"{APP_NAME}/{APP_VERSION}"
+
+
+class _Session(requests.Session):
+	"""Session that applies a default timeout to every request."""
+
+	def __init__(self, timeout, use_cache=False):
+		requests.Session.__init__(self)
+		self.default_timeout = timeout
+		self.use_cache = use_cache
+		self.headers["User-Agent"] = USER_AGENT
+		self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+	def request(self, method, url, **kwargs):
+		if kwargs.get('timeout') is None:
+			kwargs['timeout'] = self.default_timeout
+		cache = http_cache.get_cache() if self.use_cache else None
+		if cache is not None and not kwargs.get('stream'):
+			def send(extra_headers):
+				headers = dict(kwargs.get('headers') or {})
+				headers.update(extra_headers)
+				return requests.Session.request(self, method, url, **dict(kwargs, headers=headers))
+			response = cache.request(send, method, url, kwargs.get('params'), kwargs.get('headers'))
+			if response is not None:
+				return response
+		return requests.Session.request(self, method, url, **kwargs)
+
+
+class SessionManager(object):
+	"""Creates and hands out the shared sessions."""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._sessions = {}
+		self.pool_hosts = DEFAULT_POOL_HOSTS
+		self.pool_size = DEFAULT_POOL_SIZE
+		self.timeout = DEFAULT_TIMEOUT
+
+	def configure(self, pool_hosts=None, pool_size=None, timeout=None):
+		"""Change pool sizes or the default timeout. Existing sessions are replaced."""
+		with self._lock:
+			if pool_hosts:
+				self.pool_hosts = int(pool_hosts)
+			if pool_size:
+				self.pool_size = int(pool_size)
+			if timeout:
+				self.timeout = timeout if isinstance(timeout, tuple) else (DEFAULT_TIMEOUT[0], timeout)
+			# Sessions in use keep working; new callers get sessions with the new settings
+			self._sessions = {}
+
+	def get(self, kind=API):
+		with self._lock:
+			session = self._sessions.get(kind)
+			if session is None:
+				session = self._create(kind)
+				self._sessions[kind] = session
+			return session
+
+	def _create(self, kind):
+		session = _Session(STREAM_TIMEOUT if kind == STREAM else self.timeout, use_cache=(kind == API))
+		adapter = HTTPAdapter(pool_connections=self.pool_hosts, pool_maxsize=self.pool_size)
+		session.mount("https://", adapter)
+		session.mount("http://", adapter)
+		return session
+
+	def close(self):
+		with self._lock:
+			sessions = list(self._sessions.values())
+			self._sessions = {}
+		for session in sessions:
+			try:
+				session.close()
+			except Exception:
+				pass
+
+
+_manager = SessionManager()
+
+
+def get_manager():
+	return _manager
+
+
+def get_session(kind=API):
+	"""The shared session for a kind of traffic (API, STREAM or DOWNLOAD)."""
+	return _manager.get(kind)
+
+
+def get(url, kind=API, **kwargs):
+	return _manager.get(kind).get(url, **kwargs)
+
+
+def post(url, kind=API, **kwargs):
+	return _manager.get(kind).post(url, **kwargs)
@@ -1,13 +1,18 @@
 import datetime
 from mastodon import Mastodon, MastodonError
 import streaming
+import stream_stats
+import http_client
 import application
 from version import APP_NAME, APP_VERSION
 import threading
+import time
 from GUI import main, misc
 import config
 import timeline
 import speak
+import single_flight
+import relationships
 from GUI.ask import *
 from GUI.platform_dialog import select_platform, get_bluesky_credentials
 import webbrowser
@@ -20,6 +25,21 @@ from models import UserCache
 from platforms.mastodon import MastodonAccount
 
 
+# Seconds between checks that keep a Bluesky session's tokens fresh
+# (atproto refreshes tokens within 15 minutes of expiry, so this must be shorter)
+BLUESKY_SESSION_CHECK_INTERVAL = 10 * 60
+# Errors meaning the saved tokens are no longer valid, as opposed to other bad requests
+BLUESKY_SESSION_ERRORS = ('ExpiredToken', 'InvalidToken')
+
+
+def _bluesky_error_name(error):
+	"""The XRPC error name of a failed atproto request, e.g. "ExpiredToken"."""
+	content = getattr(getattr(error, 'response', None), 'content', None)
+	if isinstance(content, dict):
+		return content.get('error')
+	return getattr(content, 'error', None)
+
+
 class AccountSetupCancelled(Exception):
 	"""Raised when user cancels account setup."""
 	pass
@@ -50,6 +70,7 @@ class mastodon(object):
 		self.stream_thread = None
 		self.stream = None
 		self._stream_started = False
+		self.stream_stats = None
 		config_root = config.get_app_config_dirname()
 		# In portable mode, don't add app prefix (userdata is already app-specific)
 		if config.is_portable_mode():
@@ -75,8 +96,6 @@ class mastodon(object):
 		# Built-in timeline order (list of timeline types in desired order)
 		self.prefs.timeline_order = self.prefs.get("timeline_order", [])
 
-		# Remote API instances for instance timelines (unauthenticated)
-		self.remote_apis = {}
 		self.prefs.footer = self.prefs.get("footer", "")
 		self.prefs.soundpack = self.prefs.get("soundpack", "default")
 		self.prefs.soundpan = self.prefs.get("soundpan", 0)
@@ -87,6 +106,8 @@ class mastodon(object):
 		self.prefs.last_mentions_id = self.prefs.get("last_mentions_id", None)
 		# User aliases - maps user ID to custom display name
 		self.prefs.aliases = self.prefs.get("aliases", {})
+		self.prefs.muted_words = self.prefs.get("muted_words", [])  # Client-side mute rules, see mutes.py
+		self.alias_version = 0  # Bumped when aliases change (part of the render cache key)
 
 		# Determine platform type if not set
 		if self.prefs.platform_type == "":
@@ -190,7 +211,8 @@ class mastodon(object):
 			client_secret=self.prefs.client_secret,
 			access_token=self.prefs.access_token,
 			api_base_url=self.prefs.instance_url,
-			user_agent=f"{APP_NAME}/{APP_VERSION}"
+			user_agent=f"{APP_NAME}/{APP_VERSION}",
+			session=http_client.get_session()
 		)
 
 		# Verify credentials and get user info
@@ -356,36 +378,62 @@ class mastodon(object):
 		"""Initialize Bluesky account."""
 		from atproto import Client
 		from atproto.exceptions import AtProtocolError
-		from platforms.bluesky import BlueskyAccount, bluesky_profile_to_universal
+		from platforms.bluesky import BlueskyAccount, bluesky_profile_to_universal, bluesky_profile_to_dict
 
 		# Bluesky-specific config
 		self.prefs.bluesky_handle = self.prefs.get("bluesky_handle", "")
 		self.prefs.bluesky_password = self.prefs.get("bluesky_password", "")
 		self.prefs.bluesky_service = self.prefs.get("bluesky_service", "https://bsky.social")
+		# Saved session (access and refresh tokens) and profile, so startup needs no login
+		self.prefs.bluesky_session = self.prefs.get("bluesky_session", "")
+		self.prefs.bluesky_profile = self.prefs.get("bluesky_profile", {})
+		# Jetstream endpoint for live updates (can point at a local stand-in server)
+		from platforms.bluesky.jetstream import DEFAULT_JETSTREAM_URL
+		self.prefs.bluesky_jetstream_url = self.prefs.get("bluesky_jetstream_url", DEFAULT_JETSTREAM_URL)
+
+		self.api = Client(base_url=self.prefs.bluesky_service)
+		# Keep the saved session current whenever tokens are created or refreshed
+		self.api.on_session_change(self._on_bluesky_session_change)
+
+		# Resume the saved session; no network request is needed until a timeline loads
+		raw_profile = None
+		if self.prefs.bluesky_session and self.prefs.bluesky_profile:
+			try:
+				self.api.login(session_string=self.prefs.bluesky_session, fetch_bsky_profile=False)
+				raw_profile = dict(self.prefs.bluesky_profile)
+			except Exception as e:
+				print(f"Saved Bluesky session unusable: {e}")
+				self.prefs.bluesky_session = ""
+
+		if raw_profile is None:
+			# Get credentials if not set
+			if self.prefs.bluesky_handle == "" or self.prefs.bluesky_password == "":
+				creds = get_bluesky_credentials(main.window)
+				if creds is None:
+					_exit_app()
+				self.prefs.bluesky_handle = creds['handle']
+				self.prefs.bluesky_password = creds['password']
+				self.prefs.bluesky_service = creds['service_url']
+				self.api = Client(base_url=self.prefs.bluesky_service)
+				self.api.on_session_change(self._on_bluesky_session_change)
 
-		# Get credentials if not set
-		if self.prefs.bluesky_handle == "" or self.prefs.bluesky_password == "":
-			creds = get_bluesky_credentials(main.window)
-			if creds is None:
+			# Log in with the app password
+			try:
+				raw_profile = self.api.login(self.prefs.bluesky_handle, self.prefs.bluesky_password)
+			except AtProtocolError as e:
+				speak.speak("Error logging into Bluesky: " + str(e))
+				# Clear credentials
+				self.prefs.bluesky_handle = ""
+				self.prefs.bluesky_password = ""
 				_exit_app()
-			self.prefs.bluesky_handle = creds['handle']
-			self.prefs.bluesky_password = creds['password']
-			self.prefs.bluesky_service = creds['service_url']
-
-		# Initialize the client and login
-		try:
-			self.api = Client(base_url=self.prefs.bluesky_service)
-			raw_profile = self.api.login(self.prefs.bluesky_handle, self.prefs.bluesky_password)
-			self.me = bluesky_profile_to_universal(raw_profile)
-		except AtProtocolError as e:
-			speak.speak("Error logging into Bluesky: " + str(e))
-			# Clear credentials
-			self.prefs.bluesky_handle = ""
-			self.prefs.bluesky_password = ""
-			_exit_app()
-		except Exception as e:
-			speak.speak("Error connecting to Bluesky: " + str(e))
-			_exit_app()
+			except Exception as e:
+				speak.speak("Error connecting to Bluesky: " + str(e))
+				_exit_app()
+			self.prefs.bluesky_profile = bluesky_profile_to_dict(raw_profile)
+			# The saved session replaces the password from here on
+			if self.api.export_session_string():
+				self.prefs.bluesky_password = ""
+		self.me = bluesky_profile_to_universal(raw_profile)
 
 		# Set platform properties
 		self.max_chars = 300  # Bluesky character limit
@@ -440,13 +488,107 @@ class mastodon(object):
 			except:
 				self.prefs.custom_timelines.remove(ct)
 
-		# No streaming for Bluesky
+		# Jetstream starts once the initial timeline loads complete
 		self.stream_listener = None
 		self.stream = None
 		self._stream_started = False
 
 		self._finish_timeline_init()
 
+		# Update the profile and keep the session's tokens fresh off the UI thread
+		threading.Thread(target=self._keep_bluesky_session, daemon=True).start()
+
+	def _on_bluesky_session_change(self, event, session):
+		"""Save the Bluesky session when it is created or its tokens are refreshed.
+
+		Refresh tokens rotate, so losing this write loses the session. Refreshes
+		happen on whichever thread made the request; the prefs are written on
+		the UI thread, where the other prefs changes are made.
+		"""
+		try:
+			session_string = session.encode()
+		except Exception as e:
+			print(f"Could not save Bluesky session: {e}")
+			return
+
+		def save():
+			self.prefs.bluesky_session = session_string
+
+		if wx.IsMainThread():
+			save()
+		else:
+			wx.CallAfter(save)
+
+	def _keep_bluesky_session(self):
+		"""Refresh the cached profile, then check the session periodically.
+
+		Any request made when the access token is close to expiry refreshes it
+		first, so the periodic check keeps that refresh off timeline loads.
+		"""
+		from atproto.exceptions import UnauthorizedError, BadRequestError, LoginRequiredError
+		from platforms.bluesky import bluesky_profile_to_universal, bluesky_profile_to_dict
+		first = True
+		while True:
+			try:
+				if first:
+					raw_profile = self.api.get_profile(self.me.id)
+					self.me = bluesky_profile_to_universal(raw_profile)
+					self._platform._me = self.me
+					self.prefs.bluesky_profile = bluesky_profile_to_dict(raw_profile)
+					first = False
+				else:
+					self.api.com.atproto.server.get_session()
+			except (UnauthorizedError, BadRequestError, LoginRequiredError) as e:
+				if isinstance(e, BadRequestError) and _bluesky_error_name(e) not in BLUESKY_SESSION_ERRORS:
+					# Some other rejected request; the session itself is fine
+					print(f"Bluesky session check failed: {e}")
+				else:
+					print(f"Bluesky session rejected: {e}")
+					wx.CallAfter(self._bluesky_session_lost)
+					return
+			except Exception as e:
+				# Network trouble; try again at the next check
+				print(f"Bluesky session check failed: {e}")
+			time.sleep(BLUESKY_SESSION_CHECK_INTERVAL)
+
+	def _bluesky_session_lost(self):
+		self.prefs.bluesky_session = ""
+		self._bluesky_login_again()
+
+	def _bluesky_login_again(self):
+		"""Ask for the app password after the saved session stopped working."""
+		from atproto import Client
+		speak.speak("Bluesky session expired for " + self.me.acct + ". Please log in again.")
+		creds = get_bluesky_credentials(main.window)
+		if creds is None:
+			return
+
+		def login():
+			client = Client(base_url=creds['service_url'])
+			try:
+				profile = client.login(creds['handle'], creds['password'])
+			except Exception as e:
+				speak.speak("Error logging into Bluesky: " + str(e))
+				return
+			if str(getattr(profile, 'did', '')) != str(self.me.id):
+				speak.speak("That is a different Bluesky account than " + self.me.acct + ".")
+				return
+			session_string = client.export_session_string()
+
+			def switch():
+				# Adopt the new client only once it is known to be this account
+				client.on_session_change(self._on_bluesky_session_change)
+				self.api = client
+				self._platform.client = client
+				self.prefs.bluesky_handle = creds['handle']
+				self.prefs.bluesky_service = creds['service_url']
+				self.prefs.bluesky_session = session_string
+				threading.Thread(target=self._keep_bluesky_session, daemon=True).start()
+
+			wx.CallAfter(switch)
+
+		threading.Thread(target=login, daemon=True).start()
+
 	def _finish_init(self, index):
 		"""Common initialization after platform-specific setup."""
 		import wx
@@ -535,9 +677,11 @@ class mastodon(object):
 				timeline.add(self, name, tl_type, data, user)
 
 	def start_stream(self):
-		# Bluesky doesn't support streaming
+		# Bluesky live updates need the optional websocket-client package
 		if self.prefs.platform_type == "bluesky":
-			return
+			from platforms.bluesky.jetstream import WEBSOCKET_AVAILABLE
+			if not WEBSOCKET_AVAILABLE:
+				return
 
 		# Use lock to prevent race condition where multiple threads try to start stream
 		with self._stream_lock:
@@ -558,8 +702,8 @@ class mastodon(object):
 			self.stream_thread.start()
 
 	def _run_stream(self):
-		# Bluesky doesn't support streaming
 		if self.prefs.platform_type == "bluesky":
+			self._run_bluesky_stream()
 			return
 
 		import time
@@ -573,6 +717,8 @@ class mastodon(object):
 
 		# Create listener once
 		self.stream_listener = streaming.MastodonStreamListener(self)
+		self.stream_stats = stream_stats.get_stats(self.me.acct + " user stream")
+		stats = self.stream_stats
 
 		while True:
 			try:
@@ -592,9 +738,10 @@ class mastodon(object):
 					"Accept": "text/event-stream",
 				}
 
-				with requests.get(stream_url, headers=headers, stream=True, timeout=300) as response:
+				with http_client.get(stream_url, kind=http_client.STREAM, headers=headers, stream=True) as response:
 					response.raise_for_status()
 					consecutive_errors = 0  # Reset on successful connect
+					stats.on_connect()
 
 					event_type = None
 					data_lines = []
@@ -602,6 +749,7 @@ class mastodon(object):
 					for line in response.iter_lines():
 						# Check if we should stop
 						if self.stream_thread is None or self.stream_thread.ident != thread_id:
+							stats.on_disconnect("stopped")
 							return
 
 						if line:
@@ -615,17 +763,22 @@ class mastodon(object):
 							if event_type and data_lines:
 								data_str = '\n'.join(data_lines)
 								try:
+									parse_start = time.perf_counter()
 									data = json.loads(data_str)
+									stats.record_event(event_type, time.perf_counter() - parse_start)
 									self._handle_stream_event(event_type, data)
-								except json.JSONDecodeError:
-									pass  # Ignore malformed JSON
+								except json.JSONDecodeError as e:
+									stats.record_malformed(e)
 							event_type = None
 							data_lines = []
+				stats.on_disconnect("server closed stream")
 
 			except requests.exceptions.Timeout:
+				stats.on_disconnect("timeout")
 				time.sleep(2)
 				continue
 			except Exception as e:
+				stats.on_disconnect(e)
 				error_str = str(e).lower()
 
 				transient_errors = [
@@ -638,12 +791,21 @@ class mastodon(object):
 
 				consecutive_errors += 1
 				if consecutive_errors >= 5:
-					speak.speak("Stream connection lost")
+					speak.speak("Stream connection lost", priority=speak.PRIORITY_ERROR)
 					consecutive_errors = 0
 
 				delay = min(base_delay * (2 ** (consecutive_errors - 1)), max_delay)
 				time.sleep(delay)
 
+	def _run_bluesky_stream(self):
+		"""Consume Jetstream for this Bluesky account until the stream thread is replaced."""
+		from platforms.bluesky.jetstream import JetstreamClient
+		thread_id = threading.current_thread().ident
+		self.stream_listener = streaming.BlueskyStreamListener(self)
+		self.stream_stats = stream_stats.get_stats(self.me.acct + " Jetstream")
+		self.stream = JetstreamClient(self._platform, self.stream_listener, url=self.prefs.bluesky_jetstream_url, stats=self.stream_stats)
+		self.stream.run(keep_running=lambda: self.stream_thread is not None and self.stream_thread.ident == thread_id)
+
 	def _handle_stream_event(self, event_type, data):
 		"""Handle a streaming event by dispatching to the listener."""
 		# Guard: check listener exists
@@ -676,8 +838,9 @@ class mastodon(object):
 			elif event_type == 'conversation':
 				conversation = convert_to_attrib_dict(data)
 				self.stream_listener.on_conversation(conversation)
-		except Exception:
-			pass  # Silently ignore stream handler errors
+		except Exception as e:
+			if self.stream_stats is not None:
+				self.stream_stats.record_dropped(event_type, e)
 
 	def followers(self, id):
 		# Use platform backend if available
@@ -821,17 +984,23 @@ class mastodon(object):
 
 	def boost(self, id):
 		"""Boost (reblog) a status"""
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.boost(id)
-		self.api.status_reblog(id=id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.boost(id)
+			self.api.status_reblog(id=id)
+		finally:
+			self.app.forget_status(self, id)
 
 	def unboost(self, id):
 		"""Unboost (unreblog) a status"""
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.unboost(id)
-		self.api.status_unreblog(id=id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.unboost(id)
+			self.api.status_unreblog(id=id)
+		finally:
+			self.app.forget_status(self, id)
 
 	def quote(self, status, text, visibility=None):
 		"""Quote a status - try native quote, fallback to URL"""
@@ -881,41 +1050,50 @@ class mastodon(object):
 
 	def edit(self, status_id, text, visibility=None, spoiler_text=None, media_ids=None, **kwargs):
 		"""Edit an existing status"""
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.edit(
-				status_id=status_id,
-				text=text,
-				visibility=visibility,
-				spoiler_text=spoiler_text,
-				media_ids=media_ids,
-				**kwargs
-			)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.edit(
+					status_id=status_id,
+					text=text,
+					visibility=visibility,
+					spoiler_text=spoiler_text,
+					media_ids=media_ids,
+					**kwargs
+				)
 
-		edit_kwargs = {
-			'id': status_id,
-			'status': text,
-		}
-		if spoiler_text:
-			edit_kwargs['spoiler_text'] = spoiler_text
-		if media_ids:
-			edit_kwargs['media_ids'] = media_ids
+			edit_kwargs = {
+				'id': status_id,
+				'status': text,
+			}
+			if spoiler_text:
+				edit_kwargs['spoiler_text'] = spoiler_text
+			if media_ids:
+				edit_kwargs['media_ids'] = media_ids
 
-		return self.api.status_update(**edit_kwargs)
+			return self.api.status_update(**edit_kwargs)
+		finally:
+			self.app.forget_status(self, status_id)
 
 	def favourite(self, id):
 		"""Favourite a status"""
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.favourite(id)
-		self.api.status_favourite(id=id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.favourite(id)
+			self.api.status_favourite(id=id)
+		finally:
+			self.app.forget_status(self, id)
 
 	def unfavourite(self, id):
 		"""Unfavourite a status"""
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.unfavourite(id)
-		self.api.status_unfavourite(id=id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.unfavourite(id)
+			self.api.status_unfavourite(id=id)
+		finally:
+			self.app.forget_status(self, id)
 
 	def follow(self, user_id):
 		"""Follow a user by ID or acct"""
@@ -927,10 +1105,13 @@ class mastodon(object):
 			else:
 				speak.speak("User not found")
 				return
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.follow(user_id)
-		self.api.account_follow(id=user_id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.follow(user_id)
+			self.api.account_follow(id=user_id)
+		finally:
+			relationships.forget(self, user_id)
 
 	def unfollow(self, user_id):
 		"""Unfollow a user by ID or acct"""
@@ -941,10 +1122,13 @@ class mastodon(object):
 			else:
 				speak.speak("User not found")
 				return
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.unfollow(user_id)
-		self.api.account_unfollow(id=user_id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.unfollow(user_id)
+			self.api.account_unfollow(id=user_id)
+		finally:
+			relationships.forget(self, user_id)
 
 	def block(self, user_id):
 		"""Block a user by ID or acct"""
@@ -955,10 +1139,13 @@ class mastodon(object):
 			else:
 				speak.speak("User not found")
 				return
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.block(user_id)
-		self.api.account_block(id=user_id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.block(user_id)
+			self.api.account_block(id=user_id)
+		finally:
+			relationships.forget(self, user_id)
 
 	def unblock(self, user_id):
 		"""Unblock a user by ID or acct"""
@@ -969,10 +1156,13 @@ class mastodon(object):
 			else:
 				speak.speak("User not found")
 				return
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.unblock(user_id)
-		self.api.account_unblock(id=user_id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.unblock(user_id)
+			self.api.account_unblock(id=user_id)
+		finally:
+			relationships.forget(self, user_id)
 
 	def mute(self, user_id):
 		"""Mute a user by ID or acct"""
@@ -983,10 +1173,13 @@ class mastodon(object):
 			else:
 				speak.speak("User not found")
 				return
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.mute(user_id)
-		self.api.account_mute(id=user_id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.mute(user_id)
+			self.api.account_mute(id=user_id)
+		finally:
+			relationships.forget(self, user_id)
 
 	def unmute(self, user_id):
 		"""Unmute a user by ID or acct"""
@@ -997,17 +1190,27 @@ class mastodon(object):
 			else:
 				speak.speak("User not found")
 				return
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.unmute(user_id)
-		self.api.account_unmute(id=user_id)
+		try:
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.unmute(user_id)
+			self.api.account_unmute(id=user_id)
+		finally:
+			relationships.forget(self, user_id)
 
 	def get_user(self, user_id):
 		"""Get user by ID."""
-		# Use platform backend if available
-		if hasattr(self, '_platform') and self._platform:
-			return self._platform.get_user(user_id)
-		return self.api.account(id=user_id)
+		def fetch():
+			# Use platform backend if available
+			if hasattr(self, '_platform') and self._platform:
+				return self._platform.get_user(user_id)
+			return self.api.account(id=user_id)
+		return single_flight.call((self, 'user', str(user_id)), fetch)
+
+	def list_member_ids(self, list_id):
+		"""IDs of the members of a list."""
+		members = single_flight.call((self, 'list_accounts', str(list_id)), lambda: self.api.list_accounts(id=list_id))
+		return [m.id for m in members]
 
 	def search_users(self, query, limit=40):
 		"""Search for users."""
@@ -1100,5 +1303,7 @@ class mastodon(object):
 
 	def cleanup(self):
 		"""Clean up resources when account is removed or app is closing."""
+		if self.stream is not None and hasattr(self.stream, 'stop'):
+			self.stream.stop()
 		if self._platform:
 			self._platform.close()
@@ -59,7 +59,6 @@ class UserCache:
 
     def __init__(self, confpath: str, platform: str, account_id: str):
         self.users: List[UniversalUser] = []
-        self.unknown_users: List[str] = []  # IDs to look up later
 
     def load(self) -> bool:
         """No-op - cache is in-memory only."""
@@ -100,13 +99,10 @@ class UserCache:
             self.add_users_from_status(notification.status)
 
     def lookup_by_id(self, user_id: str) -> Optional[UniversalUser]:
-        """Look up a user by ID."""
+        """Look up a user by ID. Misses are resolved by the account's user_resolver."""
         for user in self.users:
             if str(user.id) == str(user_id):
                 return user
-        # Add to unknown list for later lookup
-        if user_id not in self.unknown_users:
-            self.unknown_users.append(user_id)
         return None
 
     def lookup_by_name(self, name: str, use_api_callback=None) -> Optional[UniversalUser]:
@@ -133,4 +129,3 @@ class UserCache:
     def clear(self):
         """Clear the cache."""
         self.users = []
-        self.unknown_users = []
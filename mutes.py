@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Client-side muted words for an account.
+
+Rules live in account.prefs.muted_words as dicts:
+	keyword     word, phrase or regular expression
+	regex       treat keyword as a regular expression
+	whole_word  only match at word boundaries
+	action      "hide" (drop the post) or "warn" (show it behind a warning)
+	expires_at  UNIX time the rule stops applying, or None
+
+All active rules are compiled into one MuteEngine. Whole-word single-word
+keywords (the common case) go into a hash table probed once per word of the
+post, and everything else into one combined regex, so checking a post does
+not loop over the rules. A post's result is remembered on the post and only
+recomputed when the rules change.
+"""
+import re
+import threading
+import time
+from collections import namedtuple
+
+import html_text
+
+ACTION_HIDE = "hide"
+ACTION_WARN = "warn"
+
+MuteResult = namedtuple('MuteResult', ('action', 'keywords'))
+
+_word_re = re.compile(r'\w+')
+_builds = 0
+_build_lock = threading.Lock()
+
+
+def _is_active(rule, now):
+	if not rule.get('keyword'):
+		return False
+	expires_at = rule.get('expires_at')
+	return not expires_at or expires_at > now
+
+
+class MuteEngine(object):
+	"""Matches text against a fixed set of mute rules."""
+
+	def __init__(self, rules, now=None):
+		global _builds
+		if now is None:
+			now = time.time()
+		with _build_lock:
+			_builds += 1
+			self.version = _builds
+		self.rules = [rule for rule in rules if _is_active(rule, now)]
+		self._words = {}  # lowercase word -> rule indexes
+		pieces = []
+		for i, rule in enumerate(self.rules):
+			keyword = rule['keyword']
+			whole_word = rule.get('whole_word', True)
+			if rule.get('regex'):
+				piece = keyword
+				try:
+					re.compile(piece)
+				except re.error:
+					continue
+			else:
+				lowered = keyword.lower()
+				if whole_word and _word_re.fullmatch(lowered):
+					self._words.setdefault(lowered, []).append(i)
+					continue
+				piece = re.escape(keyword)
+			if whole_word:
+				piece = rf'(?<!\w)(?:{piece})(?!\w)'
+			pieces.append(f'(?P<m{i}>{piece})')
+		self._pattern = None
+		if pieces:
+			try:
+				self._pattern = re.compile('|'.join(pieces), re.IGNORECASE)
+			except re.error:
+				# A regex that only fails when combined (e.g. numbered backreferences)
+				self._pattern = None
+		expiries = [rule['expires_at'] for rule in self.rules if rule.get('expires_at')]
+		self.next_expiry = min(expiries) if expiries else None
+
+	def match(self, text):
+		"""Indexes of the rules that match text."""
+		hits = set()
+		if not text:
+			return hits
+		if self._words:
+			words = self._words
+			for word in _word_re.findall(text.lower()):
+				indexes = words.get(word)
+				if indexes:
+					hits.update(indexes)
+		if self._pattern is not None:
+			for match in self._pattern.finditer(text):
+				# The rule's group encloses any groups of its own, so it is the last one closed
+				hits.add(int(match.lastgroup[1:]))
+		return hits
+
+	def check(self, text):
+		"""MuteResult for text, or None if no rule matches."""
+		hits = self.match(text)
+		if not hits:
+			return None
+		matched = [self.rules[i] for i in sorted(hits)]
+		action = ACTION_HIDE if any(rule.get('action', ACTION_HIDE) == ACTION_HIDE for rule in matched) else ACTION_WARN
+		return MuteResult(action, tuple(rule['keyword'] for rule in matched))
+
+
+def get_engine(account):
+	"""The account's compiled mute engine, or None if it has no active rules."""
+	rules = getattr(account.prefs, 'muted_words', None)
+	if not rules:
+		return None
+	engine = getattr(account, '_mute_engine', None)
+	version = getattr(account, 'mutes_version', 0)
+	expired = engine is not None and engine.next_expiry is not None and time.time() >= engine.next_expiry
+	if engine is None or getattr(account, '_mute_engine_source', None) != version or expired:
+		engine = MuteEngine(rules)
+		account._mute_engine = engine
+		account._mute_engine_source = version
+		if expired:
+			import render_cache
+			# Renders of posts the expired rules warned about still carry the warning
+			render_cache.bump_generation()
+	if not engine.rules:
+		return None
+	return engine
+
+
+def set_rules(account, rules):
+	"""Replace an account's mute rules."""
+	import render_cache
+	account.prefs.muted_words = list(rules)
+	account.mutes_version = getattr(account, 'mutes_version', 0) + 1
+	# Warnings are part of rendered text
+	render_cache.bump_generation()
+
+
+def _status_text(status):
+	"""Text a mute rule is matched against: the post (or boosted post) and its content warning."""
+	# Notifications carry the post they are about
+	inner = getattr(status, 'status', None)
+	if inner is not None and not isinstance(inner, str):
+		status = inner
+	parts = []
+	for post in (status, getattr(status, 'reblog', None), getattr(status, 'quote', None)):
+		if post is None:
+			continue
+		spoiler = getattr(post, 'spoiler_text', None)
+		if spoiler:
+			parts.append(spoiler)
+		text = getattr(post, 'text', None)
+		if not text and getattr(post, 'content', None):
+			text = html_text.for_status(post).text
+		if text:
+			parts.append(str(text))
+	return "\n".join(parts)
+
+
+def check_status(account, status):
+	"""MuteResult for a post or notification, or None. Memoized on the item."""
+	engine = get_engine(account)
+	if engine is None:
+		return None
+	cached = getattr(status, '_mute', None)
+	if cached is not None and cached[0] == engine.version:
+		return cached[1]
+	result = engine.check(_status_text(status))
+	try:
+		status._mute = (engine.version, result)
+	except (AttributeError, TypeError):
+		pass
+	return result
+
+
+def is_hidden(account, status):
+	result = check_status(account, status)
+	return result is not None and result.action == ACTION_HIDE
+
+
+def warning(account, status):
+	"""Warning text for a post muted with the warn action, or None."""
+	result = check_status(account, status)
+	if result is None or result.action != ACTION_WARN:
+		return None
+	return "Muted: " + ", ".join(result.keywords)
+
+
+def apply_to_timelines(account):
+	"""Remove posts that are now hidden by the account's rules from its open timelines."""
+	if get_engine(account) is None:
+		return
+	for tl in list(account.timelines):
+		with tl._status_lock:
+			keep = [s for s in tl.statuses if not is_hidden(account, s)]
+			if len(keep) == len(tl.statuses):
+				continue
+			tl.statuses = keep
+			if getattr(tl, '_unfiltered_statuses', None):
+				tl._unfiltered_statuses = [s for s in tl._unfiltered_statuses if not is_hidden(account, s)]
+			if tl.index >= len(keep):
+				tl.index = max(0, len(keep) - 1)
+			tl.invalidate_display_cache()
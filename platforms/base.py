@@ -153,6 +153,19 @@ class PlatformAccount(ABC):
         """Get user by ID."""
         pass
 
+    def get_users(self, user_ids: List[str], quiet: bool = False) -> List[UniversalUser]:
+        """Get several users by ID. Platforms override this to batch the lookups.
+
+        With quiet set, failed lookups raise to the caller instead of being
+        reported to the user.
+        """
+        users = []
+        for user_id in user_ids:
+            user = self.get_user(user_id)
+            if user:
+                users.append(user)
+        return users
+
     @abstractmethod
     def search_users(self, query: str, limit: int = 10) -> List[UniversalUser]:
         """Search for users."""
@@ -4,6 +4,7 @@ from .account import BlueskyAccount
 from .models import (
     bluesky_post_to_universal,
     bluesky_profile_to_universal,
+    bluesky_profile_to_dict,
     bluesky_notification_to_universal,
 )
 
@@ -11,6 +12,7 @@ __all__ = [
     'BlueskyAccount',
     'bluesky_post_to_universal',
     'bluesky_profile_to_universal',
+    'bluesky_profile_to_dict',
     'bluesky_notification_to_universal',
 ]
 
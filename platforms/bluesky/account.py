@@ -1,10 +1,14 @@
 """Bluesky platform account implementation."""
 
+import concurrent.futures
+import threading
+import time
 from typing import List, Optional, Any, Dict
 from datetime import datetime, timezone
 from atproto import Client
 from atproto.exceptions import AtProtocolError, InvokeTimeoutError
 
+import http_cache
 from platforms.base import PlatformAccount
 from models import UniversalStatus, UniversalUser, UniversalNotification, UserCache
 from models.status import UniversalMention
@@ -16,6 +20,14 @@ from .models import (
     extract_rkey_from_uri,
 )
 
+# Seconds the saved feed list is reused before it is fetched again
+SAVED_FEEDS_TTL = 10 * 60
+# Seconds a first page of notifications is shared between the Mentions and Notifications timelines
+NOTIFICATIONS_SHARE_TTL = 15
+# get_posts takes at most 25 URIs; batches run on a few threads at once
+POSTS_PER_REQUEST = 25
+POST_FETCH_WORKERS = 4
+
 
 class BlueskyAccount(PlatformAccount):
     """Bluesky-specific account implementation."""
@@ -51,20 +63,154 @@ class BlueskyAccount(PlatformAccount):
             self.timeline_cache = None
 
         # Cursor tracking for pagination (Bluesky uses cursors, not max_id)
-        self._cursors = {}  # timeline_type -> cursor
+        self._cursors = {}  # timeline's cursor_key -> cursor past its oldest item
+        self._page_cursors = {}  # timeline's cursor_key -> cursor after the last page fetched
+
+        # Newest notification indexedAt seen per timeline, used to probe for new items
+        self._notifications_seen_at = {}  # timeline_type -> ISO datetime
+
+        # Newest page of notifications, reused by the other notification timeline
+        self._notifications_lock = threading.Lock()
+        self._shared_notifications = None  # (fetched_at, page_limit, response)
 
     @property
     def me(self) -> UniversalUser:
         return self._me
 
-    def _store_cursor(self, timeline_type: str, cursor: str):
-        """Store cursor for pagination."""
-        if cursor:
-            self._cursors[timeline_type] = cursor
+    def _store_cursor(self, cursor_key: str, cursor: str, paging: bool = True):
+        """Store cursor for pagination.
 
-    def _get_cursor(self, timeline_type: str) -> str:
+        Loading older items (paging) always advances the cursor. A refresh
+        only sets it when there is none yet, since the oldest loaded item
+        doesn't change when newer ones arrive. The cursor of the page just
+        fetched is kept separately, for refreshes that fetch several pages.
+        """
+        self._page_cursors[cursor_key] = cursor
+        if cursor and (paging or cursor_key not in self._cursors):
+            self._cursors[cursor_key] = cursor
+
+    def _get_cursor(self, cursor_key: str) -> str:
         """Get stored cursor for pagination."""
-        return self._cursors.get(timeline_type)
+        return self._cursors.get(cursor_key)
+
+    def get_cursor(self, cursor_key: str) -> Optional[str]:
+        """Cursor for items older than a timeline's oldest, saved with the timeline cache."""
+        return self._cursors.get(cursor_key)
+
+    def set_cursor(self, cursor_key: str, cursor: Optional[str]):
+        """Restore a saved cursor, or forget it with None when a timeline starts empty."""
+        self._page_cursors.pop(cursor_key, None)
+        if cursor:
+            self._cursors[cursor_key] = cursor
+        else:
+            self._cursors.pop(cursor_key, None)
+
+    def get_page_cursor(self, cursor_key: str) -> Optional[str]:
+        """Cursor following the page a timeline fetched last."""
+        return self._page_cursors.get(cursor_key)
+
+    def _probe_new_notifications(self, timeline_type: str) -> Optional[int]:
+        """Count notifications newer than the last refresh of a timeline.
+
+        Returns None if there is no baseline yet or the probe fails, in which
+        case the caller should fall back to a full fetch.
+        """
+        seen_at = self._notifications_seen_at.get(timeline_type)
+        if not seen_at:
+            return None
+        try:
+            from atproto import models
+            params = models.AppBskyNotificationGetUnreadCount.Params(seen_at=seen_at)
+            return self.client.app.bsky.notification.get_unread_count(params).count
+        except Exception:
+            return None
+
+    def _mark_notifications_seen(self, timeline_type: str, notifications):
+        """Remember the newest notification of a refresh as the probe baseline."""
+        if notifications:
+            indexed_at = getattr(notifications[0], 'indexed_at', None)
+            if indexed_at:
+                self._notifications_seen_at[timeline_type] = indexed_at
+
+    def _notification_page_limit(self, timeline_type: str, limit: int, cursor: str) -> int:
+        """Work out how many notifications a fetch needs.
+
+        A page limit of 0 means nothing changed since the last refresh and
+        the fetch can be skipped entirely.
+        """
+        page_limit = min(limit, 100)
+        if cursor:
+            return page_limit
+        new_count = self._probe_new_notifications(timeline_type)
+        if new_count is None:
+            return page_limit
+        # Small margin covers notifications that land between probe and fetch
+        return min(page_limit, new_count + 5) if new_count else 0
+
+    def _list_notifications(self, timeline_type: str, limit: int, cursor: str):
+        """Fetch a page of notifications for a timeline.
+
+        Returns the response, or None when nothing changed since the
+        timeline's last refresh. A first page fetched by one of the
+        Mentions and Notifications timelines is reused by the other for a
+        few seconds, so refreshing both costs a single request.
+        """
+        from atproto import models
+
+        if cursor:
+            params = models.AppBskyNotificationListNotifications.Params(limit=min(limit, 100), cursor=cursor)
+            return self.client.app.bsky.notification.list_notifications(params)
+
+        with self._notifications_lock:
+            shared = self._shared_notifications
+            if shared is not None and time.time() - shared[0] < NOTIFICATIONS_SHARE_TTL:
+                _, shared_limit, response = shared
+                seen_at = self._notifications_seen_at.get(timeline_type)
+                indexed = [getattr(n, 'indexed_at', None) or '' for n in response.notifications]
+                # Usable if it is as large as this timeline's own page would be, or reaches back to what it has seen
+                if shared_limit >= min(limit, 100) or (seen_at and any(i and i <= seen_at for i in indexed)):
+                    if seen_at and not any(i > seen_at for i in indexed):
+                        return None
+                    return response
+
+            # Refreshes probe the unread count first and skip unchanged fetches
+            page_limit = self._notification_page_limit(timeline_type, limit, cursor)
+            if page_limit == 0:
+                return None
+            params = models.AppBskyNotificationListNotifications.Params(limit=page_limit)
+            response = self.client.app.bsky.notification.list_notifications(params)
+            self._shared_notifications = (time.time(), page_limit, response)
+            return response
+
+    def _fetch_posts(self, uris) -> Dict[str, UniversalStatus]:
+        """Fetch posts by URI in batches of 25, several batches at once.
+
+        Returns a dict of URI -> status; posts that couldn't be fetched are missing.
+        """
+        uris = list(dict.fromkeys(u for u in uris if u))
+        batches = [uris[i:i + POSTS_PER_REQUEST] for i in range(0, len(uris), POSTS_PER_REQUEST)]
+
+        def fetch(batch):
+            try:
+                return self.client.get_posts(batch).posts
+            except Exception:
+                return []  # Continue even if a batch fails
+
+        if len(batches) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(POST_FETCH_WORKERS, len(batches))) as executor:
+                results = list(executor.map(fetch, batches))
+        else:
+            results = [fetch(batch) for batch in batches]
+
+        posts = {}
+        for batch_posts in results:
+            for post in batch_posts:
+                post_uri = getattr(post, 'uri', '')
+                if post_uri:
+                    status = bluesky_post_to_universal(post)
+                    if status:
+                        posts[post_uri] = status
+        return posts
 
     def _convert_feed_posts(self, feed) -> List[UniversalStatus]:
         """Convert a list of feed view posts to universal statuses."""
@@ -98,21 +244,22 @@ class BlueskyAccount(PlatformAccount):
 
     # ============ Timeline Methods ============
 
-    def get_home_timeline(self, limit: int = 40, cursor: str = None, max_id: str = None, **kwargs) -> List[UniversalStatus]:
+    def get_home_timeline(self, limit: int = 40, cursor: str = None, max_id: str = None, cursor_key: str = None, **kwargs) -> List[UniversalStatus]:
         """Get home timeline (Following feed)."""
         try:
             params = {'limit': min(limit, 100)}  # Bluesky max is 100
 
             # For "load previous", use the stored cursor (max_id signals pagination request)
+            cursor_key = cursor_key or 'home'
             if max_id and not cursor:
-                cursor = self._get_cursor('home')
+                cursor = self._get_cursor(cursor_key)
             if cursor:
                 params['cursor'] = cursor
 
             response = self.client.get_timeline(**params)
 
             # Store cursor for next pagination request
-            self._store_cursor('home', getattr(response, 'cursor', None))
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
 
             return self._convert_feed_posts(response.feed)
         except (AtProtocolError, InvokeTimeoutError) as e:
@@ -127,66 +274,59 @@ class BlueskyAccount(PlatformAccount):
                 self.app.handle_error(e, "home timeline")
             return []
 
-    def get_mentions(self, limit: int = 40, cursor: str = None, max_id: str = None, **kwargs) -> List[UniversalStatus]:
+    def get_mentions(self, limit: int = 40, cursor: str = None, max_id: str = None, cursor_key: str = None, **kwargs) -> List[UniversalStatus]:
         """Get mentions as statuses (extracted from notifications)."""
         try:
-            from atproto import models
-
             # For "load previous", use the stored cursor
+            cursor_key = cursor_key or 'mentions'
             if max_id and not cursor:
-                cursor = self._get_cursor('mentions')
+                cursor = self._get_cursor(cursor_key)
 
-            params = models.AppBskyNotificationListNotifications.Params(
-                limit=min(limit, 100),
-                cursor=cursor
-            )
-            response = self.client.app.bsky.notification.list_notifications(params)
+            response = self._list_notifications('mentions', limit, cursor)
+            if response is None:
+                return []
 
-            # Store cursor for next pagination request
-            self._store_cursor('mentions', getattr(response, 'cursor', None))
+            # Store cursor for next pagination request (a refresh, probed or
+            # not, must not move "load previous" back to the newest items)
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
+            if not cursor:
+                self._mark_notifications_seen('mentions', response.notifications)
 
-            statuses = []
+            # Fetch the posts of mention, reply and quote notifications together
+            uris = [getattr(notif, 'uri', '') for notif in response.notifications
+                    if getattr(notif, 'reason', '') in ('mention', 'reply', 'quote')]
+            posts = self._fetch_posts(uris)
 
-            for notif in response.notifications:
-                reason = getattr(notif, 'reason', '')
-                if reason in ('mention', 'reply', 'quote'):
-                    # Get the post URI from the notification
-                    uri = getattr(notif, 'uri', '')
-                    if uri:
-                        try:
-                            # Fetch the actual post
-                            post_response = self.client.get_posts([uri])
-                            if post_response.posts:
-                                status = bluesky_post_to_universal(post_response.posts[0])
-                                if status:
-                                    status._notification_id = uri
-                                    statuses.append(status)
-                                    self.user_cache.add_users_from_status(status)
-                        except:
-                            pass
+            statuses = []
+            for uri in dict.fromkeys(u for u in uris if u):
+                status = posts.get(uri)
+                if status:
+                    status._notification_id = uri
+                    statuses.append(status)
+                    self.user_cache.add_users_from_status(status)
 
             return statuses
         except (AtProtocolError, InvokeTimeoutError) as e:
             self.app.handle_error(e, "mentions")
             return []
 
-    def get_notifications(self, limit: int = 40, cursor: str = None, max_id: str = None, **kwargs) -> List[UniversalNotification]:
+    def get_notifications(self, limit: int = 40, cursor: str = None, max_id: str = None, cursor_key: str = None, **kwargs) -> List[UniversalNotification]:
         """Get notifications."""
         try:
-            from atproto import models
-
             # For "load previous", use the stored cursor
+            cursor_key = cursor_key or 'notifications'
             if max_id and not cursor:
-                cursor = self._get_cursor('notifications')
+                cursor = self._get_cursor(cursor_key)
 
-            params = models.AppBskyNotificationListNotifications.Params(
-                limit=min(limit, 100),
-                cursor=cursor
-            )
-            response = self.client.app.bsky.notification.list_notifications(params)
+            response = self._list_notifications('notifications', limit, cursor)
+            if response is None:
+                return []
 
-            # Store cursor for next pagination request
-            self._store_cursor('notifications', getattr(response, 'cursor', None))
+            # Store cursor for next pagination request (a refresh, probed or
+            # not, must not move "load previous" back to the newest items)
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
+            if not cursor:
+                self._mark_notifications_seen('notifications', response.notifications)
 
             # Collect URIs for like/repost notifications that need post data
             uris_to_fetch = []
@@ -203,19 +343,8 @@ class BlueskyAccount(PlatformAccount):
                             notif_uri_map[reason_subject] = []
                         notif_uri_map[reason_subject].append(i)
 
-            # Batch fetch posts for like/repost notifications (max 25 per request)
-            fetched_posts = {}
-            for batch_start in range(0, len(uris_to_fetch), 25):
-                batch_uris = list(set(uris_to_fetch[batch_start:batch_start + 25]))
-                if batch_uris:
-                    try:
-                        posts_response = self.client.get_posts(batch_uris)
-                        for post in posts_response.posts:
-                            post_uri = getattr(post, 'uri', '')
-                            if post_uri:
-                                fetched_posts[post_uri] = bluesky_post_to_universal(post)
-                    except Exception:
-                        pass  # Continue even if batch fetch fails
+            # Batch fetch posts for like/repost notifications
+            fetched_posts = self._fetch_posts(uris_to_fetch)
 
             # Check if mentions should be included in notifications
             include_mentions = False
@@ -250,14 +379,15 @@ class BlueskyAccount(PlatformAccount):
         """Get direct message conversations - NOT SUPPORTED on Bluesky."""
         return []
 
-    def get_favourites(self, limit: int = 40, cursor: str = None, max_id: str = None, **kwargs) -> List[UniversalStatus]:
+    def get_favourites(self, limit: int = 40, cursor: str = None, max_id: str = None, cursor_key: str = None, **kwargs) -> List[UniversalStatus]:
         """Get liked posts."""
         try:
             from atproto import models
 
             # For "load previous", use the stored cursor
+            cursor_key = cursor_key or 'favourites'
             if max_id and not cursor:
-                cursor = self._get_cursor('favourites')
+                cursor = self._get_cursor(cursor_key)
 
             params = models.AppBskyFeedGetActorLikes.Params(
                 actor=self._me.id,
@@ -267,14 +397,14 @@ class BlueskyAccount(PlatformAccount):
             response = self.client.app.bsky.feed.get_actor_likes(params)
 
             # Store cursor for next pagination request
-            self._store_cursor('favourites', getattr(response, 'cursor', None))
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
 
             return self._convert_feed_posts(response.feed)
         except (AtProtocolError, InvokeTimeoutError) as e:
             self.app.handle_error(e, "favourites")
             return []
 
-    def get_user_statuses(self, user_id: str, limit: int = 40, cursor: str = None, max_id: str = None, filter: str = None, include_pins: bool = True, **kwargs) -> List[UniversalStatus]:
+    def get_user_statuses(self, user_id: str, limit: int = 40, cursor: str = None, max_id: str = None, filter: str = None, include_pins: bool = True, cursor_key: str = None, **kwargs) -> List[UniversalStatus]:
         """Get statuses from a specific user.
 
         Args:
@@ -288,7 +418,7 @@ class BlueskyAccount(PlatformAccount):
         """
         try:
             # For "load previous", use the stored cursor (keyed by user_id)
-            cursor_key = f'user_{user_id}'
+            cursor_key = cursor_key or f'user_{user_id}'
             if max_id and not cursor:
                 cursor = self._get_cursor(cursor_key)
 
@@ -315,7 +445,7 @@ class BlueskyAccount(PlatformAccount):
                 response = self.client.get_author_feed(**params)
 
             # Store cursor for next pagination request
-            self._store_cursor(cursor_key, getattr(response, 'cursor', None))
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
 
             return self._convert_feed_posts(response.feed)
         except (AtProtocolError, InvokeTimeoutError) as e:
@@ -326,13 +456,13 @@ class BlueskyAccount(PlatformAccount):
         """Get statuses from a list - NOT SUPPORTED on Bluesky."""
         return []
 
-    def get_feed_timeline(self, feed_uri: str, limit: int = 40, cursor: str = None, max_id: str = None, **kwargs) -> List[UniversalStatus]:
+    def get_feed_timeline(self, feed_uri: str, limit: int = 40, cursor: str = None, max_id: str = None, cursor_key: str = None, **kwargs) -> List[UniversalStatus]:
         """Get posts from a custom feed."""
         try:
             from atproto import models
 
             # For "load previous", use the stored cursor (keyed by feed)
-            cursor_key = f'feed_{feed_uri}'
+            cursor_key = cursor_key or f'feed_{feed_uri}'
             if max_id and not cursor:
                 cursor = self._get_cursor(cursor_key)
 
@@ -344,7 +474,7 @@ class BlueskyAccount(PlatformAccount):
             response = self.client.app.bsky.feed.get_feed(params)
 
             # Store cursor for next pagination request
-            self._store_cursor(cursor_key, getattr(response, 'cursor', None))
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
 
             return self._convert_feed_posts(response.feed)
         except (AtProtocolError, InvokeTimeoutError) as e:
@@ -353,6 +483,12 @@ class BlueskyAccount(PlatformAccount):
 
     def get_saved_feeds(self) -> List[dict]:
         """Get user's saved/pinned feeds."""
+        cache = http_cache.get_cache()
+        cache_key = f"bluesky:{self._me.id}:saved_feeds"
+        if cache is not None:
+            cached = cache.cached_value(cache_key)
+            if cached:
+                return cached
         try:
             from atproto import models
 
@@ -403,6 +539,8 @@ class BlueskyAccount(PlatformAccount):
             if not feeds:
                 return self.search_feeds("")
 
+            if cache is not None:
+                cache.store_value(cache_key, feeds, SAVED_FEEDS_TTL)
             return feeds
         except (AtProtocolError, InvokeTimeoutError) as e:
             self.app.handle_error(e, "get saved feeds")
@@ -436,13 +574,13 @@ class BlueskyAccount(PlatformAccount):
             self.app.handle_error(e, "search feeds")
             return []
 
-    def search_statuses(self, query: str, limit: int = 40, cursor: str = None, max_id: str = None, **kwargs) -> List[UniversalStatus]:
+    def search_statuses(self, query: str, limit: int = 40, cursor: str = None, max_id: str = None, cursor_key: str = None, **kwargs) -> List[UniversalStatus]:
         """Search for statuses."""
         try:
             from atproto import models
 
             # For "load previous", use the stored cursor (keyed by query)
-            cursor_key = f'search_{query}'
+            cursor_key = cursor_key or f'search_{query}'
             if max_id and not cursor:
                 cursor = self._get_cursor(cursor_key)
 
@@ -454,7 +592,7 @@ class BlueskyAccount(PlatformAccount):
             response = self.client.app.bsky.feed.search_posts(params)
 
             # Store cursor for next pagination request
-            self._store_cursor(cursor_key, getattr(response, 'cursor', None))
+            self._store_cursor(cursor_key, getattr(response, 'cursor', None), paging=bool(max_id))
 
             return self._convert_posts(response.posts)
         except (AtProtocolError, InvokeTimeoutError) as e:
@@ -850,6 +988,24 @@ class BlueskyAccount(PlatformAccount):
             self.app.handle_error(e, "get user")
             return None
 
+    def get_users(self, user_ids: List[str], quiet: bool = False) -> List[UniversalUser]:
+        """Get several users by DID or handle, 25 per request.
+
+        With quiet set, a failed request raises instead of being reported.
+        """
+        users = []
+        for start in range(0, len(user_ids), 25):
+            chunk = list(user_ids[start:start + 25])
+            try:
+                response = self.client.get_profiles(actors=chunk)
+            except (AtProtocolError, InvokeTimeoutError) as e:
+                if quiet:
+                    raise
+                self.app.handle_error(e, "get users")
+                continue
+            users.extend(self._convert_profiles(response.profiles))
+        return users
+
     def search_users(self, query: str, limit: int = 10) -> List[UniversalUser]:
         """Search for users."""
         try:
@@ -0,0 +1,394 @@
+"""Jetstream live-update consumer for Bluesky accounts.
+
+Jetstream re-publishes the AT Protocol firehose as plain JSON over a
+WebSocket and can filter it server-side by repository DID and collection.
+We subscribe to the DIDs the user follows plus their own DID, hydrate new
+post commits through the AppView with batched ``get_posts`` calls and hand
+the resulting UniversalStatus objects to a stream listener.
+
+The endpoint is configurable so the consumer can be pointed at a local
+stand-in server that replays canned Jetstream events.
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    websocket = None
+    WEBSOCKET_AVAILABLE = False
+
+from .models import bluesky_post_to_universal
+
+DEFAULT_JETSTREAM_URL = "wss://jetstream2.us-east.bsky.network/subscribe"
+
+POST_COLLECTION = 'app.bsky.feed.post'
+REPOST_COLLECTION = 'app.bsky.feed.repost'
+LIKE_COLLECTION = 'app.bsky.feed.like'
+FOLLOW_COLLECTION = 'app.bsky.graph.follow'
+WANTED_COLLECTIONS = [POST_COLLECTION, REPOST_COLLECTION, LIKE_COLLECTION, FOLLOW_COLLECTION]
+
+# Jetstream accepts at most 10,000 DIDs in a subscriber filter
+MAX_WANTED_DIDS = 10000
+# get_posts accepts at most 25 URIs per request
+HYDRATE_BATCH_SIZE = 25
+# Seconds to coalesce commits before hydrating (also gives the AppView time to index)
+HYDRATE_WINDOW = 1.0
+# Posts the AppView hasn't indexed yet are retried this many times
+HYDRATE_MAX_ATTEMPTS = 3
+# Delay before refreshing notifications after a commit that concerns us
+NOTIFY_DELAY = 3.0
+FOLLOWS_REFRESH_INTERVAL = 30 * 60
+PING_INTERVAL = 60
+# Rewind the replay cursor on reconnect so nothing is lost in the gap
+RECONNECT_REWIND_US = 5 * 1000 * 1000
+
+
+def _at_uri(did: str, collection: str, rkey: str) -> str:
+    return f"at://{did}/{collection}/{rkey}"
+
+
+def _uri_did(uri: str) -> str:
+    """Return the repository DID of an at:// URI."""
+    if not uri or not uri.startswith('at://'):
+        return ''
+    return uri[5:].split('/', 1)[0]
+
+
+def _record_mentions(record: dict, did: str) -> bool:
+    """Check whether a post record mentions, replies to or quotes the given DID."""
+    for facet in record.get('facets') or []:
+        for feature in facet.get('features') or []:
+            if feature.get('$type', '').endswith('#mention') and feature.get('did') == did:
+                return True
+    reply = record.get('reply') or {}
+    if _uri_did((reply.get('parent') or {}).get('uri', '')) == did:
+        return True
+    embed = record.get('embed') or {}
+    quoted = embed.get('record') or {}
+    # recordWithMedia nests the quoted record one level deeper
+    if 'record' in quoted:
+        quoted = quoted.get('record') or {}
+    if _uri_did(quoted.get('uri', '')) == did:
+        return True
+    return False
+
+
+class JetstreamClient:
+    """Consumes a Jetstream WebSocket for one Bluesky account.
+
+    The listener must provide ``on_update(status)``, ``on_mention(status)``,
+    ``on_delete(status_id)``, ``on_notifications_changed()`` and
+    ``on_abort(err)``. All callbacks are invoked from the consumer thread.
+
+    ``stats`` is an optional StreamStats object that receives connection,
+    event and drop counters.
+    """
+
+    def __init__(self, platform, listener, url: str = None, stats=None):
+        self.platform = platform
+        self.client = platform.client
+        self.listener = listener
+        self.url = url or DEFAULT_JETSTREAM_URL
+        self.stats = stats
+        self.my_did = str(platform.me.id)
+
+        self._stop = threading.Event()
+        self._ws = None
+        self._cursor = None  # time_us of the last processed event
+
+        # Followed DIDs and their profile views (used as repost "by" data)
+        self._follows: Dict[str, object] = {}
+        self._follows_refreshed = 0
+        self._follows_dirty = False
+
+        # Pending hydration: post URI -> attempts, repost URI -> (subject, reposter DID, created_at)
+        self._pending_posts: Dict[str, int] = {}
+        self._new_posts = set()
+        self._pending_mentions = set()
+        self._pending_reposts: Dict[str, tuple] = {}
+        self._flush_due = None
+        self._notify_due = None
+
+    # ============ Lifecycle ============
+
+    def run(self, keep_running: Callable[[], bool] = None):
+        """Connect and consume events until stopped. Blocks the calling thread."""
+        consecutive_errors = 0
+        base_delay = 5
+        max_delay = 300
+
+        while not self._stop.is_set() and (keep_running is None or keep_running()):
+            try:
+                if not self._follows or time.time() - self._follows_refreshed > FOLLOWS_REFRESH_INTERVAL:
+                    self._refresh_follows()
+                self._connect()
+                consecutive_errors = 0
+                if self.stats:
+                    self.stats.on_connect()
+                self._consume(keep_running)
+                if self.stats:
+                    self.stats.on_disconnect("stopped")
+            except Exception as e:
+                if self.stats:
+                    self.stats.on_disconnect(e)
+                if self._stop.is_set():
+                    break
+                consecutive_errors += 1
+                # Only report once reconnecting keeps failing; transient drops are silent
+                if consecutive_errors >= 5:
+                    self.listener.on_abort(e)
+                    consecutive_errors = 0
+                delay = min(base_delay * (2 ** max(consecutive_errors - 1, 0)), max_delay)
+                self._stop.wait(delay)
+            finally:
+                self._close_socket()
+
+    def stop(self):
+        """Stop consuming and close the socket."""
+        self._stop.set()
+        self._close_socket()
+
+    def _close_socket(self):
+        ws = self._ws
+        self._ws = None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def _connect(self):
+        """Open the WebSocket and send the subscriber filter."""
+        # requireHello holds the stream until our options_update arrives, which
+        # keeps large DID filters out of the URL
+        query = [('wantedCollections', c) for c in WANTED_COLLECTIONS]
+        query.append(('requireHello', 'true'))
+        if self._cursor:
+            query.append(('cursor', str(self._cursor - RECONNECT_REWIND_US)))
+        sep = '&' if '?' in self.url else '?'
+        url = self.url + sep + '&'.join(f"{k}={v}" for k, v in query)
+
+        self._ws = websocket.create_connection(url, timeout=30)
+        self._send_options()
+
+    def _send_options(self):
+        """Send (or resend) the DID/collection filter to the server."""
+        dids = [self.my_did] + [d for d in self._follows if d != self.my_did]
+        payload = {
+            'type': 'options_update',
+            'payload': {
+                'wantedCollections': WANTED_COLLECTIONS,
+                'wantedDids': dids[:MAX_WANTED_DIDS],
+                'maxMessageSizeBytes': 0,
+            },
+        }
+        self._ws.send(json.dumps(payload))
+        self._follows_dirty = False
+
+    def _refresh_follows(self):
+        """Fetch the full list of accounts the user follows."""
+        follows = {}
+        cursor = None
+        while len(follows) < MAX_WANTED_DIDS:
+            response = self.client.get_follows(actor=self.my_did, cursor=cursor, limit=100)
+            for profile in response.follows:
+                did = getattr(profile, 'did', None)
+                if did:
+                    follows[did] = profile
+            cursor = getattr(response, 'cursor', None)
+            if not cursor or not response.follows:
+                break
+        self._follows = follows
+        self._follows_refreshed = time.time()
+        self._follows_dirty = True
+
+    # ============ Event loop ============
+
+    def _consume(self, keep_running):
+        """Read events until the socket drops or we are stopped."""
+        self._ws.settimeout(HYDRATE_WINDOW)
+        last_ping = time.monotonic()
+
+        while not self._stop.is_set():
+            if keep_running is not None and not keep_running():
+                self._stop.set()
+                return
+            try:
+                raw = self._ws.recv()
+                if raw:
+                    self._handle_message(raw)
+            except websocket.WebSocketTimeoutException:
+                pass
+
+            now = time.monotonic()
+            if self._flush_due is not None and (now >= self._flush_due or len(self._pending_posts) >= HYDRATE_BATCH_SIZE):
+                self._flush()
+            if self._notify_due is not None and now >= self._notify_due:
+                self._notify_due = None
+                self.listener.on_notifications_changed()
+            if time.time() - self._follows_refreshed > FOLLOWS_REFRESH_INTERVAL:
+                self._refresh_follows()
+            if self._follows_dirty:
+                self._send_options()
+            if now - last_ping > PING_INTERVAL:
+                self._ws.ping()
+                last_ping = now
+
+    def _handle_message(self, raw):
+        """Handle one Jetstream event."""
+        parse_start = time.perf_counter()
+        try:
+            event = json.loads(raw)
+        except ValueError as e:
+            if self.stats:
+                self.stats.record_malformed(e)
+            return
+        if not isinstance(event, dict):
+            if self.stats:
+                self.stats.record_malformed("not an object")
+            return
+        if event.get('kind') != 'commit':
+            if self.stats:
+                self.stats.record_event(str(event.get('kind')), time.perf_counter() - parse_start)
+            return  # identity/account events are not interesting here
+
+        self._cursor = event.get('time_us') or self._cursor
+        did = event.get('did', '')
+        commit = event.get('commit') or {}
+        operation = commit.get('operation')
+        collection = commit.get('collection')
+        if self.stats:
+            self.stats.record_event(f"{collection} {operation}", time.perf_counter() - parse_start)
+        uri = _at_uri(did, collection, commit.get('rkey', ''))
+        record = commit.get('record') or {}
+
+        if collection == POST_COLLECTION:
+            if operation == 'create':
+                self._new_posts.add(uri)
+                self._queue_post(uri)
+                if did != self.my_did and _record_mentions(record, self.my_did):
+                    self._pending_mentions.add(uri)
+                    self._schedule_notify()
+            elif operation == 'delete':
+                self.listener.on_delete(uri)
+        elif collection == REPOST_COLLECTION and operation == 'create':
+            subject_uri = (record.get('subject') or {}).get('uri', '')
+            if subject_uri:
+                self._pending_reposts[uri] = (subject_uri, did, record.get('createdAt', ''))
+                self._queue_post(subject_uri)
+                if did != self.my_did and _uri_did(subject_uri) == self.my_did:
+                    self._schedule_notify()
+        elif collection == LIKE_COLLECTION and operation == 'create':
+            subject_uri = (record.get('subject') or {}).get('uri', '')
+            if did != self.my_did and _uri_did(subject_uri) == self.my_did:
+                self._schedule_notify()
+        elif collection == FOLLOW_COLLECTION:
+            if did == self.my_did:
+                # Our own follow graph changed; widen or re-fetch the filter
+                subject = record.get('subject')
+                if operation == 'create' and subject:
+                    self._follows.setdefault(subject, {'did': subject})
+                    self._follows_dirty = True
+                elif operation == 'delete':
+                    self._follows_refreshed = 0
+            elif operation == 'create' and record.get('subject') == self.my_did:
+                self._schedule_notify()
+
+    def _queue_post(self, uri: str):
+        if uri not in self._pending_posts:
+            self._pending_posts[uri] = 0
+        if self._flush_due is None:
+            self._flush_due = time.monotonic() + HYDRATE_WINDOW
+
+    def _schedule_notify(self):
+        if self._notify_due is None:
+            self._notify_due = time.monotonic() + NOTIFY_DELAY
+
+    # ============ Hydration ============
+
+    def _flush(self):
+        """Hydrate queued posts and dispatch them to the listener."""
+        self._flush_due = None
+        uris = list(self._pending_posts)
+        views = self._hydrate(uris)
+
+        # The AppView can lag Jetstream slightly; retry posts it hasn't indexed yet
+        retry = {}
+        for uri in uris:
+            if uri not in views:
+                attempts = self._pending_posts[uri] + 1
+                if attempts < HYDRATE_MAX_ATTEMPTS:
+                    retry[uri] = attempts
+        self._pending_posts = retry
+        if retry:
+            self._flush_due = time.monotonic() + HYDRATE_WINDOW
+
+        for uri in uris:
+            view = views.get(uri)
+            if view is not None and uri in self._new_posts:
+                self._new_posts.discard(uri)
+                self._dispatch_post(uri, view)
+            elif view is None and uri not in retry:
+                self._new_posts.discard(uri)
+                self._pending_mentions.discard(uri)
+                if self.stats:
+                    self.stats.record_dropped(POST_COLLECTION, "not indexed: " + uri)
+
+        for repost_uri, (subject_uri, reposter, created_at) in list(self._pending_reposts.items()):
+            view = views.get(subject_uri)
+            if view is None and subject_uri in retry:
+                continue
+            del self._pending_reposts[repost_uri]
+            if view is not None:
+                status = self._repost_to_universal(view, reposter, created_at)
+                if status:
+                    self.listener.on_update(status)
+
+    def _dispatch_post(self, uri: str, view):
+        status = bluesky_post_to_universal(view)
+        if status:
+            self.listener.on_update(status)
+        if uri in self._pending_mentions:
+            self._pending_mentions.discard(uri)
+            mention = bluesky_post_to_universal(view)
+            if mention:
+                mention._notification_id = uri
+                self.listener.on_mention(mention)
+
+    def _hydrate(self, uris: List[str]) -> Dict[str, object]:
+        """Fetch post views for URIs in batches of HYDRATE_BATCH_SIZE."""
+        views = {}
+        for start in range(0, len(uris), HYDRATE_BATCH_SIZE):
+            batch = uris[start:start + HYDRATE_BATCH_SIZE]
+            try:
+                response = self.client.get_posts(batch)
+            except Exception as e:
+                if self.stats:
+                    self.stats.record_dropped("get_posts", e)
+                continue
+            for post in response.posts:
+                post_uri = getattr(post, 'uri', '')
+                if post_uri:
+                    views[post_uri] = post
+        return views
+
+    def _repost_to_universal(self, view, reposter: str, created_at: str):
+        """Build a repost status in the same shape as a feed item with a repost reason."""
+        by = self._follows.get(reposter)
+        if by is None and reposter == self.my_did:
+            me = self.platform.me
+            by = {'did': me.id, 'handle': me.acct, 'display_name': me.display_name, 'avatar': me.avatar}
+        if by is None:
+            by = {'did': reposter, 'handle': reposter}
+        reason = SimpleNamespace(
+            py_type='app.bsky.feed.defs#reasonRepost',
+            by=by,
+            indexed_at=created_at,
+        )
+        return bluesky_post_to_universal(SimpleNamespace(post=view, reason=reason, reply=None))
@@ -101,6 +101,23 @@ def bluesky_profile_to_universal(profile, platform_data=None) -> Optional[Univer
     )
 
 
+# Profile fields kept on disk so an account can start before its profile is fetched
+PROFILE_CACHE_FIELDS = (
+    'did', 'handle', 'display_name', 'description', 'avatar', 'banner',
+    'followers_count', 'follows_count', 'posts_count', 'created_at',
+)
+
+
+def bluesky_profile_to_dict(profile) -> dict:
+    """JSON-friendly copy of a profile that bluesky_profile_to_universal accepts."""
+    data = {}
+    for name in PROFILE_CACHE_FIELDS:
+        value = get_attr(profile, name, None)
+        if value is not None:
+            data[name] = value if isinstance(value, (str, int, float, bool)) else str(value)
+    return data
+
+
 def bluesky_media_to_universal(embed_image) -> UniversalMedia:
     """Convert a Bluesky image embed to UniversalMedia."""
     return UniversalMedia(
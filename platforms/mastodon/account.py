@@ -1,9 +1,15 @@
 """Mastodon platform account implementation."""
 
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Optional, Any, Dict
-from mastodon import Mastodon, MastodonError
+from mastodon import Mastodon, MastodonError, MastodonNotFoundError, MastodonVersionError
 
 from version import APP_NAME, APP_VERSION
+import http_cache
+import http_client
+import single_flight
 from platforms.base import PlatformAccount
 from models import UniversalStatus, UniversalUser, UniversalNotification, UserCache
 from cache import TimelineCache
@@ -13,6 +19,17 @@ from .models import (
     mastodon_notification_to_universal,
 )
 
+# Unauthenticated remote-instance clients kept per account
+MAX_REMOTE_APIS = 16
+# Seconds a remote (instance, username) -> account ID lookup is reused (kept on disk)
+REMOTE_ID_TTL = 7 * 86400
+# Seconds a remote user's pinned posts are reused across initial loads
+REMOTE_PINS_TTL = 10 * 60
+# Remote users whose pinned posts are kept
+MAX_REMOTE_PINS = 64
+# Resolved remote status IDs kept in memory (the timeline cache keeps them on disk)
+MAX_REMOTE_STATUS_IDS = 5000
+
 
 class MastodonAccount(PlatformAccount):
     """Mastodon-specific account implementation."""
@@ -53,6 +70,12 @@ class MastodonAccount(PlatformAccount):
         except:
             self.default_visibility = 'public'
 
+        # Remote instance clients (LRU) and pinned posts of remote users
+        self._remote_lock = threading.Lock()
+        self._remote_apis = OrderedDict()
+        self._remote_pins = OrderedDict()  # (instance url, remote user id) -> (fetched_at, statuses), LRU
+        self._remote_status_ids = OrderedDict()  # remote post URL/URI -> local status ID
+
     @property
     def me(self) -> UniversalUser:
         return self._me
@@ -311,17 +334,87 @@ class MastodonAccount(PlatformAccount):
             instance_url = 'https://' + instance_url
         instance_url = instance_url.rstrip('/')
 
-        # Get the account wrapper to access remote_apis
-        account = self.app.currentAccount
+        with self._remote_lock:
+            remote_api = self._remote_apis.get(instance_url)
+            if remote_api is not None:
+                self._remote_apis.move_to_end(instance_url)
+                return remote_api
+
+            # Create new unauthenticated client
+            remote_api = Mastodon(api_base_url=instance_url, user_agent=f"{APP_NAME}/{APP_VERSION}", session=http_client.get_session())
+            self._remote_apis[instance_url] = remote_api
+            while len(self._remote_apis) > MAX_REMOTE_APIS:
+                self._remote_apis.popitem(last=False)
+            return remote_api
 
-        # Check if we already have this API
-        if instance_url in account.remote_apis:
-            return account.remote_apis[instance_url]
+    def _remote_id_key(self, instance_url: str, username: str) -> str:
+        instance = instance_url.lower().split('://', 1)[-1].rstrip('/')
+        return f"remote_account:{instance}:{username.lstrip('@').lower()}"
 
-        # Create new unauthenticated client
-        remote_api = Mastodon(api_base_url=instance_url, user_agent=f"{APP_NAME}/{APP_VERSION}")
-        account.remote_apis[instance_url] = remote_api
-        return remote_api
+    def _find_remote_user(self, remote_api: Mastodon, username: str):
+        """Look up a user on a remote instance by username.
+
+        Returns (user, exact); exact is False when the user is only the best
+        search result rather than the account with that name.
+        """
+        # Try account_lookup first (works without auth), fall back to search
+        try:
+            remote_user = remote_api.account_lookup(username)
+            if remote_user:
+                return remote_user, True
+        except Exception:
+            pass
+
+        # Fall back to search
+        try:
+            results = remote_api.account_search(username, limit=5)
+            if results:
+                for user in results:
+                    if user.acct.lower() == username.lower() or user.username.lower() == username.lower():
+                        return user, True
+                return results[0], False
+        except Exception:
+            pass
+        return None, False
+
+    def get_remote_user_id(self, instance_url: str, username: str, refresh: bool = False) -> Optional[str]:
+        """ID of a user on a remote instance, from the lookup cache when possible."""
+        cache = http_cache.get_cache()
+        key = self._remote_id_key(instance_url, username)
+        if cache is not None and not refresh:
+            remote_id = cache.cached_value(key)
+            if remote_id:
+                return str(remote_id)
+        remote_user, exact = self._find_remote_user(self.get_or_create_remote_api(instance_url), username)
+        if not remote_user:
+            return None
+        remote_id = str(remote_user.id)
+        # A fuzzy search match is used this once but not remembered
+        if cache is not None and exact:
+            cache.store_value(key, remote_id, REMOTE_ID_TTL)
+        return remote_id
+
+    def _get_remote_pins(self, remote_api: Mastodon, instance_url: str, remote_id: str) -> List[UniversalStatus]:
+        """Pinned posts of a remote user, reused for a few minutes."""
+        key = (instance_url.rstrip('/'), remote_id)
+        with self._remote_lock:
+            entry = self._remote_pins.get(key)
+            if entry is not None:
+                self._remote_pins.move_to_end(key)
+        if entry is not None and time.time() - entry[0] < REMOTE_PINS_TTL:
+            return list(entry[1])
+        try:
+            pinned = self._convert_statuses(remote_api.account_statuses(remote_id, pinned=True, limit=20))
+        except Exception:
+            pinned = []  # Pinned posts may not be available
+        for status in pinned:
+            status._pinned = True
+        with self._remote_lock:
+            self._remote_pins[key] = (time.time(), pinned)
+            self._remote_pins.move_to_end(key)
+            while len(self._remote_pins) > MAX_REMOTE_PINS:
+                self._remote_pins.popitem(last=False)
+        return list(pinned)
 
     def get_instance_timeline(self, instance_url: str, limit: int = 40, **kwargs) -> List[UniversalStatus]:
         """Fetch local timeline from a remote instance.
@@ -396,29 +489,9 @@ class MastodonAccount(PlatformAccount):
         try:
             remote_api = self.get_or_create_remote_api(instance_url)
 
-            # Look up the user on the remote instance
-            # Try account_lookup first (works without auth), fall back to search
-            remote_user = None
-            try:
-                remote_user = remote_api.account_lookup(username)
-            except Exception:
-                pass
-
-            if not remote_user:
-                # Fall back to search
-                try:
-                    results = remote_api.account_search(username, limit=5)
-                    if results:
-                        for user in results:
-                            if user.acct.lower() == username.lower() or user.username.lower() == username.lower():
-                                remote_user = user
-                                break
-                        if not remote_user:
-                            remote_user = results[0]
-                except Exception:
-                    pass
-
-            if not remote_user:
+            # Resolve the username once; the ID is cached on disk
+            remote_id = self.get_remote_user_id(instance_url, username)
+            if not remote_id:
                 return []
 
             # Map filter to Mastodon API parameters
@@ -430,22 +503,22 @@ class MastodonAccount(PlatformAccount):
             elif filter == 'posts_no_boosts':
                 api_kwargs['exclude_reblogs'] = True
 
+            # Get the user's statuses
+            try:
+                statuses = remote_api.account_statuses(remote_id, limit=limit, **api_kwargs)
+            except MastodonNotFoundError:
+                # Cached ID is stale (account moved or instance reset); look it up again
+                remote_id = self.get_remote_user_id(instance_url, username, refresh=True)
+                if not remote_id:
+                    return []
+                statuses = remote_api.account_statuses(remote_id, limit=limit, **api_kwargs)
+            regular_result = self._convert_statuses(statuses)
+
             result = []
 
-            # First fetch pinned posts if requested and this is the initial load
+            # Pinned posts go at the top of the initial load
             if include_pins and 'max_id' not in kwargs and 'since_id' not in kwargs:
-                try:
-                    pinned_statuses = remote_api.account_statuses(remote_user.id, pinned=True, limit=20)
-                    pinned_result = self._convert_statuses(pinned_statuses)
-                    for status in pinned_result:
-                        status._pinned = True
-                    result.extend(pinned_result)
-                except:
-                    pass  # Pinned posts may not be available
-
-            # Get the user's statuses
-            statuses = remote_api.account_statuses(remote_user.id, limit=limit, **api_kwargs)
-            regular_result = self._convert_statuses(statuses)
+                result.extend(self._get_remote_pins(remote_api, instance_url, remote_id))
 
             # Remove duplicates (pinned posts may also appear in regular timeline)
             if result:
@@ -488,36 +561,19 @@ class MastodonAccount(PlatformAccount):
         except Exception:
             return []
 
-    def resolve_remote_status(self, status) -> str:
-        """Convert a remote instance status to a local status ID for interactions.
-
-        When you view a post from a remote instance timeline, the ID is local to
-        that instance. To interact with it (boost, favourite, reply), you need
-        the ID as known by your own instance. This method uses the search API
-        to resolve the remote URL to a local status.
-
-        Args:
-            status: The status object (must have _instance_url attribute or url)
-
-        Returns:
-            The local status ID for use in API calls
-        """
-        # If no instance URL marker, it's already local
-        if not hasattr(status, '_instance_url'):
-            return status.id
-
-        # Try multiple URL formats to find the post
-        urls_to_try = []
+    def _remote_status_keys(self, status) -> List[str]:
+        """URLs and URIs identifying a remote post, most reliable first."""
+        keys = []
 
         # First try the URL from the status (most reliable)
         remote_url = getattr(status, 'url', None)
         if remote_url and remote_url.strip():
-            urls_to_try.append(remote_url)
+            keys.append(remote_url)
 
         # Try the URI (ActivityPub identifier)
         uri = getattr(status, 'uri', None)
-        if uri and uri.strip() and uri not in urls_to_try:
-            urls_to_try.append(uri)
+        if uri and uri.strip() and uri not in keys:
+            keys.append(uri)
 
         # Construct URL as fallback
         instance_url = status._instance_url
@@ -525,20 +581,53 @@ class MastodonAccount(PlatformAccount):
         if acct and not '@' in acct:
             # Local user on remote instance - construct full URL
             constructed_url = f"{instance_url}/@{acct}/{status.id}"
-            if constructed_url not in urls_to_try:
-                urls_to_try.append(constructed_url)
+            if constructed_url not in keys:
+                keys.append(constructed_url)
+        return keys
+
+    def _remember_remote_status_id(self, keys: List[str], local_id: str):
+        with self._remote_lock:
+            for key in keys:
+                self._remote_status_ids[key] = local_id
+                self._remote_status_ids.move_to_end(key)
+            while len(self._remote_status_ids) > MAX_REMOTE_STATUS_IDS:
+                self._remote_status_ids.popitem(last=False)
+        if self.timeline_cache:
+            self.timeline_cache.save_remote_status_id(keys, local_id)
 
-        for search_url in urls_to_try:
+    def cached_remote_status_id(self, status) -> Optional[str]:
+        """Local ID of a remote post if it was resolved before, without asking the server."""
+        if not hasattr(status, '_instance_url'):
+            return None
+        if hasattr(status, '_resolved_id'):
+            return status._resolved_id
+        keys = self._remote_status_keys(status)
+        local_id = None
+        with self._remote_lock:
+            for key in keys:
+                local_id = self._remote_status_ids.get(key)
+                if local_id:
+                    break
+        if not local_id and self.timeline_cache:
+            local_id = self.timeline_cache.get_remote_status_id(keys)
+            if local_id:
+                with self._remote_lock:
+                    for key in keys:
+                        self._remote_status_ids[key] = local_id
+        if local_id:
+            status._resolved_id = local_id
+        return local_id
+
+    def _search_remote_status(self, keys: List[str]) -> Optional[str]:
+        for search_url in keys:
             try:
                 # Use search with resolve=True to fetch the status into our instance
                 result = self.api.search_v2(q=search_url, resolve=True, result_type='statuses')
                 statuses = result.statuses if hasattr(result, 'statuses') else result.get('statuses', [])
 
                 if statuses and len(statuses) > 0:
-                    # Return the local ID
                     local_id = str(statuses[0].id)
-                    # Cache the resolved ID on the status for future use
-                    status._resolved_id = local_id
+                    self._remember_remote_status_id(keys, local_id)
                     return local_id
             except MastodonError as e:
                 print(f"Search failed for {search_url}: {e}")
@@ -546,6 +635,41 @@ class MastodonAccount(PlatformAccount):
             except Exception as e:
                 print(f"Search error for {search_url}: {e}")
                 continue
+        return None
+
+    def resolve_remote_status(self, status) -> str:
+        """Convert a remote instance status to a local status ID for interactions.
+
+        When you view a post from a remote instance timeline, the ID is local to
+        that instance. To interact with it (boost, favourite, reply), you need
+        the ID as known by your own instance. This method uses the search API
+        to resolve the remote URL to a local status. Resolved IDs are kept in
+        the timeline cache, so each post is only searched for once.
+
+        Args:
+            status: The status object (must have _instance_url attribute or url)
+
+        Returns:
+            The local status ID for use in API calls
+        """
+        # If no instance URL marker, it's already local
+        if not hasattr(status, '_instance_url'):
+            return status.id
+
+        local_id = self.cached_remote_status_id(status)
+        if local_id:
+            return local_id
+
+        # Try multiple URL formats to find the post; a background resolve of the same post is shared
+        urls_to_try = self._remote_status_keys(status)
+        local_id = single_flight.call(
+            (self, 'resolve_remote_status', tuple(urls_to_try)),
+            lambda: self._search_remote_status(urls_to_try)
+        )
+        if local_id:
+            # Cache the resolved ID on the status for future use
+            status._resolved_id = local_id
+            return local_id
 
         # Fallback to original ID (will likely fail on interaction)
         print(f"Could not resolve status. Tried URLs: {urls_to_try}")
@@ -773,6 +897,22 @@ class MastodonAccount(PlatformAccount):
         except MastodonError:
             return None
 
+    def get_users(self, user_ids: List[str], quiet: bool = False) -> List[UniversalUser]:
+        """Get several users by ID, 40 per request."""
+        users = []
+        for start in range(0, len(user_ids), 40):
+            chunk = list(user_ids[start:start + 40])
+            try:
+                accounts = self.api.accounts(chunk)
+            except (MastodonNotFoundError, MastodonVersionError):
+                # Servers before 4.3 have no batch endpoint; other errors are the caller's
+                users.extend(super().get_users(chunk))
+                continue
+            for user in self._convert_users(accounts):
+                self.user_cache.add_user(user)
+                users.append(user)
+        return users
+
     def search_users(self, query: str, limit: int = 10) -> List[UniversalUser]:
         """Search for users."""
         results = self.api.account_search(q=query, limit=limit)
@@ -2,9 +2,7 @@
 
 from datetime import datetime
 from typing import Optional, List, Any
-import html
-import re
-
+import html_text
 from models import (
     UniversalStatus,
     UniversalUser,
@@ -13,10 +11,6 @@ from models import (
     UniversalMention,
 )
 
-# HTML tag pattern for stripping
-_html_tag_re = re.compile(r'<[^>]+>')
-
-
 def parse_datetime(value):
     """Parse a datetime from various formats (string or datetime object)."""
     if value is None:
@@ -43,16 +37,7 @@ def parse_datetime(value):
 
 def strip_html(text: str) -> str:
     """Strip HTML tags and decode entities, preserving spacing for block elements."""
-    # Add spaces for block elements and line breaks to prevent text concatenation
-    # Note: Don't add spaces for inline elements like <span> - Mastodon uses spans
-    # within URLs (e.g., <span class="invisible">https://</span>) and adding spaces
-    # would break the URL (causing "https:// example.com" instead of "https://example.com")
-    text = re.sub(r'</(p|div)>', ' ', text, flags=re.IGNORECASE)
-    text = re.sub(r'<br\s*/?>', ' ', text, flags=re.IGNORECASE)
-    text = _html_tag_re.sub('', text)
-    text = html.unescape(text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return html_text.strip_html(text)
 
 
 def mastodon_user_to_universal(user, platform_data=None) -> Optional[UniversalUser]:
@@ -160,9 +145,12 @@ def mastodon_status_to_universal(status, platform_data=None) -> Optional[Univers
         if mastodon_text and isinstance(mastodon_text, str) and mastodon_text.strip():
             text = mastodon_text
 
+    # Text, links and mention spans are extracted once and kept on the status
+    converted = html_text.convert(content)
+
     # Fallback: strip HTML from content
     if not text:
-        text = strip_html(content)
+        text = converted.text
 
     # Convert account
     account = mastodon_user_to_universal(get_attr(status, 'account', None))
@@ -196,7 +184,7 @@ def mastodon_status_to_universal(status, platform_data=None) -> Optional[Univers
     for mention in get_attr(status, 'mentions', []):
         mentions.append(mastodon_mention_to_universal(mention))
 
-    return UniversalStatus(
+    uni_status = UniversalStatus(
         id=str(get_attr(status, 'id', '')),
         account=account,
         content=content,
@@ -221,6 +209,8 @@ def mastodon_status_to_universal(status, platform_data=None) -> Optional[Univers
         _platform_data=platform_data or status,
         _platform='mastodon',
     )
+    uni_status._html = converted
+    return uni_status
 
 
 def mastodon_notification_to_universal(notification) -> Optional[UniversalNotification]:
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Background resolution of remote posts to local IDs.
+
+Posts in instance and remote-user timelines carry IDs from another server.
+Boosting, favouriting or replying needs the post's ID on the account's own
+instance, which takes a slow federated search. request_around() queues the
+posts around the selection and a worker resolves them one at a time, most
+recently requested first, so the ID is usually known before the user acts.
+Resolved IDs are stored by the platform's resolve_remote_status. Posts that
+could not be resolved are not queued again for a while, since each attempt
+costs the home server several federated fetches.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Posts queued around the selection (before, after)
+BEHIND = 1
+AHEAD = 5
+# Older queued posts are dropped beyond this; the user has moved on
+MAX_PENDING = 20
+# Seconds a post that could not be resolved is left alone
+FAILED_RETRY_AFTER = 10 * 60
+MAX_FAILED = 1000
+
+
+def _interaction_status(status):
+	"""The post an interaction acts on (the boosted post for boosts)."""
+	return status.reblog if getattr(status, 'reblog', None) else status
+
+
+def _key(status):
+	return getattr(status, 'url', None) or (status._instance_url, str(status.id))
+
+
+class RemoteResolver(object):
+	"""Resolves remote posts for one account."""
+
+	def __init__(self, account):
+		self.account = account
+		self._cond = threading.Condition()
+		self._pending = OrderedDict()  # key -> status, most recent last
+		self._failed = {}  # key -> time the resolve failed
+		self._worker = None
+		self.resolved = 0
+		self.failed = 0
+
+	def request(self, statuses):
+		"""Queue remote posts for resolution. The last one given is resolved first."""
+		with self._cond:
+			for status in statuses:
+				status = _interaction_status(status)
+				if not hasattr(status, '_instance_url') or hasattr(status, '_resolved_id'):
+					continue
+				key = _key(status)
+				failed_at = self._failed.get(key)
+				if failed_at is not None:
+					if time.time() - failed_at < FAILED_RETRY_AFTER:
+						continue
+					del self._failed[key]
+				self._pending.pop(key, None)
+				self._pending[key] = status
+			if not self._pending:
+				return
+			while len(self._pending) > MAX_PENDING:
+				self._pending.popitem(last=False)
+			if self._worker is None or not self._worker.is_alive():
+				self._worker = threading.Thread(target=self._run, daemon=True)
+				self._worker.start()
+			self._cond.notify()
+
+	def _run(self):
+		platform = getattr(self.account, '_platform', None)
+		while True:
+			with self._cond:
+				if not self._pending or platform is None:
+					# Let the thread end; request() starts a new one
+					self._pending.clear()
+					self._worker = None
+					return
+				key, status = self._pending.popitem(last=True)
+			ok = True
+			try:
+				if platform.cached_remote_status_id(status) is None:
+					# resolve_remote_status falls back to the remote ID when nothing is found
+					ok = str(platform.resolve_remote_status(status)) != str(status.id)
+					if ok:
+						self.resolved += 1
+			except Exception as e:
+				print(f"Remote post resolve failed: {e}")
+				ok = False
+			if not ok:
+				self._record_failure(key)
+
+	def _record_failure(self, key):
+		with self._cond:
+			self.failed += 1
+			if len(self._failed) >= MAX_FAILED:
+				now = time.time()
+				for old in [k for k, at in self._failed.items() if now - at >= FAILED_RETRY_AFTER]:
+					del self._failed[old]
+				if len(self._failed) >= MAX_FAILED:
+					self._failed.clear()
+			self._failed[key] = time.time()
+
+
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(account):
+	"""The account's remote post resolver."""
+	resolver = getattr(account, '_remote_resolver', None)
+	if resolver is None:
+		with _resolvers_lock:
+			resolver = getattr(account, '_remote_resolver', None)
+			if resolver is None:
+				resolver = RemoteResolver(account)
+				account._remote_resolver = resolver
+	return resolver
+
+
+def request_around(account, statuses, index):
+	"""Resolve the remote posts near index in the background, the one at index first."""
+	platform = getattr(account, '_platform', None)
+	if platform is None or not hasattr(platform, 'cached_remote_status_id'):
+		return
+	if not statuses or not 0 <= index < len(statuses):
+		return
+	if not hasattr(_interaction_status(statuses[index]), '_instance_url'):
+		return
+	# Queued in reverse priority: selected post, then the ones after it, then the one before
+	nearby = statuses[max(0, index - BEHIND):index] + statuses[index + 1:index + 1 + AHEAD][::-1] + [statuses[index]]
+	get_resolver(account).request(nearby)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Memoized display strings for timeline items.
+
+Rendered strings are keyed on the item's identity and render version, a
+fingerprint of every display preference, and the account's alias version.
+A change to any of those produces a different key, so stale strings are
+never returned; old entries simply age out of the bounded LRU.
+
+- Mutating an item in place (favourited, poll votes, edits): mark_changed(item)
+- Changing aliases for an account: bump_aliases(account)
+- Changing display prefs: bump_generation() (the fingerprint also catches
+  prefs changed without an explicit bump)
+
+submit() runs rendering jobs on a single background worker so streamed
+items reach the UI thread with their strings already in the cache. warm()
+queues cache warm-up behind them, so it only runs while nothing else waits.
+"""
+import itertools
+import queue
+import threading
+from collections import OrderedDict
+
+import date_format
+
+DEFAULT_MAX_SIZE = 5000
+
+# Preferences that affect how items are rendered
+DISPLAY_PREFS = (
+	'postTemplate', 'conversationTemplate', 'boostTemplate', 'quoteTemplate',
+	'notificationTemplate', 'messageTemplate', 'cw_mode', 'demojify',
+	'demojify_post', 'use24HourTime', 'include_media_descriptions',
+	'include_link_preview', 'max_usernames_display', 'relative_times',
+)
+
+
+class RenderCache(object):
+	"""Bounded LRU of rendered display strings. Safe to use from any thread."""
+
+	def __init__(self, max_size=DEFAULT_MAX_SIZE):
+		self.max_size = max_size
+		self._entries = OrderedDict()  # key -> (item, text)
+		self._lock = threading.Lock()
+		self.generation = 0
+		self.changes = 0  # bumped whenever any item is marked changed
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def fingerprint(self, app):
+		"""Fingerprint of the current display prefs; compute once per batch of renders."""
+		prefs = app.prefs
+		# Relative times ("5m ago") change once a minute, invalidating all renders together
+		clock = date_format.get_formatter().epoch if getattr(prefs, 'relative_times', False) else None
+		return (self.generation, clock) + tuple(getattr(prefs, name, None) for name in DISPLAY_PREFS)
+
+	def list_state(self, app, account):
+		"""State a cached list of display strings is valid for."""
+		return (self.fingerprint(app), getattr(account, 'alias_version', 0), self.changes)
+
+	def _key(self, item, kind, account, fingerprint):
+		return (id(item), getattr(item, '_render_version', 0), kind, fingerprint, getattr(account, 'alias_version', 0))
+
+	def get(self, item, kind, account, fingerprint):
+		key = self._key(item, kind, account, fingerprint)
+		with self._lock:
+			entry = self._entries.get(key)
+			# The entry holds a reference to the item, so its id can't be reused while cached
+			if entry is not None and entry[0] is item:
+				self._entries.move_to_end(key)
+				self.hits += 1
+				return entry[1]
+			self.misses += 1
+			return None
+
+	def put(self, item, kind, account, fingerprint, text):
+		key = self._key(item, kind, account, fingerprint)
+		with self._lock:
+			self._entries[key] = (item, text)
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.max_size:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+
+	def render(self, item, kind, account, fingerprint, render_func):
+		"""Return the cached string for an item, rendering it on a miss."""
+		text = self.get(item, kind, account, fingerprint)
+		if text is None:
+			text = render_func(item)
+			self.put(item, kind, account, fingerprint, text)
+		return text
+
+	def bump_generation(self):
+		"""Invalidate everything (display prefs changed)."""
+		with self._lock:
+			self.generation += 1
+			self._entries.clear()
+
+	def mark_changed(self, item):
+		"""Note that an item was mutated in place and must be re-rendered."""
+		try:
+			item._render_version = getattr(item, '_render_version', 0) + 1
+		except (AttributeError, TypeError):
+			pass
+		with self._lock:
+			self.changes += 1
+
+	def stats(self):
+		with self._lock:
+			total = self.hits + self.misses
+			return {
+				'size': len(self._entries),
+				'max_size': self.max_size,
+				'generation': self.generation,
+				'hits': self.hits,
+				'misses': self.misses,
+				'evictions': self.evictions,
+				'hit_rate': (self.hits / float(total)) if total else 0.0,
+			}
+
+
+_cache = RenderCache()
+
+
+def get_cache():
+	return _cache
+
+
+def bump_generation():
+	_cache.bump_generation()
+
+
+def mark_changed(item):
+	_cache.mark_changed(item)
+
+
+def bump_aliases(account):
+	"""Invalidate renders for an account after its aliases changed."""
+	account.alias_version = getattr(account, 'alias_version', 0) + 1
+
+
+# Job priorities; lower runs first
+PRIORITY_NORMAL = 0
+PRIORITY_WARM = 1
+
+_render_queue = queue.PriorityQueue()
+_sequence = itertools.count()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def submit(job, callback=None, priority=PRIORITY_NORMAL):
+	"""Run job on the render worker, then callback (also on the worker).
+
+	Jobs of the same priority run in submission order, so callbacks that
+	hand items to the UI (via wx.CallAfter) keep their original order.
+	"""
+	global _worker
+	with _worker_lock:
+		if _worker is None or not _worker.is_alive():
+			_worker = threading.Thread(target=_worker_loop, daemon=True)
+			_worker.start()
+	_render_queue.put((priority, next(_sequence), job, callback))
+
+
+def warm(job):
+	"""Run a cache warm-up job once no streamed or visible work is waiting."""
+	submit(job, priority=PRIORITY_WARM)
+
+
+def _worker_loop():
+	while True:
+		_priority, _seq, job, callback = _render_queue.get()
+		try:
+			job()
+		except Exception as e:
+			print(f"Render job failed: {e}")
+		if callback is not None:
+			try:
+				callback()
+			except Exception as e:
+				print(f"Render callback failed: {e}")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Deduplication of identical API calls.
+
+call(key, func) runs func once for any number of threads asking for the
+same key at the same time: the first caller makes the request and the rest
+wait for its result (or its exception). A successful result is also kept
+for a few seconds, so a burst of repeats (speaking a reply right after
+loading its conversation, opening a profile that was just spoken) doesn't
+go to the network again.
+
+Keys should identify the account, the endpoint and its parameters, e.g.
+(account, 'status', status_id). Anything that changes a resource must
+forget() its key, or the next lookup returns it as it was before the change
+(Application.forget_status for statuses; relationships.forget drops users).
+"""
+import threading
+import time
+
+# Seconds a successful result is reused
+MEMO_TTL = 5.0
+# Memo size at which expired entries are swept
+MAX_MEMO = 1000
+
+
+class _Flight(object):
+	__slots__ = ('done', 'result', 'error')
+
+	def __init__(self):
+		self.done = threading.Event()
+		self.result = None
+		self.error = None
+
+
+class SingleFlight(object):
+	"""Shares in-flight calls and their recent results between threads."""
+
+	def __init__(self, ttl=MEMO_TTL):
+		self.ttl = ttl
+		self._lock = threading.Lock()
+		self._flights = {}
+		self._memo = {}  # key -> (expires_at, result)
+		self.shared = 0
+		self.memo_hits = 0
+		self.calls = 0
+
+	def call(self, key, func, ttl=None):
+		"""Return func(), sharing the call with concurrent callers for the same key."""
+		if ttl is None:
+			ttl = self.ttl
+		with self._lock:
+			entry = self._memo.get(key)
+			if entry is not None:
+				if entry[0] > time.time():
+					self.memo_hits += 1
+					return entry[1]
+				del self._memo[key]
+			flight = self._flights.get(key)
+			leader = flight is None
+			if leader:
+				flight = _Flight()
+				self._flights[key] = flight
+				self.calls += 1
+			else:
+				self.shared += 1
+		if not leader:
+			flight.done.wait()
+			if flight.error is not None:
+				raise flight.error
+			return flight.result
+		try:
+			flight.result = func()
+		except BaseException as e:
+			flight.error = e
+			raise
+		finally:
+			with self._lock:
+				del self._flights[key]
+				# Empty results aren't remembered; the next caller asks again
+				if flight.error is None and flight.result is not None and ttl > 0:
+					if len(self._memo) >= MAX_MEMO:
+						self._sweep()
+					self._memo[key] = (time.time() + ttl, flight.result)
+			flight.done.set()
+		return flight.result
+
+	def _sweep(self):
+		now = time.time()
+		for key in [key for key, entry in self._memo.items() if entry[0] <= now]:
+			del self._memo[key]
+		if len(self._memo) >= MAX_MEMO:
+			self._memo.clear()
+
+	def forget(self, key):
+		"""Drop a remembered result (after changing the resource)."""
+		with self._lock:
+			self._memo.pop(key, None)
+
+	def stats(self):
+		with self._lock:
+			return {'calls': self.calls, 'shared': self.shared, 'memo_hits': self.memo_hits, 'in_flight': len(self._flights)}
+
+
+_flights = SingleFlight()
+
+
+def get_flights():
+	return _flights
+
+
+def call(key, func, ttl=None):
+	return _flights.call(key, func, ttl)
+
+
+def forget(key):
+	_flights.forget(key)
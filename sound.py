@@ -1,9 +1,15 @@
+import io
 import os
 import sys
 import speak
 import re
 import shutil
 import subprocess
+import functools
+import threading
+import time
+import queue
+import sound_bank
 
 try:
 	import sound_lib
@@ -25,6 +31,15 @@ except Exception:
 
 _pygame_ready = False
 
+# Fixed number of voices for UI sounds; the oldest is stopped to make room
+MAX_VOICES = 8
+# Voices any single sound may use at once
+MAX_VOICES_PER_SOUND = 2
+# Repeats of the same sound within this many seconds are dropped
+DEBOUNCE = 0.3
+# Queued sounds older than this are no longer relevant
+SOUND_STALE_AFTER = 2.0
+
 
 def _ensure_pygame_audio():
 	"""Initialize pygame mixer lazily for Linux fallback audio."""
@@ -34,6 +49,7 @@ def _ensure_pygame_audio():
 	try:
 		if not pygame.mixer.get_init():
 			pygame.mixer.init()
+		pygame.mixer.set_num_channels(MAX_VOICES)
 		_pygame_ready = True
 	except Exception:
 		_pygame_ready = False
@@ -184,6 +200,7 @@ YTDLP_PATH = _find_ytdlp_executable()
 
 out = None  # Will be initialized with selected device
 handles = []  # List of active UI sound handles for concurrent playback
+_handles_lock = threading.RLock()  # Guards handles; sounds play on the dispatcher thread
 _external_ui_sound_procs = []  # External process fallback for UI sounds
 player = None  # Media player for URL streams (VLC or sound_lib)
 player_type = None  # 'vlc', 'soundlib', or 'external'
@@ -399,22 +416,56 @@ ytdlp_matchlist = [
 	{"match": r"https?://(www\.)?(youtube\.com|youtu\.be)/.+", "func":return_url},
 ]
 
+_url_matcher = None
+
+def _get_url_matcher():
+	"""One compiled pattern for both match lists; the matching group identifies the service.
+
+	Standard media services come first so they win over yt-dlp ones, as before.
+	"""
+	global _url_matcher
+	if _url_matcher is None:
+		services = [(service, False) for service in media_matchlist] + [(service, True) for service in ytdlp_matchlist]
+		pattern = "|".join(f"(?P<s{i}>{service['match']})" for i, (service, _) in enumerate(services))
+		_url_matcher = (re.compile(pattern, re.IGNORECASE), services)
+	return _url_matcher
+
+@functools.lru_cache(maxsize=4096)
+def _classify_url(url):
+	"""Index of the service a URL matches, or None."""
+	pattern, services = _get_url_matcher()
+	match = pattern.match(url)
+	if match is None:
+		return None
+	# The service group encloses any groups of its own, so it is always the last one closed
+	return int(match.lastgroup[1:])
+
 def get_media_urls(urls):
 	result = []
+	_, services = _get_url_matcher()
 	for u in urls:
-		# Check standard media URLs (work with both VLC and sound_lib)
-		for service in media_matchlist:
-			if re.match(service['match'], u.lower()) != None:
-				result.append({"url":u, "func":service['func']})
-				break
+		index = _classify_url(u)
+		if index is None:
+			continue
+		service, needs_ytdlp = services[index]
+		if needs_ytdlp:
+			# yt-dlp URLs (YouTube, etc.) work with both VLC and sound_lib; prefer VLC if available
+			result.append({"url":u, "func":service['func'], "vlc_only": VLC_AVAILABLE})
 		else:
-			# Check yt-dlp supported URLs (YouTube, etc.)
-			# These work with both VLC and sound_lib via yt-dlp stream extraction
-			for service in ytdlp_matchlist:
-				if re.match(service['match'], u.lower()) != None:
-					# Prefer VLC if available, but sound_lib works too
-					result.append({"url":u, "func":service['func'], "vlc_only": VLC_AVAILABLE})
-					break
+			result.append({"url":u, "func":service['func']})
+	return result
+
+def get_status_media_urls(app, status):
+	"""Media URLs of a status, classified once and kept on the status until it changes."""
+	version = getattr(status, '_render_version', 0)
+	cached = getattr(status, '_media_urls', None)
+	if cached is not None and cached[0] == version:
+		return cached[1]
+	result = get_media_urls(app.find_urls_in_status(status))
+	try:
+		status._media_urls = (version, result)
+	except (AttributeError, TypeError):
+		pass
 	return result
 
 def has_audio_attachment(status):
@@ -461,6 +512,10 @@ def get_media_type_for_earcon(status):
 
 def _cleanup_finished_handles():
 	"""Remove handles that have finished playing."""
+	with _handles_lock:
+		_cleanup_finished_handles_locked()
+
+def _cleanup_finished_handles_locked():
 	global handles, _external_ui_sound_procs
 	active = []
 	for h in handles:
@@ -513,6 +568,8 @@ def _get_bundled_path():
 			return os.path.dirname(sys.executable)
 	return None
 
+_bundled_path = _get_bundled_path()
+
 # Mapping of new sound names to old names for backwards compatibility with custom soundpacks
 _SOUND_FALLBACKS = {
 	'send_post': 'send_tweet',
@@ -520,49 +577,144 @@ _SOUND_FALLBACKS = {
 
 def _find_sound_path(app, account, filename, bundled_path):
 	"""Find the path to a sound file, checking all locations."""
-	# Check user config first (highest priority)
-	if os.path.exists(app.confpath + "/sounds/" + account.prefs.soundpack + "/" + filename + ".ogg"):
-		return app.confpath + "/sounds/" + account.prefs.soundpack + "/" + filename + ".ogg"
-	# Check relative path (for development)
-	if os.path.exists("sounds/" + account.prefs.soundpack + "/" + filename + ".ogg"):
-		return "sounds/" + account.prefs.soundpack + "/" + filename + ".ogg"
-	# Check bundled path (for frozen apps)
-	if bundled_path and os.path.exists(bundled_path + "/sounds/" + account.prefs.soundpack + "/" + filename + ".ogg"):
-		return bundled_path + "/sounds/" + account.prefs.soundpack + "/" + filename + ".ogg"
-	# Fall back to default soundpack - user config
-	if os.path.exists(app.confpath + "/sounds/default/" + filename + ".ogg"):
-		return app.confpath + "/sounds/default/" + filename + ".ogg"
-	# Fall back to default - relative path
-	if os.path.exists("sounds/default/" + filename + ".ogg"):
-		return "sounds/default/" + filename + ".ogg"
-	# Fall back to default - bundled path
-	if bundled_path and os.path.exists(bundled_path + "/sounds/default/" + filename + ".ogg"):
-		return bundled_path + "/sounds/default/" + filename + ".ogg"
-	return None
+	return sound_bank.get_bank().resolve(app.confpath, account.prefs.soundpack, filename, bundled_path)
+
+def has_sound(account, filename):
+	"""Whether the account's soundpack (or the default pack) has a sound."""
+	return _find_sound_path(account.app, account, filename, _bundled_path) is not None
+
+def _make_room(filename):
+	"""Enforce the voice limits before playing a sound."""
+	with _handles_lock:
+		same = [h for h in handles if h.get("name") == filename]
+		while len(same) >= MAX_VOICES_PER_SOUND:
+			_stop_voice(same.pop(0))
+		while len(handles) >= MAX_VOICES:
+			_stop_voice(handles[0])
+
+def _stop_voice(h):
+	"""Stop a playing UI sound and release its voice."""
+	global handles
+	with _handles_lock:
+		handles = [other for other in handles if other is not h]
+	try:
+		if h.get("backend") == "soundlib":
+			h["handle"].stop()
+			h["handle"].free()
+		elif h.get("backend") == "pygame" and h.get("channel"):
+			h["channel"].stop()
+	except Exception:
+		pass
+
+def _soundlib_stream(sample):
+	"""Create a sound_lib stream that plays from the in-memory sample."""
+	if sys.platform == 'darwin':
+		# sound_lib only accepts file names on macOS
+		return stream.FileStream(file=sample.path)
+	return stream.FileStream(mem=True, file=sample.data, length=len(sample.data), unicode=False)
+
+def _pygame_sound(sample):
+	"""Decoded pygame Sound for a sample, created once."""
+	snd = sample.backend_objects.get("pygame")
+	if snd is None:
+		snd = pygame.mixer.Sound(file=io.BytesIO(sample.data))
+		sample.backend_objects["pygame"] = snd
+	return snd
+
+def _decode_sample(sample):
+	"""Decode a sample as the sound bank loads it, for the backend that will play it.
+
+	sound_lib streams decode from the sample's memory as they play, so only
+	pygame needs anything done ahead of time.
+	"""
+	if not SOUND_LIB_AVAILABLE and _ensure_pygame_audio():
+		_pygame_sound(sample)
+
+sound_bank.get_bank().decoder = _decode_sample
+
+class AudioDispatcher(object):
+	"""Plays UI sounds on a worker thread so callers never wait on audio.
+
+	The same sound for the same account is played at most once per debounce
+	window, so a burst of streamed items produces one earcon instead of a
+	stack of overlapping ones.
+	"""
+
+	def __init__(self):
+		self._queue = queue.Queue()
+		self._worker = None
+		self._worker_lock = threading.Lock()
+		self._last_played = {}  # (account id, sound) -> time
+		self.debounced = 0
+		self.stale = 0
+
+	def submit(self, account, filename):
+		with self._worker_lock:
+			if self._worker is None or not self._worker.is_alive():
+				self._worker = threading.Thread(target=self._run, name="AudioDispatcher", daemon=True)
+				self._worker.start()
+		self._queue.put((account, filename, time.time()))
+
+	def _run(self):
+		while True:
+			account, filename, queued_at = self._queue.get()
+			now = time.time()
+			if now - queued_at > SOUND_STALE_AFTER:
+				self.stale += 1
+				continue
+			key = (id(account), filename)
+			if now - self._last_played.get(key, 0.0) < DEBOUNCE:
+				self.debounced += 1
+				continue
+			self._last_played[key] = now
+			try:
+				_play_now(account, filename)
+			except Exception as e:
+				print(f"Error playing sound {filename}: {e}")
+
+	def clear(self):
+		"""Drop sounds that are queued but not yet playing."""
+		while True:
+			try:
+				self._queue.get_nowait()
+			except queue.Empty:
+				return
+
+
+_dispatcher = AudioDispatcher()
 
 def play(account, filename, pack="", wait=False):
+	"""Play a UI sound. Returns immediately unless wait is set."""
+	if wait:
+		_play_now(account, filename, wait=True)
+	else:
+		_dispatcher.submit(account, filename)
+
+def _play_now(account, filename, wait=False):
 	global handles, _external_ui_sound_procs
 	app = account.app
 
 	# Clean up finished handles before playing new sound
-	_cleanup_finished_handles()
-
-	# Get bundled path for frozen apps (macOS app bundle, Windows exe)
-	bundled_path = _get_bundled_path()
+	if handles or _external_ui_sound_procs:
+		_cleanup_finished_handles()
 
 	# Try to find the sound file
-	path = _find_sound_path(app, account, filename, bundled_path)
+	path = _find_sound_path(app, account, filename, _bundled_path)
 
 	# If not found and there's a fallback name, try the old name
 	# This allows custom soundpacks with old "tweet" names to still work
 	if not path and filename in _SOUND_FALLBACKS:
-		path = _find_sound_path(app, account, _SOUND_FALLBACKS[filename], bundled_path)
+		path = _find_sound_path(app, account, _SOUND_FALLBACKS[filename], _bundled_path)
 
 	if not path:
 		return
+	sample = sound_bank.get_bank().sample(path)
+	if sample is None:
+		return
+	_make_room(filename)
 	if SOUND_LIB_AVAILABLE:
 		try:
-			handle = stream.FileStream(file=path)
+			handle = _soundlib_stream(sample)
 			handle.pan = account.prefs.soundpan
 			# Use per-account soundpack volume (with fallback for old configs)
 			handle.volume = getattr(account.prefs, 'soundpack_volume', 1.0)
@@ -571,23 +723,28 @@ def play(account, filename, pack="", wait=False):
 				handle.play_blocking()
 			else:
 				handle.play()
-				handles.append({"backend": "soundlib", "handle": handle})
+				# The stream reads from the sample's memory, so keep it alive with the handle
+				with _handles_lock:
+					handles.append({"backend": "soundlib", "handle": handle, "sample": sample, "name": filename})
 			return
 		except Exception:
 			pass
 
 	if _ensure_pygame_audio():
 		try:
-			snd = pygame.mixer.Sound(path)
-			snd.set_volume(getattr(account.prefs, 'soundpack_volume', 1.0))
-			channel = snd.play()
+			snd = _pygame_sound(sample)
+			channel = pygame.mixer.find_channel(True)
+			if channel:
+				channel.set_volume(getattr(account.prefs, 'soundpack_volume', 1.0))
+				channel.play(snd)
 			if wait and channel:
 				while channel.get_busy():
 					pygame.time.wait(10)
 				return
 			if channel:
 				# Keep the Sound object alive with the channel entry.
-				handles.append({"backend": "pygame", "channel": channel, "sound": snd})
+				with _handles_lock:
+					handles.append({"backend": "pygame", "channel": channel, "sound": snd, "name": filename})
 				return
 		except Exception:
 			pass
@@ -744,24 +901,13 @@ def stop_all():
 	global handles, player, _external_ui_sound_procs
 	# Stop media player
 	stop()
-	# Stop all UI sound handles
-	for h in handles:
-		backend = h.get("backend")
-		if backend == "soundlib":
-			handle = h.get("handle")
-			try:
-				handle.stop()
-				handle.free()
-			except Exception:
-				pass
-		elif backend == "pygame":
-			channel = h.get("channel")
-			try:
-				if channel:
-					channel.stop()
-			except Exception:
-				pass
-	handles = []
+	# Stop all UI sound handles, including ones still queued
+	_dispatcher.clear()
+	with _handles_lock:
+		active = handles
+		handles = []
+	for h in active:
+		_stop_voice(h)
 
 	for proc in _external_ui_sound_procs:
 		try:
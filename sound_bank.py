@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Preloaded soundpacks for earcons.
+
+Each soundpack is indexed once: the directories it can come from (user
+config, relative and bundled, then the same for the default pack) are listed
+a single time and every sound name is mapped to the first file found. When a
+pack is indexed, every sound in it is read into memory and handed to the
+decoder set by the audio backend, so playing an earcon touches neither the
+disk nor the decoder. Directories and loaded files are re-checked every few
+seconds; anything changed on disk is loaded again without a restart, and a
+different pack simply gets its own index.
+"""
+import os
+import threading
+import time
+
+SOUND_EXT = ".ogg"
+
+# Seconds between checks of pack directories and loaded files for changes
+CHECK_INTERVAL = 5.0
+
+
+class Sample(object):
+	"""A sound file held in memory, with the backend objects decoded from it."""
+	__slots__ = ('path', 'data', 'mtime', 'backend_objects')
+
+	def __init__(self, path, data, mtime):
+		self.path = path
+		self.data = data
+		self.mtime = mtime
+		self.backend_objects = {}
+
+
+class _PackIndex(object):
+	__slots__ = ('dirs', 'files', 'dir_mtimes', 'checked_at')
+
+	def __init__(self, dirs):
+		self.dirs = dirs
+		self.files = {}
+		self.dir_mtimes = {}
+		self.checked_at = 0.0
+		self.scan()
+
+	def scan(self):
+		files = {}
+		mtimes = {}
+		# Later directories have lower priority, so fill from the back
+		for directory in reversed(self.dirs):
+			mtimes[directory] = _mtime(directory)
+			try:
+				names = os.listdir(directory)
+			except OSError:
+				continue
+			for name in names:
+				if name.endswith(SOUND_EXT):
+					files[os.path.normcase(name[:-len(SOUND_EXT)])] = directory + "/" + name
+		self.files = files
+		self.dir_mtimes = mtimes
+		self.checked_at = time.time()
+
+	def changed(self):
+		for directory, mtime in self.dir_mtimes.items():
+			if _mtime(directory) != mtime:
+				return True
+		return False
+
+
+def _mtime(path):
+	try:
+		return os.stat(path).st_mtime
+	except OSError:
+		return None
+
+
+def _pack_dirs(confpath, pack, bundled_path):
+	"""Directories a pack's sounds are looked up in, highest priority first."""
+	dirs = []
+	for name in (pack, "default"):
+		dirs.append(confpath + "/sounds/" + name)
+		dirs.append("sounds/" + name)
+		if bundled_path:
+			dirs.append(bundled_path + "/sounds/" + name)
+	# The default pack may be the selected one
+	return list(dict.fromkeys(dirs))
+
+
+class SoundBank(object):
+	"""Resolves sound names to files and keeps their contents in memory."""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		# Held while a pack is indexed or re-checked; lookups only take _lock
+		self._load_lock = threading.Lock()
+		self._indexes = {}  # (confpath, pack) -> _PackIndex
+		self._samples = {}  # path -> Sample
+		# Called with each loaded Sample to fill in its backend_objects
+		self.decoder = None
+
+	def _index(self, confpath, pack, bundled_path):
+		"""The pack's index. Building or re-checking it happens outside _lock."""
+		key = (confpath, pack)
+		with self._lock:
+			index = self._indexes.get(key)
+			if index is not None and time.time() - index.checked_at <= CHECK_INTERVAL:
+				return index
+		with self._load_lock:
+			with self._lock:
+				index = self._indexes.get(key)
+				if index is not None and time.time() - index.checked_at <= CHECK_INTERVAL:
+					# Another thread got here first
+					return index
+				samples = dict(self._samples)
+			if index is None:
+				index = _PackIndex(_pack_dirs(confpath, pack, bundled_path))
+			elif index.changed():
+				index = _PackIndex(index.dirs)
+			else:
+				index.checked_at = time.time()
+			loaded = self._load_pack(index, samples)
+			with self._lock:
+				self._indexes[key] = index
+				for path, sample in loaded.items():
+					if sample is None:
+						self._samples.pop(path, None)
+					else:
+						self._samples[path] = sample
+			return index
+
+	def _load_pack(self, index, samples):
+		"""Load every sound in a pack that is not in samples or changed on disk.
+
+		Returns path -> new Sample (None for files that could not be read).
+		"""
+		loaded = {}
+		for path in index.files.values():
+			sample = samples.get(path)
+			if sample is None or _mtime(path) != sample.mtime:
+				loaded[path] = self._load(path)
+		return loaded
+
+	def _load(self, path):
+		try:
+			mtime = _mtime(path)
+			with open(path, "rb") as f:
+				data = f.read()
+		except OSError:
+			return None
+		sample = Sample(path, data, mtime)
+		if self.decoder is not None:
+			try:
+				self.decoder(sample)
+			except Exception as e:
+				print(f"Could not decode sound {path}: {e}")
+		return sample
+
+	def resolve(self, confpath, pack, name, bundled_path=None):
+		"""Path of a sound in a pack (falling back to the default pack), or None."""
+		return self._index(confpath, pack, bundled_path).files.get(os.path.normcase(name))
+
+	def has_sound(self, confpath, pack, name, bundled_path=None):
+		return self.resolve(confpath, pack, name, bundled_path) is not None
+
+	def sample(self, path):
+		"""The preloaded sample for a resolved sound file."""
+		with self._lock:
+			sample = self._samples.get(path)
+		if sample is None:
+			# Not part of an indexed pack (or failed to load then)
+			sample = self._load(path)
+			if sample is not None:
+				with self._lock:
+					sample = self._samples.setdefault(path, sample)
+		return sample
+
+	def clear(self):
+		with self._lock:
+			self._indexes.clear()
+			self._samples.clear()
+
+	def stats(self):
+		with self._lock:
+			return {
+				'packs': len(self._indexes),
+				'samples': len(self._samples),
+				'bytes': sum(len(s.data) for s in self._samples.values()),
+			}
+
+
+_bank = SoundBank()
+
+
+def get_bank():
+	return _bank
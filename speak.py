@@ -1,15 +1,45 @@
-"""Speech output with accessible_output2 and Linux fallbacks."""
+"""Speech output with accessible_output2 and Linux fallbacks.
+
+Speech from the UI thread (navigation, keystroke echo) is spoken at once.
+Everything else goes through a scheduler with its own worker thread:
+announcements are ordered by priority (new items before errors), repeated
+announcements are coalesced, stale ones are dropped and output is rate
+limited, so bursts from background threads never delay interactive speech.
+"""
 
 import atexit
+import heapq
+import itertools
 import shutil
 import subprocess
 import sys
 import threading
+import time
+
+# Priorities; lower values are spoken first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ANNOUNCE = 1
+PRIORITY_ERROR = 2
+
+# Seconds after which a queued announcement is no longer worth speaking
+STALE_AFTER = {PRIORITY_ANNOUNCE: 10.0, PRIORITY_ERROR: 30.0}
+# Minimum gap between background utterances
+MIN_INTERVAL = 0.3
+# Background speech waits this long after interactive speech
+INTERACTIVE_HOLD = 0.75
+# Queued announcements beyond this are dropped, lowest priority first
+MAX_PENDING = 20
+# Seconds before retrying a failed speech-dispatcher connection
+SPEECHD_RETRY = 30.0
+# Longest the worker waits for a command-line TTS process to finish
+COMMAND_WAIT = 15.0
 
 _main_thread_id = threading.main_thread().ident
 _fallback_lock = threading.RLock()
 _fallback_process = None
+_speechd_lock = threading.Lock()
 _speechd_client = None
+_speechd_retry_at = 0.0
 
 try:
 	from accessible_output2 import outputs
@@ -43,21 +73,29 @@ def _terminate_process(proc):
 
 
 def _speak_with_speechd(text, interrupt):
-	"""Try linux speech-dispatcher Python bindings."""
-	global _speechd_client
+	"""Try linux speech-dispatcher Python bindings over one persistent connection."""
+	global _speechd_client, _speechd_retry_at
 	if sys.platform != "linux":
 		return False
-	try:
+	with _speechd_lock:
 		if _speechd_client is None:
-			import speechd
-			_speechd_client = speechd.SSIPClient("FastSM")
-		if interrupt:
-			_speechd_client.cancel()
-		_speechd_client.speak(text)
-		return True
-	except Exception:
-		_speechd_client = None
-		return False
+			if time.time() < _speechd_retry_at:
+				return False
+			try:
+				import speechd
+				_speechd_client = speechd.SSIPClient("FastSM")
+			except Exception:
+				_speechd_retry_at = time.time() + SPEECHD_RETRY
+				return False
+		try:
+			if interrupt:
+				_speechd_client.cancel()
+			_speechd_client.speak(text)
+			return True
+		except Exception:
+			# Connection dropped; reconnect on the next utterance
+			_close_speechd_client()
+			return False
 
 
 def _close_speechd_client():
@@ -129,8 +167,8 @@ def _do_speak(text, interrupt):
 		pass
 
 
-def speak(text, interrupt=False):
-	"""Speak text, ensuring thread safety for AO2 on macOS."""
+def _dispatch(text, interrupt):
+	"""Speak now, ensuring thread safety for AO2 on macOS."""
 	# On Mac, accessible_output2 must be called from the main thread.
 	if AO2_AVAILABLE and sys.platform == "darwin" and threading.current_thread().ident != _main_thread_id:
 		try:
@@ -142,4 +180,136 @@ def speak(text, interrupt=False):
 		_do_speak(text, interrupt)
 
 
+class SpeechScheduler(object):
+	"""Priority queue of background announcements spoken by one worker thread."""
+
+	def __init__(self):
+		self._cond = threading.Condition()
+		self._heap = []  # (priority, sequence, key)
+		self._pending = {}  # key -> [text, interrupt, priority, queued_at, count]
+		self._sequence = itertools.count()
+		self._worker = None
+		self.last_interactive = 0.0
+		self._last_spoken = 0.0
+		self.coalesced = 0
+		self.dropped = 0
+
+	def note_interactive(self):
+		self.last_interactive = time.time()
+
+	def submit(self, text, interrupt=False, priority=PRIORITY_ANNOUNCE, key=None, count=None):
+		"""Queue an announcement. A pending one with the same key is replaced.
+
+		With count, text is a function of the count, and the counts of
+		announcements replaced while pending are added up.
+		"""
+		if key is None:
+			key = text
+		with self._cond:
+			entry = self._pending.get(key)
+			if entry is not None:
+				# Keep the original position in the queue but speak the latest text
+				entry[0] = text
+				entry[1] = entry[1] or interrupt
+				if count is not None and entry[4] is not None:
+					entry[4] += count
+				self.coalesced += 1
+				return
+			self._pending[key] = [text, interrupt, priority, time.time(), count]
+			heapq.heappush(self._heap, (priority, next(self._sequence), key))
+			if len(self._pending) > MAX_PENDING:
+				self._drop_one()
+			self._ensure_worker()
+			self._cond.notify()
+
+	def _drop_one(self):
+		"""Drop the oldest announcement of the lowest priority."""
+		victim = max(self._heap, key=lambda item: (item[0], -item[1]))
+		self._heap.remove(victim)
+		heapq.heapify(self._heap)
+		self._pending.pop(victim[2], None)
+		self.dropped += 1
+
+	def _ensure_worker(self):
+		if self._worker is None or not self._worker.is_alive():
+			self._worker = threading.Thread(target=self._run, name="SpeechScheduler", daemon=True)
+			self._worker.start()
+
+	def _next(self):
+		"""Wait for the next announcement that is still worth speaking."""
+		with self._cond:
+			while True:
+				while not self._heap:
+					self._cond.wait()
+				priority, _, key = heapq.heappop(self._heap)
+				entry = self._pending.pop(key, None)
+				if entry is None:
+					continue
+				if time.time() - entry[3] > STALE_AFTER.get(priority, 10.0):
+					self.dropped += 1
+					continue
+				return entry
+
+	def _run(self):
+		while True:
+			text, interrupt, priority, queued_at, count = self._next()
+			if count is not None:
+				text = _normalize_text(text(count))
+			# Let interactive speech finish and keep a minimum gap between announcements
+			while True:
+				now = time.time()
+				wait = max(self.last_interactive + INTERACTIVE_HOLD, self._last_spoken + MIN_INTERVAL) - now
+				if wait <= 0:
+					break
+				time.sleep(wait)
+			try:
+				_dispatch(text, interrupt)
+			except Exception as e:
+				print(f"Speech failed: {e}", file=sys.stderr)
+			self._last_spoken = time.time()
+			self._wait_for_command()
+
+	def _wait_for_command(self):
+		"""With command-line TTS, let one utterance finish before starting the next."""
+		proc = _fallback_process
+		if proc is None:
+			return
+		try:
+			proc.wait(timeout=COMMAND_WAIT)
+		except Exception:
+			pass
+
+
+_scheduler = SpeechScheduler()
+
+
+def get_scheduler():
+	return _scheduler
+
+
+def speak(text, interrupt=False, priority=None, key=None, count=None):
+	"""Speak text.
+
+	Without a priority, speech from the UI thread is treated as interactive
+	and spoken immediately; speech from other threads is queued as an
+	announcement. key identifies announcements that replace each other
+	while queued (e.g. "new items in Home"); it defaults to the text. With
+	count, text is a function of the count and queued counts add up.
+	"""
+	if priority is None:
+		priority = PRIORITY_INTERACTIVE if threading.current_thread().ident == _main_thread_id else PRIORITY_ANNOUNCE
+	if count is not None:
+		if priority != PRIORITY_INTERACTIVE:
+			_scheduler.submit(text, interrupt, priority, key, count)
+			return
+		text = text(count)
+	if priority == PRIORITY_INTERACTIVE:
+		_scheduler.note_interactive()
+		_dispatch(text, interrupt)
+		return
+	text = _normalize_text(text)
+	if text:
+		_scheduler.submit(text, interrupt, priority, key)
+
+
 atexit.register(_close_speechd_client)
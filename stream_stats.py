@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""Health and throughput counters for streaming connections.
+
+Every stream (account user streams, per-timeline streams and Bluesky
+Jetstream) registers a StreamStats object here. The stream thread records
+connects, disconnects and parsed events; the UI side records end-to-end
+latency when an item is inserted into a timeline.
+"""
+import threading
+import time
+from collections import deque
+from datetime import timezone
+
+# Window used for events-per-second rates
+RATE_WINDOW = 60
+# Number of latency/parse samples kept for averages and percentiles
+SAMPLE_SIZE = 200
+# Number of recent disconnect reasons kept
+REASON_HISTORY = 20
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_stats(name):
+	"""Get (or create) the stats object for a named stream."""
+	with _registry_lock:
+		stats = _registry.get(name)
+		if stats is None:
+			stats = StreamStats(name)
+			_registry[name] = stats
+		return stats
+
+
+def remove_stats(name):
+	with _registry_lock:
+		_registry.pop(name, None)
+
+
+def all_stats():
+	with _registry_lock:
+		return list(_registry.values())
+
+
+def status_text():
+	"""Short, speakable summary of all streams."""
+	streams = all_stats()
+	if not streams:
+		return "No streams running"
+	connected = [s for s in streams if s.connected]
+	parts = [f"{len(connected)} of {len(streams)} streams connected"]
+	for s in streams:
+		parts.append(s.summary())
+	return ". ".join(parts)
+
+
+def dump():
+	"""Detailed multi-line report of all streams, for the debug view."""
+	streams = all_stats()
+	if not streams:
+		return "No streams running"
+	return "\r\n\r\n".join(s.report() for s in streams)
+
+
+def _timestamp(dt):
+	"""Convert a datetime to a UNIX timestamp; naive values are treated as UTC."""
+	if dt is None:
+		return None
+	try:
+		if dt.tzinfo is None:
+			dt = dt.replace(tzinfo=timezone.utc)
+		return dt.timestamp()
+	except Exception:
+		return None
+
+
+def _percentile(samples, pct):
+	if not samples:
+		return 0.0
+	ordered = sorted(samples)
+	index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+	return ordered[index]
+
+
+def _format_duration(seconds):
+	seconds = int(seconds)
+	if seconds < 60:
+		return f"{seconds}s"
+	if seconds < 3600:
+		return f"{seconds // 60}m {seconds % 60}s"
+	return f"{seconds // 3600}h {(seconds % 3600) // 60}m"
+
+
+class StreamStats(object):
+	"""Counters for one streaming connection. Safe to update from any thread."""
+
+	def __init__(self, name):
+		self.name = name
+		self._lock = threading.Lock()
+		self.connected = False
+		self.created = time.time()
+		self.connected_since = None
+		self.connect_count = 0
+		self.reconnects = 0
+		self.reasons = deque(maxlen=REASON_HISTORY)
+		self.event_counts = {}
+		self._event_times = {}
+		self.last_event = None
+		self.malformed = 0
+		self.dropped = 0
+		self.drop_reasons = deque(maxlen=REASON_HISTORY)
+		self._parse_times = deque(maxlen=SAMPLE_SIZE)
+		self._latencies = deque(maxlen=SAMPLE_SIZE)
+
+	def on_connect(self):
+		with self._lock:
+			if self.connect_count > 0:
+				self.reconnects += 1
+			self.connect_count += 1
+			self.connected = True
+			self.connected_since = time.time()
+
+	def on_disconnect(self, reason=None):
+		with self._lock:
+			was_connected = self.connected
+			self.connected = False
+			self.connected_since = None
+			if reason is not None or was_connected:
+				self.reasons.append((time.time(), str(reason) if reason is not None else "closed"))
+
+	def record_event(self, event_type, parse_time=None):
+		"""Count one successfully parsed event; parse_time is in seconds."""
+		now = time.time()
+		with self._lock:
+			self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+			times = self._event_times.get(event_type)
+			if times is None:
+				times = deque()
+				self._event_times[event_type] = times
+			times.append(now)
+			while times and times[0] < now - RATE_WINDOW:
+				times.popleft()
+			self.last_event = now
+			if parse_time is not None:
+				self._parse_times.append(parse_time)
+
+	def record_malformed(self, reason=None):
+		with self._lock:
+			self.malformed += 1
+			if reason is not None:
+				self.drop_reasons.append((time.time(), "malformed: " + str(reason)))
+
+	def record_dropped(self, event_type, reason=None):
+		"""Count an event that parsed but could not be handled."""
+		with self._lock:
+			self.dropped += 1
+			self.drop_reasons.append((time.time(), f"{event_type}: {reason}"))
+
+	def record_latency(self, created_at):
+		"""Record delay between an item's creation and its insertion into the UI."""
+		created = _timestamp(created_at)
+		if created is None:
+			return
+		with self._lock:
+			self._latencies.append(max(0.0, time.time() - created))
+
+	def rates(self):
+		"""Events per second by type over the last RATE_WINDOW seconds."""
+		now = time.time()
+		with self._lock:
+			result = {}
+			for event_type, times in self._event_times.items():
+				while times and times[0] < now - RATE_WINDOW:
+					times.popleft()
+				result[event_type] = len(times) / float(RATE_WINDOW)
+			return result
+
+	def uptime(self):
+		if not self.connected or self.connected_since is None:
+			return 0
+		return time.time() - self.connected_since
+
+	def snapshot(self):
+		"""Return all counters as a plain dict."""
+		rates = self.rates()
+		with self._lock:
+			parse = list(self._parse_times)
+			latency = list(self._latencies)
+			return {
+				'name': self.name,
+				'connected': self.connected,
+				'uptime': self.uptime(),
+				'reconnects': self.reconnects,
+				'reasons': list(self.reasons),
+				'event_counts': dict(self.event_counts),
+				'rates': rates,
+				'last_event': self.last_event,
+				'malformed': self.malformed,
+				'dropped': self.dropped,
+				'drop_reasons': list(self.drop_reasons),
+				'parse_avg_ms': (sum(parse) / len(parse) * 1000) if parse else 0.0,
+				'parse_max_ms': max(parse) * 1000 if parse else 0.0,
+				'latency_avg': (sum(latency) / len(latency)) if latency else 0.0,
+				'latency_p95': _percentile(latency, 95),
+				'latency_max': max(latency) if latency else 0.0,
+			}
+
+	def summary(self):
+		s = self.snapshot()
+		state = "connected for " + _format_duration(s['uptime']) if s['connected'] else "disconnected"
+		total_rate = sum(s['rates'].values())
+		text = f"{s['name']}: {state}, {s['reconnects']} reconnects, {total_rate:.2f} events per second"
+		if s['latency_avg']:
+			text += f", latency {s['latency_avg']:.1f}s"
+		if s['dropped'] or s['malformed']:
+			text += f", {s['dropped']} dropped, {s['malformed']} malformed"
+		return text
+
+	def report(self):
+		s = self.snapshot()
+		lines = [s['name']]
+		lines.append("Connected: " + ("yes, for " + _format_duration(s['uptime']) if s['connected'] else "no"))
+		lines.append(f"Reconnects: {s['reconnects']}")
+		if s['last_event']:
+			lines.append("Last event: " + _format_duration(time.time() - s['last_event']) + " ago")
+		for event_type in sorted(s['event_counts']):
+			rate = s['rates'].get(event_type, 0.0)
+			lines.append(f"Events {event_type}: {s['event_counts'][event_type]} total, {rate:.3f}/s")
+		lines.append(f"Parse time: avg {s['parse_avg_ms']:.2f} ms, max {s['parse_max_ms']:.2f} ms")
+		lines.append(f"Latency to UI: avg {s['latency_avg']:.2f}s, p95 {s['latency_p95']:.2f}s, max {s['latency_max']:.2f}s")
+		lines.append(f"Dropped: {s['dropped']}, malformed: {s['malformed']}")
+		for when, reason in s['reasons']:
+			lines.append(time.strftime("%H:%M:%S", time.localtime(when)) + " disconnect: " + reason)
+		for when, reason in s['drop_reasons']:
+			lines.append(time.strftime("%H:%M:%S", time.localtime(when)) + " drop: " + reason)
+		return "\r\n".join(lines)
@@ -2,6 +2,7 @@
 from mastodon import StreamListener
 from GUI import main
 import time
+import render_cache
 import speak
 import sys
 import wx
@@ -14,6 +15,21 @@ class MastodonStreamListener(StreamListener):
 		super(MastodonStreamListener, self).__init__()
 		self.account = account
 
+	def _prerender_then(self, renders, callback):
+		"""Render (timeline type, item) pairs on the render worker, then run callback on the UI thread."""
+		def job():
+			for tl_type, item in renders:
+				tl = self.account.get_timeline_by_type(tl_type)
+				if tl is not None and item is not None:
+					tl.prerender([item])
+		render_cache.submit(job, lambda: wx.CallAfter(callback))
+
+	def _record_latency(self, item):
+		"""Record created_at-to-UI latency for an item that was just inserted."""
+		stats = getattr(self.account, 'stream_stats', None)
+		if stats is not None and item is not None:
+			stats.record_latency(getattr(item, 'created_at', None))
+
 	def _is_network_error(self, e):
 		"""Check if an exception is a network-related error that should be silently ignored."""
 		error_str = str(e).lower()
@@ -30,7 +46,14 @@ class MastodonStreamListener(StreamListener):
 			status = mastodon_status_to_universal(status)
 			if not status:
 				return
+			self._dispatch_update(status)
+		except Exception as e:
+			if not self._is_network_error(e):
+				self.account.app.handle_error(e, "Stream update")
 
+	def _dispatch_update(self, status):
+		"""Add an already converted status to home, Sent, list and user timelines."""
+		try:
 			# Use wx.CallAfter for all timeline modifications (thread safety)
 			def do_update():
 				try:
@@ -38,6 +61,7 @@ class MastodonStreamListener(StreamListener):
 					home_tl = self.account.get_timeline_by_type("home")
 					if home_tl:
 						home_tl.load(items=[status])
+					self._record_latency(status)
 
 					# Note: Mentions are handled by on_notification to avoid duplicates
 
@@ -57,7 +81,7 @@ class MastodonStreamListener(StreamListener):
 				except Exception as e:
 					if not self._is_network_error(e):
 						self.account.app.handle_error(e, "Stream update (main thread)")
-			wx.CallAfter(do_update)
+			self._prerender_then([("home", status)], do_update)
 		except Exception as e:
 			if not self._is_network_error(e):
 				self.account.app.handle_error(e, "Stream update")
@@ -92,6 +116,7 @@ class MastodonStreamListener(StreamListener):
 							if tl.type == "notifications":
 								tl.load(items=[uni_notif])
 								break
+						self._record_latency(uni_notif)
 
 					# Add mentions to mentions timeline as STATUS (not notification)
 					if mention_status:
@@ -99,10 +124,12 @@ class MastodonStreamListener(StreamListener):
 							if tl.type == "mentions":
 								tl.load(items=[mention_status])
 								break
+						if not uni_notif:
+							self._record_latency(mention_status)
 				except Exception as e:
 					if not self._is_network_error(e):
 						self.account.app.handle_error(e, "Stream notification (main thread)")
-			wx.CallAfter(do_notification)
+			self._prerender_then([("notifications", uni_notif), ("mentions", mention_status)], do_notification)
 		except Exception as e:
 			if not self._is_network_error(e):
 				self.account.app.handle_error(e, "Stream notification")
@@ -165,6 +192,7 @@ class MastodonStreamListener(StreamListener):
 			uni_status = mastodon_status_to_universal(status)
 			if not uni_status:
 				return
+			self.account.app.forget_status(self.account, uni_status.id)
 
 			# Use wx.CallAfter for all timeline modifications (thread safety)
 			def do_status_update():
@@ -200,3 +228,47 @@ class MastodonStreamListener(StreamListener):
 	def on_unknown_event(self, name, data=None):
 		"""Called on unknown events"""
 		pass
+
+
+class BlueskyStreamListener(MastodonStreamListener):
+	"""Handles Bluesky Jetstream events.
+
+	Statuses arrive already converted to UniversalStatus by the Jetstream
+	consumer, so home/list/user routing and deletes reuse the Mastodon paths.
+	"""
+
+	def on_update(self, status):
+		"""Called when a followed account (or we) posted or reposted"""
+		self._dispatch_update(status)
+
+	def on_mention(self, status):
+		"""Called when a post mentions, replies to or quotes us"""
+		try:
+			def do_mention():
+				try:
+					tl = self.account.get_timeline_by_type("mentions")
+					if tl:
+						tl.load(items=[status])
+					self._record_latency(status)
+				except Exception as e:
+					if not self._is_network_error(e):
+						self.account.app.handle_error(e, "Stream mention (main thread)")
+			self._prerender_then([("mentions", status)], do_mention)
+		except Exception as e:
+			if not self._is_network_error(e):
+				self.account.app.handle_error(e, "Stream mention")
+
+	def on_notifications_changed(self):
+		"""Called when a commit concerns us; Jetstream has no notification
+		objects, so refresh the notifications timeline from the API."""
+		try:
+			tl = self.account.get_timeline_by_type("notifications")
+			if tl:
+				tl.load()
+		except Exception as e:
+			if not self._is_network_error(e):
+				self.account.app.handle_error(e, "Stream notifications")
+
+	def on_abort(self, err):
+		"""Called after repeated reconnect failures"""
+		speak.speak("Stream connection lost", priority=speak.PRIORITY_ERROR)
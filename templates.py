@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Compiled display templates.
+
+Templates such as "$account.display_name$ (@$account.acct$): $text$" are
+parsed once into a list of literal strings and accessor operations, and
+rendering is a single pass joined at the end. Compiled templates are cached
+by their source string, so editing a template in the options simply
+compiles the new string the next time it is used.
+"""
+
+# Operation kinds
+_TEXT = 0  # $text$ - pre-processed post text
+_ATTR = 1  # $name$ - attribute of the item itself
+_PATH = 2  # $a.b.c$ - dotted attribute path
+
+_NAME_ATTRS = ('name', 'display_name')
+
+_MAX_CACHED = 128
+_compiled = {}
+
+
+def get_compiled(template):
+	"""Return the compiled form of a template string, compiling it on first use."""
+	compiled = _compiled.get(template)
+	if compiled is None:
+		if len(_compiled) >= _MAX_CACHED:
+			_compiled.clear()
+		compiled = CompiledTemplate(template)
+		_compiled[template] = compiled
+	return compiled
+
+
+def clear_cache():
+	_compiled.clear()
+
+
+def _active_names(template):
+	"""Variable names the template engine substitutes.
+
+	Matches the historical rules: the first $var$ of every space-separated
+	word is a variable (and replaces every occurrence of itself), and $text$
+	is always substituted.
+	"""
+	names = set()
+	for word in template.split(" "):
+		if "$" in word:
+			names.add(word.split("$")[1])
+	if "$text$" in template:
+		names.add("text")
+	return names
+
+
+class CompiledTemplate(object):
+	__slots__ = ('source', 'parts', 'uses_text')
+
+	def __init__(self, template):
+		self.source = template
+		self.parts = []
+		self.uses_text = False
+		active = _active_names(template)
+		literal_start = 0
+		pos = template.find("$")
+		while pos != -1:
+			end = template.find("$", pos + 1)
+			if end == -1:
+				break
+			name = template[pos + 1:end]
+			if name not in active:
+				# Not a variable; the closing $ may open the next one
+				pos = end
+				continue
+			if pos > literal_start:
+				self.parts.append(template[literal_start:pos])
+			raw = template[pos:end + 1]
+			if name == "text":
+				self.parts.append((_TEXT, raw, name))
+				self.uses_text = True
+			elif "." in name:
+				self.parts.append((_PATH, raw, tuple(name.split("."))))
+			else:
+				self.parts.append((_ATTR, raw, name))
+			literal_start = end + 1
+			pos = template.find("$", literal_start)
+		if literal_start < len(template):
+			self.parts.append(template[literal_start:])
+
+	def render(self, app, s, account=None):
+		"""Render an item. Unresolvable variables are left in place."""
+		demojify = app.prefs.demojify
+		text = app._template_text(s) if self.uses_text else None
+		out = []
+		for part in self.parts:
+			if part.__class__ is str:
+				out.append(part)
+				continue
+			kind, raw, name = part
+			if kind == _TEXT:
+				value = text
+			elif kind == _PATH:
+				value = _resolve_path(app, s, name, account, demojify)
+			else:
+				value = _resolve_attr(app, s, name, account, demojify)
+			out.append(raw if value is None else value)
+		return "".join(out)
+
+
+def _resolve_path(app, s, path, account, demojify):
+	"""Resolve a dotted path such as reblog.account.display_name."""
+	try:
+		obj = s
+		parent = None
+		if path[0] == 'in_reply_to_account':
+			# Only the ID comes with the post; unknown users are looked up and the post re-rendered
+			obj = _reply_to_account(app, s, account)
+			path = path[1:]
+		for attr in path:
+			if obj is None:
+				break
+			parent = obj
+			obj = getattr(obj, attr, None)
+		if obj is None:
+			return ""
+		last = path[-1]
+		if last in _NAME_ATTRS:
+			user_id = str(getattr(parent, 'id', '')) if account and parent else ''
+			if user_id and user_id in account.prefs.aliases:
+				obj = account.prefs.aliases[user_id]
+			elif demojify:
+				demojied = app.demojify(str(obj), getattr(parent, 'emojis', None))
+				if demojied != "":
+					obj = demojied
+				elif parent:
+					obj = getattr(parent, "acct", obj)
+		elif last == 'note':
+			obj = app.strip_html(str(obj))
+		return str(obj)
+	except Exception:
+		return None
+
+
+def _reply_to_account(app, s, account):
+	user_id = getattr(s, 'in_reply_to_account_id', None)
+	if user_id is None:
+		return None
+	# One re-render per post, however often it is rendered while the lookup is pending
+	return app.lookup_user(user_id, account, lambda user: app.user_resolved(account, s, user), ('render', id(s)))
+
+
+def _resolve_attr(app, s, name, account, demojify):
+	"""Resolve a plain attribute of the item."""
+	if not hasattr(s, name):
+		return None
+	try:
+		if name in _NAME_ATTRS and account:
+			user_id = str(getattr(s, 'id', ''))
+			if user_id and user_id in account.prefs.aliases:
+				return account.prefs.aliases[user_id]
+		if name == "name" or name == "display_name" and demojify:
+			demojied = app.demojify(str(getattr(s, name)), getattr(s, 'emojis', None))
+			if demojied == "":
+				return getattr(s, "acct", "")
+			return demojied
+		value = getattr(s, name)
+		if name == "created_at":
+			return app.parse_date(value)
+		if name == "note":
+			return app.strip_html(str(value))
+		return str(value)
+	except Exception:
+		try:
+			return str(getattr(s, name))
+		except Exception as e:
+			print(e)
+			return None
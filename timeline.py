@@ -1,12 +1,19 @@
 from mastodon import MastodonError
 import time
 import speak
+import render_cache
+import mutes
+import http_client
 import sound
+import stream_stats
 import threading
 import os
 import wx
 from GUI import main
 
+# Items rendered ahead of time in timelines that aren't shown (about a screenful)
+WARM_ITEMS = 40
+
 
 class TimelineSettings(object):
 	def __init__(self, account, tl):
@@ -45,6 +52,9 @@ class timeline(object):
 		self._status_ids = set()
 		# Lock for thread-safe duplicate checking and status addition
 		self._status_lock = threading.RLock()
+		# Rendered display list and the render cache state it was built for
+		self._display_list_cache = None
+		self._display_list_state = None
 		# Gap tracking for cache - when API refresh doesn't fully connect to cached items
 		# List of gaps, each gap is a dict with 'max_id' (where to load from)
 		self._gaps = []
@@ -53,6 +63,7 @@ class timeline(object):
 		# Per-timeline streaming support
 		self._stream_thread = None
 		self._stream_started = False
+		self.stream_stats = None
 		self._stream_lock = threading.Lock()
 		# Manual refresh focus restore (set by main window before F5 refresh).
 		self._manual_refresh_pending = False
@@ -150,8 +161,7 @@ class timeline(object):
 			# Fetch list members for streaming (in background to not block startup)
 			def fetch_members():
 				try:
-					members = self.account.api.list_accounts(id=self.data)
-					self.members = [m.id for m in members]
+					self.members = self.account.list_member_ids(self.data)
 				except:
 					pass
 			threading.Thread(target=fetch_members, daemon=True).start()
@@ -220,6 +230,11 @@ class timeline(object):
 			self.func = lambda sid=status_id, **kwargs: self.account.api._Mastodon__api_request('GET', f'/api/v1/statuses/{sid}/quotes')
 			self.removable = True
 
+		if self._uses_cursors():
+			# Bluesky pages with cursors; each timeline keeps its own, restored from the cache if any
+			self.update_kwargs['cursor_key'] = self.prev_kwargs['cursor_key'] = self._get_cursor_key()
+			self.account._platform.set_cursor(self._get_cursor_key(), None)
+
 		# Load saved filter settings if any
 		from GUI.timeline_filter import get_saved_filter
 		saved_filter = get_saved_filter(self.account, self)
@@ -255,10 +270,12 @@ class timeline(object):
 
 		# Use platform backend if available
 		if hasattr(self.account, '_platform') and self.account._platform:
+			# Bluesky pages with this timeline's cursor
+			paging = {k: kwargs[k] for k in ('cursor', 'cursor_key') if kwargs.get(k)}
 			# Only pass max_id if it's actually set (not None)
 			if max_id:
-				return self.account._platform.search_statuses(self.data, limit=limit, max_id=max_id)
-			return self.account._platform.search_statuses(self.data, limit=limit)
+				return self.account._platform.search_statuses(self.data, limit=limit, max_id=max_id, **paging)
+			return self.account._platform.search_statuses(self.data, limit=limit, **paging)
 
 		# Fallback to Mastodon API - handle versions that don't support limit
 		search_kwargs = {'q': self.data, 'result_type': 'statuses'}
@@ -332,6 +349,9 @@ class timeline(object):
 		with self._stream_lock:
 			self._stream_started = False
 			# Thread will exit on next iteration when it checks _stream_started
+		if self.stream_stats is not None:
+			stream_stats.remove_stats(self.stream_stats.name)
+			self.stream_stats = None
 
 	def _run_stream(self):
 		"""Run the streaming connection for this timeline."""
@@ -344,6 +364,8 @@ class timeline(object):
 		consecutive_errors = 0
 		base_delay = 5
 		max_delay = 300
+		self.stream_stats = stream_stats.get_stats(self.account.me.acct + " " + self.name + " stream")
+		stats = self.stream_stats
 
 		def convert_to_attrib_dict(obj):
 			"""Recursively convert dicts to AttribAccessDict for attribute access."""
@@ -374,17 +396,20 @@ class timeline(object):
 				if self.type == 'list':
 					headers["Authorization"] = f"Bearer {self.account.prefs.access_token}"
 
-				with requests.get(stream_url, headers=headers, stream=True, timeout=300) as response:
+				with http_client.get(stream_url, kind=http_client.STREAM, headers=headers, stream=True) as response:
 					response.raise_for_status()
 					consecutive_errors = 0
+					stats.on_connect()
 
 					event_type = None
 					data_lines = []
 
 					for line in response.iter_lines():
 						if not self._stream_started:
+							stats.on_disconnect("stopped")
 							return
 						if self._stream_thread is None or self._stream_thread.ident != thread_id:
+							stats.on_disconnect("stopped")
 							return
 
 						if line:
@@ -398,17 +423,22 @@ class timeline(object):
 							if event_type and data_lines:
 								data_str = '\n'.join(data_lines)
 								try:
+									parse_start = time.perf_counter()
 									data = json.loads(data_str)
+									stats.record_event(event_type, time.perf_counter() - parse_start)
 									self._handle_stream_event(event_type, data, convert_to_attrib_dict)
-								except json.JSONDecodeError:
-									pass
+								except json.JSONDecodeError as e:
+									stats.record_malformed(e)
 							event_type = None
 							data_lines = []
+				stats.on_disconnect("server closed stream")
 
 			except requests.exceptions.Timeout:
+				stats.on_disconnect("timeout")
 				time.sleep(2)
 				continue
-			except Exception:
+			except Exception as e:
+				stats.on_disconnect(e)
 				consecutive_errors += 1
 				if consecutive_errors >= 10:
 					# Too many errors, give up
@@ -427,7 +457,12 @@ class timeline(object):
 				status = convert_func(data)
 				uni_status = mastodon_status_to_universal(status)
 				if uni_status:
-					wx.CallAfter(lambda s=uni_status: self.load(items=[s]))
+					def do_insert(s=uni_status):
+						self.load(items=[s])
+						if self.stream_stats is not None:
+							self.stream_stats.record_latency(s.created_at)
+					# Render on the render worker, then insert on the UI thread
+					render_cache.submit(lambda s=uni_status: self.prerender([s]), lambda: wx.CallAfter(do_insert))
 			elif event_type == 'delete':
 				status_id = str(data)
 				def do_delete():
@@ -457,24 +492,32 @@ class timeline(object):
 									main.window.refreshList()
 								break
 					wx.CallAfter(do_update)
-		except Exception:
-			pass  # Silently ignore stream handler errors
+		except Exception as e:
+			if self.stream_stats is not None:
+				self.stream_stats.record_dropped(event_type, e)
 
 	def read_items(self, items):
 		pref = ""
 		if len(self.app.accounts) > 1:
 			pref = self.account.me.acct + ": "
 		if len(items) >= 4:
-			speak.speak(pref + str(len(items)) + " new in " + self.name)
+			# Counts for this timeline that haven't been spoken yet are added together
+			name = self.name
+			speak.speak(lambda count: pref + str(count) + " new in " + name, priority=speak.PRIORITY_ANNOUNCE, key=("new", id(self)), count=len(items))
 			return
-		speak.speak(pref + ", ".join(self.prepare(items)))
+		speak.speak(pref + ", ".join(self.prepare(items)), priority=speak.PRIORITY_ANNOUNCE)
 
 	def _status_passes_server_filter(self, status):
 		"""Check if a status should be shown based on server-side filters.
 
 		Returns True if the status should be shown, False if it should be hidden.
-		Checks the 'filtered' attribute for any filters with filter_action='hide'.
+		Checks the account's muted words, then the 'filtered' attribute for any
+		filters with filter_action='hide'.
 		"""
+		# Client-side muted words, for every platform and source
+		if mutes.is_hidden(self.account, status):
+			return False
+
 		filtered = getattr(status, 'filtered', None)
 		if not filtered:
 			return True
@@ -602,6 +645,19 @@ class timeline(object):
 			return self.data
 		return None
 
+	def _uses_cursors(self):
+		"""Whether the platform pages this timeline with cursors (Bluesky)."""
+		platform = getattr(self.account, '_platform', None)
+		return platform is not None and hasattr(platform, 'set_cursor') and self.type != 'conversation'
+
+	def _get_cursor_key(self):
+		"""Identity of this timeline for the platform's pagination cursors."""
+		data = self._get_timeline_data_key()
+		if isinstance(data, dict):
+			import json
+			data = json.dumps(data, sort_keys=True)
+		return f"{self.type}:{self.name}:{data if data is not None else ''}"
+
 	def _get_item_type(self):
 		"""Get the item type for this timeline (status or notification)."""
 		if self.type == 'notifications':
@@ -645,7 +701,8 @@ class timeline(object):
 			# Check if filter is active
 			filter_active = hasattr(self, '_filter_settings') and self._filter_settings
 			if filter_active:
-				from GUI.timeline_filter import should_show_status
+				from GUI.timeline_filter import compile_filter, status_passes
+				status_filter = compile_filter(self._filter_settings)
 
 			# For notifications, check if we should filter out mentions from cache
 			filter_mentions_from_notifications = False
@@ -671,7 +728,7 @@ class timeline(object):
 				# If filter is active, add to unfiltered list and only add to visible if it passes filter
 				if filter_active:
 					self._unfiltered_statuses.append(item)
-					if should_show_status(item, self._filter_settings, self.app, account=self.account):
+					if status_passes(item, status_filter, self.account):
 						self.statuses.append(item)
 				else:
 					self.statuses.append(item)
@@ -682,6 +739,10 @@ class timeline(object):
 			if metadata.get('since_id') and items and self.type not in ('favourites', 'bookmarks', 'scheduled'):
 				self.update_kwargs['since_id'] = metadata['since_id']
 
+			# Restore the cursor so "load previous" continues after the oldest cached item
+			if metadata.get('cursor') and self._uses_cursors():
+				self.account._platform.set_cursor(self._get_cursor_key(), metadata['cursor'])
+
 			# Clear any stale gaps from cache (gap detection is currently disabled)
 			self._gaps = []
 
@@ -725,7 +786,13 @@ class timeline(object):
 
 			# Update UI
 			if self.account == self.app.currentAccount and self.account.currentTimeline == self:
+				self._prerender_new(list(self.statuses))
 				wx.CallAfter(main.window.refreshList)
+			else:
+				# Warm the render cache around the saved position so switching here is instant
+				start = max(0, self.index - WARM_ITEMS // 2)
+				statuses = self.statuses[start:start + WARM_ITEMS]
+				render_cache.warm(lambda: self.prerender(statuses))
 
 			return True
 
@@ -799,6 +866,11 @@ class timeline(object):
 			if self.index >= 0 and self.index < len(self.statuses):
 				position_id = str(self.statuses[self.index].id)
 
+			# The cursor only follows on from the cached items if all loaded items are cached
+			pagination_cursor = None
+			if self._uses_cursors() and len(source_statuses) <= cache_limit:
+				pagination_cursor = self.account._platform.get_cursor(self._get_cursor_key())
+
 			# Save to cache with gap info and current position
 			cache.save_timeline(
 				self.type,
@@ -809,7 +881,8 @@ class timeline(object):
 				limit=cache_limit,
 				gaps=self._gaps if self._gaps else None,
 				last_index=self.index,
-				last_position_id=position_id
+				last_position_id=position_id,
+				pagination_cursor=pagination_cursor
 			)
 		except Exception as e:
 			print(f"Cache save error for {self.name}: {e}")
@@ -892,7 +965,7 @@ class timeline(object):
 
 	def play(self, items=None):
 		if self.type == "user":
-			if not os.path.exists("sounds/" + self.account.prefs.soundpack + "/" + self.user.acct + ".ogg"):
+			if not sound.has_sound(self.account, self.user.acct):
 				sound.play(self.account, "user")
 			else:
 				sound.play(self.account, self.user.acct)
@@ -1026,10 +1099,16 @@ class timeline(object):
 				if len(page_results) < requested_limit:
 					break  # Reached the end, no more pages available
 
-				# For Bluesky, the cursor is handled internally by the platform backend
+				# For Bluesky, the cursor is handled internally by the platform backend;
+				# a refresh continues from the page it just fetched
 				# For Mastodon, we need to pass max_id of last item
 				last_item = page_results[-1]
-				if hasattr(last_item, 'id'):
+				if kwargs.get('cursor_key') and not kwargs.get('max_id'):
+					next_cursor = self.account._platform.get_page_cursor(kwargs['cursor_key'])
+					if not next_cursor:
+						break
+					current_kwargs['cursor'] = next_cursor
+				elif hasattr(last_item, 'id'):
 					current_kwargs['max_id'] = last_item.id
 				else:
 					break  # Can't paginate without ID
@@ -1618,6 +1697,8 @@ class timeline(object):
 							filtered_objs2.append(i)
 					objs2 = filtered_objs2
 
+				self._prerender_new(objs2)
+
 				if self.app.currentAccount == self.account and self.account.currentTimeline == self:
 					# Always use refreshList to ensure display list matches statuses
 					# This avoids synchronization issues with incremental updates
@@ -1760,41 +1841,58 @@ class timeline(object):
 		self.app.get_timeline_settings(self.account.me.id, self.name).mute = self.mute
 		self.app.save_timeline_settings()
 
+	def _render_kind(self):
+		"""Which renderer this timeline's items use (part of the render cache key)."""
+		if self.type == "notifications":
+			return "notification"
+		if self.type == "conversations":
+			return "conversation"
+		return "status"
+
+	def _render_item(self, item):
+		if self.type == "notifications":
+			return self.app.process_notification(item, account=self.account)
+		if self.type == "conversations":
+			return self.app.process_conversation(item, account=self.account)
+		# mentions now treated same as home/user/etc.
+		return self.app.process_status(item, account=self.account)
+
 	def get(self):
-		# Return cached display list if available and valid
-		if hasattr(self, '_display_list_cache') and self._display_list_cache is not None:
+		cache = render_cache.get_cache()
+		state = cache.list_state(self.app, self.account)
+		# Return cached display list if nothing it depends on has changed
+		if self._display_list_cache is not None and self._display_list_state == state:
 			if len(self._display_list_cache) == len(self.statuses):
 				return self._display_list_cache
 
-		# Build display list (cache individual items for future use)
-		items = []
 		# Conversation threads are always displayed in chronological order (oldest first)
 		# regardless of global reversed setting, since they represent a chat-like thread
-		statuses_to_display = self.statuses
-		for i in statuses_to_display:
-			# Use cached display string if available
-			cache_attr = '_display_cache'
-			cached = getattr(i, cache_attr, None)
-			if cached is not None:
-				items.append(cached)
-			else:
-				if self.type == "notifications":
-					display = self.app.process_notification(i, account=self.account)
-				elif self.type == "conversations":
-					display = self.app.process_conversation(i, account=self.account)
-				else:
-					display = self.app.process_status(i, account=self.account)
-				# Try to cache, but don't fail if object doesn't support it
-				try:
-					setattr(i, cache_attr, display)
-				except (AttributeError, TypeError):
-					pass
-				items.append(display)
+		fingerprint = state[0]
+		kind = self._render_kind()
+		items = [cache.render(i, kind, self.account, fingerprint, self._render_item) for i in self.statuses]
 
 		# Cache the full display list
 		self._display_list_cache = items
+		self._display_list_state = state
 		return items
 
+	def prerender(self, items):
+		"""Render items into the render cache ahead of display (call off the UI thread)."""
+		cache = render_cache.get_cache()
+		fingerprint = cache.fingerprint(self.app)
+		kind = self._render_kind()
+		for i in items:
+			try:
+				cache.render(i, kind, self.account, fingerprint, self._render_item)
+			except Exception:
+				pass  # Rendered (and reported) again when displayed
+
+	def _prerender_new(self, items):
+		"""Render new items on the loading thread so refreshList only swaps in ready strings."""
+		# Streamed items arriving on the UI thread were already rendered by the render worker
+		if items and not wx.IsMainThread():
+			self.prerender(items)
+
 	def invalidate_display_cache(self):
 		"""Invalidate the cached display list (call when statuses change)."""
 		self._display_list_cache = None
@@ -1805,22 +1903,10 @@ class timeline(object):
 		The items should already be in the correct order for display.
 		This function only converts them to strings, it does not reorder.
 		"""
-		items2 = []
-		for i in items:
-			if self.type == "notifications":
-				processed = self.app.process_notification(i, account=self.account)
-			elif self.type == "conversations":
-				processed = self.app.process_conversation(i, account=self.account)
-			else:
-				# mentions now treated same as home/user/etc.
-				processed = self.app.process_status(i, account=self.account)
-			# Cache the display string on the item (if supported)
-			try:
-				i._display_cache = processed
-			except (AttributeError, TypeError):
-				pass
-			items2.append(processed)
-		return items2
+		cache = render_cache.get_cache()
+		fingerprint = cache.fingerprint(self.app)
+		kind = self._render_kind()
+		return [cache.render(i, kind, self.account, fingerprint, self._render_item) for i in items]
 
 	# ============ Position Sync Methods ============
 
@@ -1959,10 +2045,7 @@ def timelineThread(account):
 			try:
 				if i.type == "list":
 					try:
-						members = account.api.list_accounts(id=i.data)
-						i.members = []
-						for i2 in members:
-							i.members.append(i2.id)
+						i.members = account.list_member_ids(i.data)
 					except:
 						pass
 				if i.type != "conversation":
@@ -1981,19 +2064,6 @@ def timelineThread(account):
 				except:
 					pass
 
-		# Resolve unknown users using per-account cache
-		if len(account.user_cache.unknown_users) > 0:
-			try:
-				from platforms.mastodon.models import mastodon_user_to_universal
-				new_users = account.api.accounts(ids=account.user_cache.unknown_users)
-				for i in new_users:
-					universal_user = mastodon_user_to_universal(i)
-					if universal_user:
-						account.user_cache.add_user(universal_user)
-				account.user_cache.unknown_users = []
-			except:
-				account.user_cache.unknown_users = []
-
 		# Save per-account user cache
 		account.user_cache.save()
 
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Background resolution of user IDs missing from an account's user cache.
+
+request() adds an ID to a deduplicated pending set. Shortly after the first
+miss a worker looks the pending IDs up in batches of 40 (Mastodon accounts
+and Bluesky get_profiles via the platform's get_users), adds the results to
+the user cache and calls any callbacks registered for them. IDs whose lookup
+fails are retried with exponential backoff and given up after a few
+attempts, at which point their callbacks get None and the ID is not looked
+up again for a while.
+"""
+import threading
+import time
+
+BATCH_SIZE = 40
+# Seconds to wait after a miss so misses arriving together share a batch
+GATHER_DELAY = 0.5
+RETRY_BASE = 5.0
+RETRY_MAX = 300.0
+MAX_ATTEMPTS = 5
+# Seconds an ID that was given up on is not looked up again
+GIVE_UP_COOLDOWN = 30 * 60
+MAX_GIVEN_UP = 1000
+
+
+class UserResolver(object):
+	"""Resolves unknown user IDs for one account."""
+
+	def __init__(self, account):
+		self.account = account
+		self._cond = threading.Condition()
+		self._pending = {}  # user id -> time it may be looked up (insertion ordered)
+		self._attempts = {}
+		self._in_flight = set()
+		self._callbacks = {}  # user id -> {callback key: callback}
+		self._given_up = {}  # user id -> time it was given up on
+		self._worker = None
+		self.resolved = 0
+		self.failed = 0
+
+	def request(self, user_id, callback=None, callback_key=None):
+		"""Queue a user ID for lookup. callback(user or None) runs on the worker once it's resolved.
+
+		Only one callback is kept per callback_key (default: the callback itself).
+		"""
+		if user_id is None:
+			return
+		user_id = str(user_id)
+		with self._cond:
+			given_up = self._given_up.get(user_id)
+			if given_up is not None:
+				if time.time() - given_up < GIVE_UP_COOLDOWN:
+					return
+				del self._given_up[user_id]
+			if callback is not None:
+				callbacks = self._callbacks.setdefault(user_id, {})
+				callbacks.setdefault(callback if callback_key is None else callback_key, callback)
+			if user_id not in self._pending and user_id not in self._in_flight:
+				self._pending[user_id] = time.time() + GATHER_DELAY
+			if self._worker is None or not self._worker.is_alive():
+				self._worker = threading.Thread(target=self._run, daemon=True)
+				self._worker.start()
+			self._cond.notify()
+
+	def pending_count(self):
+		with self._cond:
+			return len(self._pending) + len(self._in_flight)
+
+	def _take_batch(self):
+		"""Wait for a batch of IDs that are due. Returns None when there is nothing left to do."""
+		with self._cond:
+			while True:
+				if not self._pending:
+					# Let the thread end; request() starts a new one
+					self._worker = None
+					return None
+				now = time.time()
+				if min(self._pending.values()) <= now:
+					# Take along misses that arrived during the gather delay
+					due = [user_id for user_id, at in self._pending.items() if at <= now + GATHER_DELAY]
+					batch = due[:BATCH_SIZE]
+					for user_id in batch:
+						del self._pending[user_id]
+					self._in_flight.update(batch)
+					return batch
+				self._cond.wait(min(self._pending.values()) - now)
+
+	def _run(self):
+		while True:
+			batch = self._take_batch()
+			if batch is None:
+				return
+			found = {}
+			error = None
+			try:
+				platform = getattr(self.account, '_platform', None)
+				if platform is not None:
+					# Failures are retried here, so don't report them to the user
+					users = platform.get_users(batch, quiet=True)
+				else:
+					from platforms.mastodon.models import mastodon_user_to_universal
+					users = [mastodon_user_to_universal(u) for u in self.account.api.accounts(batch)]
+				for user in users:
+					if user is not None:
+						found[str(user.id)] = user
+			except Exception as e:
+				error = e
+			self._finish(batch, found, error)
+
+	def _prune_given_up(self):
+		now = time.time()
+		for user_id in [u for u, at in self._given_up.items() if now - at >= GIVE_UP_COOLDOWN]:
+			del self._given_up[user_id]
+		if len(self._given_up) >= MAX_GIVEN_UP:
+			self._given_up.clear()
+
+	def _finish(self, batch, found, error):
+		user_cache = getattr(self.account, 'user_cache', None)
+		done = []
+		with self._cond:
+			for user_id in batch:
+				self._in_flight.discard(user_id)
+				user = found.get(user_id)
+				if user is not None:
+					self._attempts.pop(user_id, None)
+					done.append((user_id, user))
+					self.resolved += 1
+					continue
+				attempts = self._attempts.get(user_id, 0) + 1
+				if attempts >= MAX_ATTEMPTS:
+					self._attempts.pop(user_id, None)
+					if len(self._given_up) >= MAX_GIVEN_UP:
+						self._prune_given_up()
+					self._given_up[user_id] = time.time()
+					done.append((user_id, None))
+					self.failed += 1
+					continue
+				self._attempts[user_id] = attempts
+				self._pending[user_id] = time.time() + min(RETRY_MAX, RETRY_BASE * (2 ** (attempts - 1)))
+			callbacks = [(list(self._callbacks.pop(user_id, {}).values()), user) for user_id, user in done]
+		if error is not None:
+			print(f"User lookup failed for {len(batch)} users: {error}")
+		for user_id, user in done:
+			if user is not None and user_cache is not None:
+				user_cache.add_user(user)
+		for funcs, user in callbacks:
+			for func in funcs:
+				try:
+					func(user)
+				except Exception as e:
+					print(f"User lookup callback failed: {e}")
+
+
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(account):
+	"""The account's user resolver."""
+	resolver = getattr(account, '_user_resolver', None)
+	if resolver is None:
+		with _resolvers_lock:
+			resolver = getattr(account, '_user_resolver', None)
+			if resolver is None:
+				resolver = UserResolver(account)
+				account._user_resolver = resolver
+	return resolver